@@ -21,65 +21,47 @@
 
 """
 bb: a cli for bitbucket.
+
+`main` is the console entry point. When a `bb daemon` is listening the
+command is handed over to it before typer, rich or httpx are imported;
+otherwise it runs the typer application of bb.cli in this process.
 """
 
-import typer
+import sys
+import time
+from typing import Optional
 
-from bb.__version__ import __version__ as version
-from bb.auth import _auth
-from bb.pr import _pr
-from bb.repo import _repo
-from bb.utils.constants import common_vars
-from bb.utils.richprint import console
+__all__ = ["main"]
 
+# when `main` was entered, for the startup phase of `bb --timings`
+_started: Optional[float] = None
 
-def version_callback(value: bool) -> None:
-    """
-    Prints the version of bb and exits the program if the value is True.
 
-    Parameters:
-        value (bool): A boolean value indicating whether to print the version or not.
+def main() -> None:
+    """
+    Runs bb, through the daemon when one is listening.
 
     Returns:
         None
     """
-    if value:
-        console.print(f"bb version: {version}")
-        raise typer.Exit(code=0)
-
-
-def setup() -> typer.Typer:
-    _bb = typer.Typer(
-        add_completion=False,
-        epilog="Author: P S, Adithya (psadi) <ps.adithya@icloud.com>\n\nProject URL: https://github.com/psadi/bbcli\n\n\nLicense: GNU Affero General Public License v3.0 (AGPLv3) <https://github.com/psadi/bbcli/blob/main/LICENSE>",
-        help="Work seamlessly with Bitbucket from the command line",
-        no_args_is_help=True,
-    )
+    global _started
+    _started = time.perf_counter()
 
-    _bb.add_typer(_pr, name="pr", help="manage pull requests")
-    _bb.add_typer(_auth, name="auth", help="authenticate bb and git with bitbucket")
-    _bb.add_typer(_repo, name="repo", help="work with bitBucket repositories")
+    from bb.utils.daemon import forward
 
-    return _bb
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
 
+    from bb.cli import _bb
 
-_bb = setup()
+    _bb(prog_name="bb")
 
 
-@_bb.callback()
-def callback(
-    verbose: bool = False,
-    version: bool = typer.Option(None, "--version", callback=version_callback),
-):
-    """
-    This function is a callback function that sets the verbosity level and version information.
-
-    Args:
-        verbose (bool, optional): A boolean indicating whether to enable verbose mode. Defaults to False.
-        version (bool, optional): A boolean indicating whether to display the version information. Defaults to None.
+def __getattr__(name: str):
+    # `bb._bb` and friends stay importable, loading the typer app on first use
+    if name in ("_bb", "callback", "setup", "version_callback"):
+        from bb import cli
 
-    Returns:
-        None
-    """
-    if verbose:
-        common_vars.state["verbose"] = True
+        return getattr(cli, name)
+    raise AttributeError(f"module 'bb' has no attribute '{name}'")
@@ -33,10 +33,10 @@ from bb.utils.ini import (
     BB_CONFIG_FILE,
     XDG_CONFIG_HOME,
     auth_setup,
+    clear_cache,
     is_config_present,
     parse,
 )
-from bb.utils.richprint import console
 
 _auth: typer.Typer = typer.Typer(add_completion=False, no_args_is_help=True)
 
@@ -55,6 +55,8 @@ def setup() -> None:
     -   :rtype: None
     """
 
+    from bb.utils.richprint import console
+
     if is_config_present():
         console.print(
             "Configuration file found, Run 'bb auth status' for more information"
@@ -110,6 +112,8 @@ def status(token: bool = typer.Option(False, help="Display auth token")) -> None
     -   :rtype: None
     """
 
+    from bb.utils.richprint import console
+
     if not is_config_present():
         raise ValueError("Configuration missing, run 'bb auth setup'")
 
@@ -138,6 +142,8 @@ def reset() -> None:
     -   :rtype: None
     """
 
+    from bb.utils.richprint import console
+
     console.print(
         f"\nThis will delete,\n\n- File: [yellow]{BB_CONFIG_FILE}[/yellow]\n- Directory: [yellow]{XDG_CONFIG_HOME}[/yellow]\n"
     )
@@ -155,6 +161,8 @@ def reset() -> None:
         if os.path.exists(XDG_CONFIG_HOME):
             os.rmdir(XDG_CONFIG_HOME)
 
+        clear_cache()
+
         console.print(
             "\nConfiguration reset successfully, please run [yellow]`bb auth setup`[/yellow] to configure again\n"
         )
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.cli: the typer application behind the `bb` command.
+
+Command modules and heavy dependencies (rich, httpx) are only imported once
+a command actually runs, keeping startup fast for `bb --help`/`--version`.
+"""
+
+import typer
+
+from bb.auth import _auth
+from bb.daemon import _daemon
+from bb.index import _index
+from bb.pr import _pr
+from bb.repo import _repo
+from bb.utils.constants import common_vars
+from bb.utils.helper import error_handler
+
+
+def version_callback(value: bool) -> None:
+    """
+    Prints the version of bb and exits the program if the value is True.
+
+    Parameters:
+        value (bool): A boolean value indicating whether to print the version or not.
+
+    Returns:
+        None
+    """
+    if value:
+        from bb.__version__ import __version__ as version
+        from bb.utils.richprint import console
+
+        console.print(f"bb version: {version}")
+        raise typer.Exit(code=0)
+
+
+def setup() -> typer.Typer:
+    _bb = typer.Typer(
+        add_completion=False,
+        epilog="Author: P S, Adithya (psadi) <ps.adithya@icloud.com>\n\nProject URL: https://github.com/psadi/bbcli\n\n\nLicense: GNU Affero General Public License v3.0 (AGPLv3) <https://github.com/psadi/bbcli/blob/main/LICENSE>",
+        help="Work seamlessly with Bitbucket from the command line",
+        no_args_is_help=True,
+    )
+
+    _bb.add_typer(_pr, name="pr", help="manage pull requests")
+    _bb.add_typer(_auth, name="auth", help="authenticate bb and git with bitbucket")
+    _bb.add_typer(_repo, name="repo", help="work with bitBucket repositories")
+    _bb.add_typer(_index, name="index", help="manage the local pull request index")
+    _bb.add_typer(_daemon, name="daemon", help="keep bb warm in the background")
+
+    return _bb
+
+
+_bb = setup()
+
+
+@_bb.callback()
+def callback(
+    ctx: typer.Context,
+    verbose: bool = False,
+    version: bool = typer.Option(None, "--version", callback=version_callback),
+    timings: bool = typer.Option(
+        False, help="report the wall time of each phase on stderr"
+    ),
+    profile: str = typer.Option(
+        "", help="write a cProfile dump of the command to this file"
+    ),
+):
+    """
+    This function is a callback function that sets the verbosity level and version information.
+
+    Args:
+        ctx (typer.Context): The context of the command, closed once it ran.
+        verbose (bool, optional): A boolean indicating whether to enable verbose mode. Defaults to False.
+        version (bool, optional): A boolean indicating whether to display the version information. Defaults to None.
+        timings (bool, optional): Report the wall time of startup, config, git, HTTP, JSON decoding and rendering. Defaults to False.
+        profile (str, optional): Path to write a pstats dump of the command to. Defaults to "".
+
+    Returns:
+        None
+    """
+    if verbose:
+        common_vars.state["verbose"] = True
+    if timings or profile:
+        from bb.utils import timing
+
+        # close callbacks run last in, first out: profiling stops before the report
+        if timings:
+            timing.start()
+            ctx.call_on_close(timing.finish)
+        if profile:
+            ctx.call_on_close(timing.profile(profile))
+
+
+@_bb.command(help="Run bb commands interactively, in one process")
+@error_handler
+def shell() -> None:
+    """
+    Reads bb commands interactively and runs them in this process, sharing
+    its HTTP connections and caches. The leading 'bb' is optional.
+
+    Returns:
+        None
+    """
+    from bb.shell import repl
+
+    repl()
+
+
+@_bb.command(help="Run bb commands from a file or stdin, one per line")
+@error_handler
+def batch(
+    file: str = typer.Argument(
+        "-", help="script with one command per line, '-' for stdin"
+    ),
+    parallel: int = typer.Option(1, help="lines run at once, for independent lines"),
+    keep_going: bool = typer.Option(
+        False, help="run the remaining lines after a failure"
+    ),
+) -> None:
+    """
+    Runs the bb commands of a script in this process, stopping at the first
+    failing line unless `keep_going`.
+
+    Args:
+        file (str): The script, '-' for stdin.
+        parallel (int): The number of lines run at once; their output is
+            printed in line order.
+        keep_going (bool): Run the remaining lines after a line fails.
+
+    Raises:
+        ValueError: If a line cannot be parsed or any line failed.
+
+    Returns:
+        None
+    """
+    from bb.shell import run_batch
+
+    run_batch(file, parallel, keep_going)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb daemon: Keep bb warm in the background
+"""
+
+import typer
+
+from bb.utils.helper import error_handler
+
+_daemon: typer.Typer = typer.Typer(add_completion=False, no_args_is_help=True)
+
+
+@_daemon.command(help="Start the daemon, bb commands are then run by it")
+@error_handler
+def start(
+    detach: bool = typer.Option(False, help="run in the background"),
+) -> None:
+    """
+    Starts a daemon serving bb commands on a Unix domain socket. Every `bb`
+    invocation of the same user hands its command over to the daemon while it
+    runs. Each command runs in a worker forked from the daemon, so the imports
+    are warm, but HTTP connections are opened per command. Set BB_NO_DAEMON=1
+    to run a command in its own process.
+
+    Args:
+    -   :param detach: A boolean flag to start the daemon in the background
+        and return immediately
+        :type detach: bool
+    Raises:
+    -   ValueError: If Unix domain sockets are not available or a daemon is
+        already running
+    Returns:
+    -   None
+    """
+    from bb.daemon.server import serve
+    from bb.utils import daemon
+    from bb.utils.richprint import console
+
+    if not detach:
+        console.print(f"Listening on {daemon.socket_path()}", style="bold green")
+        serve()
+        return
+
+    import subprocess
+    import sys
+    import time
+
+    if not daemon.supported():
+        raise ValueError("bb daemon needs Unix domain sockets")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "bb.daemon.server"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            pid = daemon.request({"control": "status"})["pid"]
+        except (OSError, TypeError):
+            time.sleep(0.05)
+            continue
+        console.print(f"bb daemon started (pid {pid})", style="bold green")
+        return
+    raise ValueError("bb daemon did not start, run 'bb daemon start' to see why")
+
+
+@_daemon.command(help="Stop the daemon")
+@error_handler
+def stop() -> None:
+    """
+    Stops the running daemon once it finishes the command in progress.
+
+    Raises:
+    -   ValueError: If no daemon is running
+    Returns:
+    -   None
+    """
+    from bb.utils import daemon
+    from bb.utils.richprint import console
+
+    try:
+        reply = daemon.request({"control": "stop"})
+    except OSError:
+        raise ValueError("bb daemon is not running") from None
+    console.print(f"bb daemon stopped (pid {reply['pid']})", style="bold green")
+
+
+@_daemon.command(help="Show whether the daemon is running")
+@error_handler
+def status() -> None:
+    """
+    Shows the pid, uptime and number of commands served by the daemon.
+
+    Raises:
+    -   ValueError: If no daemon is running
+    Returns:
+    -   None
+    """
+    from bb.utils import daemon
+    from bb.utils.richprint import console, table
+
+    try:
+        reply = daemon.request({"control": "status"})
+    except OSError:
+        raise ValueError("bb daemon is not running") from None
+    console.print(
+        table(
+            ["_", "_"],
+            [
+                ("Socket", daemon.socket_path()),
+                ("PID", str(reply["pid"])),
+                ("Uptime", f"{reply['uptime']}s"),
+                ("Commands served", str(reply["served"])),
+            ],
+            False,
+        )
+    )
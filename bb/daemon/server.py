@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.daemon.server - serves bb commands over a Unix domain socket
+
+The daemon imports every module once, then forks a worker per command, so
+commands skip the imports and a slow one never holds up the others. Only the
+imports are shared: the daemon itself makes no requests, so each worker opens
+its own HTTP connections. The worker installs the client's file descriptors
+as stdin, stdout and stderr, and adopts its working directory and
+environment. While a worker runs, the daemon watches its connection: a client
+that hangs up, interrupted or timed out, takes its command down with it, and
+a command whose client is already gone never starts.
+"""
+
+import importlib
+import os
+import pkgutil
+import select
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from bb.utils import daemon
+
+POLL_INTERVAL = 0.1  # seconds between checks for finished workers
+RECEIVE_TIMEOUT = 2.0  # seconds a client has to send its request
+
+
+def warm_up() -> None:
+    """Imports every bb module, so no command pays for its imports."""
+    import bb
+
+    for module in pkgutil.walk_packages(bb.__path__, "bb."):
+        if module.name != __name__:
+            importlib.import_module(module.name)
+
+
+def reset() -> None:
+    """Drops per-command state left behind by the previous command."""
+    from bb.utils import cmnd, richprint
+    from bb.utils.api import get_bitbucket_api
+    from bb.utils.constants import common_vars
+
+    cmnd.close_cat_file()
+    get_bitbucket_api.cache_clear()
+    common_vars.state["verbose"] = False
+    # re-detect the terminal, colour support and width of the new stdout
+    richprint.console.__init__()
+    richprint.err_console.__init__(stderr=True)
+    richprint.diagnostics_to_stderr(False)
+
+
+def run_command(argv: List[str], cwd: str, env: dict, fds: List[int]) -> int:
+    """
+    Runs one command as if it was started by the client.
+
+    Args:
+        argv (List[str]): The command line arguments, without the program.
+        cwd (str): The client's working directory.
+        env (dict): The client's environment.
+        fds (List[int]): The client's stdin, stdout and stderr.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    from bb.shell import run_argv
+
+    saved_fds = [os.dup(fd) for fd in range(daemon.MAX_FDS)]
+    saved_streams = (sys.stdin, sys.stdout, sys.stderr)
+    saved_env, saved_cwd = dict(os.environ), os.getcwd()
+    try:
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        # fresh buffers, nothing read or written by a previous command leaks
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", closefd=False)
+        os.environ.clear()
+        os.environ.update(env)
+        os.chdir(cwd)
+        reset()
+        try:
+            code = run_argv(argv)
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            stream.flush()
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        for target, fd in enumerate(saved_fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+    return code
+
+
+def hung_up(conn: socket.socket) -> bool:
+    """
+    Whether the client closed its connection. A waiting client sends
+    nothing more, so a readable connection means it is gone.
+
+    Args:
+        conn (socket.socket): The client's connection.
+
+    Returns:
+        bool: True if the client hung up.
+    """
+    return bool(select.select([conn], [], [], 0)[0])
+
+
+class Server:
+    """
+    The daemon's accept loop, forking a worker per command.
+
+    Args:
+        path (str): The socket path.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.started = time.time()
+        self.served = 0
+        self.running = False
+        self.listener: Optional[socket.socket] = None
+        self.workers: Dict[socket.socket, int] = {}
+
+    def bind(self) -> socket.socket:
+        """
+        Listens on the socket, replacing a stale one left by a daemon that
+        did not exit cleanly.
+
+        Raises:
+            ValueError: If another daemon is already listening.
+
+        Returns:
+            socket.socket: The listening socket.
+        """
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        if os.path.exists(self.path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self.path)
+                except OSError:
+                    os.unlink(self.path)
+                else:
+                    raise ValueError(f"A bb daemon is already listening on {self.path}")
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)  # only the owner may connect
+        try:
+            listener.bind(self.path)
+        finally:
+            os.umask(umask)
+        listener.listen(64)
+        return listener
+
+    def handle(self, conn: socket.socket) -> bool:
+        """
+        Serves one connection: a 'status'/'stop' control message, answered
+        here, or a command, started in a worker.
+
+        Args:
+            conn (socket.socket): The accepted connection.
+
+        Returns:
+            bool: Whether a worker now owns the connection.
+        """
+        message, fds = daemon.receive(conn, daemon.MAX_FDS)
+        try:
+            if message is None:
+                return False
+            control = message.get("control")
+            if control == "stop":
+                self.running = False
+                conn.sendall(daemon.encode({"pid": os.getpid()}))
+            elif control == "status":
+                conn.sendall(daemon.encode(self.status()))
+            elif len(fds) == daemon.MAX_FDS and not hung_up(conn):
+                self.workers[conn] = self.fork(conn, message, fds)
+                self.served += 1
+                return True
+            return False
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def fork(self, conn: socket.socket, message: dict, fds: List[int]) -> int:
+        """
+        Runs a command in a child process, which replies with its exit code.
+
+        Args:
+            conn (socket.socket): The client's connection.
+            message (dict): The command request.
+            fds (List[int]): The client's stdin, stdout and stderr.
+
+        Returns:
+            int: The pid of the worker.
+        """
+        pid = os.fork()
+        if pid:
+            # a group of its own, so an abort also stops the git it started;
+            # set on both sides, whichever runs first
+            try:
+                os.setpgid(pid, pid)
+            except OSError:
+                pass
+            return pid
+        code = 1
+        try:
+            os.setpgid(0, 0)
+            for other in (self.listener, *self.workers):
+                other.close()
+            code = run_command(message["argv"], message["cwd"], message["env"], fds)
+            conn.sendall(daemon.encode({"exit": code}))
+        except BaseException:
+            pass
+        finally:
+            os._exit(code)
+
+    def reap(self) -> None:
+        """Closes the connections of finished workers."""
+        for conn, pid in list(self.workers.items()):
+            if os.waitpid(pid, os.WNOHANG)[0]:
+                del self.workers[conn]
+                conn.close()
+
+    def abort(self, conn: socket.socket) -> None:
+        """
+        Stops the worker serving a connection whose client hung up.
+
+        Args:
+            conn (socket.socket): The client's connection.
+
+        Returns:
+            None
+        """
+        pid = self.workers.pop(conn)
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except OSError:
+            pass  # exited already
+        os.waitpid(pid, 0)
+        conn.close()
+
+    def status(self) -> dict:
+        """The pid, uptime in seconds and number of commands served."""
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started),
+            "served": self.served,
+        }
+
+    def serve(self) -> None:
+        """
+        Accepts connections until stopped, removing the socket on exit.
+        Commands still running when the daemon stops are aborted.
+
+        Returns:
+            None
+        """
+        self.listener = self.bind()
+        self.running = True
+        try:
+            while self.running:
+                readable, _, _ = select.select(
+                    [self.listener, *self.workers], [], [], POLL_INTERVAL
+                )
+                self.reap()
+                for conn in readable:
+                    if conn is self.listener:
+                        self.accept()
+                    elif conn in self.workers:
+                        # clients only wait for the reply, so this is a hangup
+                        self.abort(conn)
+        finally:
+            for conn in list(self.workers):
+                self.abort(conn)
+            self.listener.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def accept(self) -> None:
+        """Accepts and serves one connection."""
+        conn, _ = self.listener.accept()
+        # a client that connects and stays silent must not stall the others
+        conn.settimeout(RECEIVE_TIMEOUT)
+        try:
+            if self.handle(conn):
+                return
+        except (OSError, ValueError):
+            pass  # the client went away; keep serving the others
+        conn.close()
+
+
+def serve(path: Optional[str] = None) -> None:
+    """
+    Warms up and serves commands until `bb daemon stop`.
+
+    Args:
+        path (Optional[str]): The socket path (default: `daemon.socket_path()`).
+
+    Raises:
+        ValueError: If Unix domain sockets are not available or another
+            daemon is already listening.
+
+    Returns:
+        None
+    """
+    if not daemon.supported():
+        raise ValueError("bb daemon needs Unix domain sockets")
+    warm_up()
+    Server(path or daemon.socket_path()).serve()
+
+
+if __name__ == "__main__":
+    serve()
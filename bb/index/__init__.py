@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb index: Manage the local pull request index
+"""
+
+import typer
+
+from bb.utils.helper import error_handler
+
+_index: typer.Typer = typer.Typer(add_completion=False, no_args_is_help=True)
+
+
+@_index.command(help="Sync pull requests into the local index")
+@error_handler
+def sync(
+    project: str = typer.Option(
+        "", help="project key, defaults to the current repository"
+    ),
+    repo: str = typer.Option(
+        "", help="repository slug, defaults to the current repository"
+    ),
+    full: bool = typer.Option(False, help="re-read every pull request"),
+) -> None:
+    """
+    Syncs the pull requests of a repository into the local index, used by
+    `bb pr list --offline/--cached`.
+
+    Args:
+    -   :param project: The project key, taken from the git remote when empty
+        :type project: str
+    -   :param repo: The repository slug, taken from the git remote when empty
+        :type repo: str
+    -   :param full: A boolean flag to re-read every pull request instead of
+        only those updated since the last sync
+        :type full: bool
+    Raises:
+    -   ValueError: If the project or repository is missing outside a git
+        repository
+    Returns:
+    -   None
+    """
+    from bb.index.sync import sync_repository
+    from bb.utils import cmnd
+    from bb.utils.constants import common_vars
+    from bb.utils.richprint import console, live_progress
+
+    if not (project and repo):
+        if not cmnd.is_git_repo():
+            raise ValueError(common_vars.not_a_git_repo)
+        # an explicit value wins, only the missing one comes from the remote
+        remote_project, remote_repo = cmnd.base_repo()
+        project, repo = project or remote_project, repo or remote_repo
+
+    with live_progress(f"Syncing pull requests of '{project}/{repo}' ... ") as live:
+        count = sync_repository(project, repo, full)
+        live.update(console.print("DONE", style="bold green"))
+    console.print(f"{count} pull request(s) indexed")
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.index.sync - incrementally syncs the local pull request index
+"""
+
+import os
+import time
+from typing import List, Optional
+
+from bb.utils import index, request
+from bb.utils.api import get_bitbucket_api
+from bb.utils.ini import get_setting
+
+
+def sync_repository(project: str, repository: str, full: bool = False) -> int:
+    """
+    Syncs the pull requests of a repository into the local index.
+
+    Pull requests are read most recently updated first and the walk stops at
+    the first page reaching what the previous sync already indexed, so an
+    up-to-date repository costs a single request.
+
+    Args:
+        project (str): The project key.
+        repository (str): The repository slug.
+        full (bool): Ignore the previous sync and re-read every pull request,
+            removing the indexed ones deleted on the server.
+
+    Returns:
+        int: The number of pull requests written to the index.
+    """
+    api = get_bitbucket_api()
+    conn = index.connect()
+    try:
+        with conn:
+            state = (
+                None
+                if full
+                else index.watermark(conn, api.bitbucket_host, project, repository)
+            )
+            since: Optional[int] = state["last_updated"] if state else None
+            newest, count, seen = since or 0, 0, set()
+            for page in request.get_pages(
+                api.pull_requests_by_update(project, repository), fresh=True
+            ):
+                values = page.get("values", [])
+                count += index.upsert(conn, api.bitbucket_host, values)
+                seen.update(_pr["id"] for _pr in values)
+                newest = max([newest, *(_pr.get("updatedDate", 0) for _pr in values)])
+                if since is not None and any(
+                    _pr.get("updatedDate", 0) <= since for _pr in values
+                ):
+                    break
+            if full:
+                index.prune(conn, api.bitbucket_host, project, repository, seen)
+            index.set_watermark(conn, api.bitbucket_host, project, repository, newest)
+    finally:
+        conn.close()
+    return count
+
+
+def forget(project: str, repository: str, ids: List[str]) -> None:
+    """
+    Removes pull requests deleted with bb from the index, if there is one.
+
+    Args:
+        project (str): The project key.
+        repository (str): The repository slug.
+        ids (List[str]): The ids of the deleted pull requests.
+
+    Returns:
+        None
+    """
+    if not ids or not os.path.isfile(index.index_path()):
+        return
+    conn = index.connect()
+    try:
+        with conn:
+            index.remove(
+                conn, get_bitbucket_api().bitbucket_host, project, repository, ids
+            )
+    finally:
+        conn.close()
+
+
+def is_stale(project: str, repository: str) -> bool:
+    """
+    Checks whether a repository's index is older than `[index] max_age` seconds.
+
+    Args:
+        project (str): The project key.
+        repository (str): The repository slug.
+
+    Returns:
+        bool: True if the repository was never synced or the sync is too old.
+    """
+    conn = index.connect()
+    try:
+        state = index.watermark(
+            conn, get_bitbucket_api().bitbucket_host, project, repository
+        )
+    finally:
+        conn.close()
+    max_age = get_setting("index", "max_age", 300.0)
+    return state is None or time.time() - state["synced_at"] > max_age
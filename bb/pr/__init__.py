@@ -21,6 +21,9 @@
 
 """
 bb pr: Manage pull requests
+
+Command implementations are imported inside each command so that only the
+module backing the invoked command is loaded.
 """
 
 from enum import Enum
@@ -28,17 +31,9 @@ from typing import Optional
 
 import typer
 
-from bb.pr.copy import copy_pull_request
-from bb.pr.create import create_pull_request
-from bb.pr.delete import delete_pull_request
-from bb.pr.diff import show_diff
-from bb.pr.list import list_pull_request
-from bb.pr.merge import merge_pull_request
-from bb.pr.review import review_pull_request
-from bb.pr.view import view_pull_request
-from bb.utils.cmnd import is_git_repo, title_and_description
 from bb.utils.constants import common_vars
 from bb.utils.helper import error_handler, validate_input
+from bb.utils.output import Output
 
 _pr: typer.Typer = typer.Typer(add_completion=False, no_args_is_help=True)
 
@@ -79,20 +74,20 @@ def create(
     -   None
     """
 
+    from bb.pr.create import create_pull_request
+    from bb.utils.cmnd import is_git_repo, title_and_description
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
     target = validate_input(target, "Target branch", "Target branch cannot be none")
 
-    title = validate_input(
-        title, "Title", "", title or title_and_description()[0], True
+    commit_title, commit_description = (
+        ["", ""] if title and description else title_and_description()
     )
+    title = validate_input(title, "Title", "", title or commit_title, True)
     description = validate_input(
-        description,
-        "Description",
-        "",
-        description or title_and_description()[1],
-        True,
+        description, "Description", "", description or commit_description, True
     )
 
     create_pull_request(target, yes, diff, rebase, title, description)
@@ -125,6 +120,9 @@ def delete(
     -   None
     """
 
+    from bb.pr.delete import delete_pull_request
+    from bb.utils.cmnd import is_git_repo
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
@@ -150,6 +148,21 @@ def list(
     all: bool = typer.Option(
         False, help="show all pull request(s) based on selected role"
     ),
+    offline: bool = typer.Option(
+        False, help="answer from the local index without contacting bitbucket"
+    ),
+    cached: bool = typer.Option(
+        False, help="answer from the local index, syncing it first if stale"
+    ),
+    project: str = typer.Option(
+        "", help="list open pull requests of every repository in a project"
+    ),
+    repos: str = typer.Option(
+        "", help="comma separated repositories to list open pull requests of"
+    ),
+    output: Output = typer.Option(
+        Output.RICH, "--output", help="rich, or json/ndjson/csv for scripts"
+    ),
 ) -> None:
     """
     Lists pull requests based on a selected role, with an option to show all pull requests.
@@ -159,16 +172,87 @@ def list(
         :type role: str
     -   :param all: A  boolean flag that determines whether to show all pull requests
         :type all: bool
+    -   :param offline: A boolean flag to answer from the local index built by
+        `bb index sync` without any request to bitbucket
+        :type offline: bool
+    -   :param cached: A boolean flag to answer from the local index, syncing
+        the current repository first when the index is older than `[index] max_age`
+        :type cached: bool
+    -   :param project: The project key whose repositories are listed
+        concurrently, a git repository is not required when given
+        :type project: str
+    -   :param repos: Comma separated repository slugs to list concurrently,
+        in `project` or the current repository's project
+        :type repos: str
+    -   :param output: Render with rich, or stream records as json, ndjson or
+        csv without any decoration
+        :type output: Output
     Raises:
-        ValueError: If the repository is not a Git repository
+        ValueError: If the repository is not a Git repository, or the index
+        is asked for together with `--project`/`--repos`
     Returns:
         None
     """
 
+    from bb.pr.list import list_pull_request
+    from bb.utils.cmnd import is_git_repo
+
+    if not project and not is_git_repo():
+        raise ValueError(common_vars.not_a_git_repo)
+
+    repo_list = [repo.strip() for repo in repos.split(",") if repo.strip()]
+    if (project or repo_list) and (offline or cached):
+        raise ValueError(
+            "--offline and --cached cannot be combined with --project or --repos,"
+            " those are always listed from bitbucket"
+        )
+    if project or repo_list:
+        list_pull_request(
+            role, all, project=project, repos=repo_list, output_format=output
+        )
+        return
+
+    list_pull_request(role, all, offline, cached, output_format=output)
+
+
+@_pr.command(help="Search pull requests in the local index")
+@error_handler
+def search(
+    text: str = typer.Argument(..., help="words to search for"),
+    all: bool = typer.Option(False, help="search every indexed repository"),
+    state: str = typer.Option("ALL", help="OPEN, MERGED, DECLINED or ALL"),
+    limit: int = typer.Option(20, help="maximum number of results"),
+    offline: bool = typer.Option(
+        False, help="search the local index without contacting bitbucket"
+    ),
+) -> None:
+    """
+    Full-text searches pull request titles, descriptions, authors and branches
+    in the local index built by `bb index sync`.
+    Args:
+    -   :param text: The words to search for, each matched as a prefix
+        :type text: str
+    -   :param all: A boolean flag to search every indexed repository instead
+        of the current one
+        :type all: bool
+    -   :param state: Only show pull requests in this state
+        :type state: str
+    -   :param limit: The maximum number of results
+        :type limit: int
+    -   :param offline: A boolean flag to skip syncing a stale index first
+        :type offline: bool
+    Raises:
+    -   ValueError: If the repository is not a Git repository
+    Returns:
+    -   None
+    """
+    from bb.pr.search import search_pull_request
+    from bb.utils.cmnd import is_git_repo
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
-    list_pull_request(role, all)
+    search_pull_request(text, all, state, limit, offline)
 
 
 # The class `Action` defines an enumeration of string values representing different actions.
@@ -182,18 +266,25 @@ class Action(str, Enum):
 @_pr.command(help="Add a review to a pull request")
 @error_handler
 def review(
-    id: str = typer.Option("", help="pull request number to review"),
+    id: str = typer.Option("", help="pull request number(s) to review"),
     action: Action = Action.NONE,
+    wait: bool = typer.Option(
+        False, help="wait until the review is visible on the pull request(s)"
+    ),
 ) -> None:
     """
     Takes a pull request number and an action to review a pull request in the repository.
     Args:
-    -   :param id: A string that represents the pull request number to review.
+    -   :param id: A string that represents the pull request number(s) to review,
+        comma separated to review several at once.
         :type id: str
     -   :param action: The `action` parameter in the `review` function is an enum type `Action`, which
         represents the action to be taken on a pull request. The possible values for `action` are
         `Action.APPROVE`, `Action.UNAPPROVE`, or `Action.NEEDS_WORK`
         :type action: Action
+    -   :param wait: A boolean flag that polls each pull request until the review
+        is visible on it, instead of returning once the review is accepted
+        :type wait: bool
     Raises:
     -   ValueError: If the repository is not a Git repository
     -   ValueError: If the PR ID is not provided
@@ -202,19 +293,24 @@ def review(
     -   None
     """
 
+    from bb.pr.review import review_pull_request
+    from bb.utils.cmnd import is_git_repo
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
-    _id: str = validate_input(
-        id, "Pull request id to review", common_vars.id_cannot_be_none
-    )
+    _id: list = validate_input(
+        id,
+        "Pull request id(s) to review\n? ex: id (or) id1, id2",
+        common_vars.id_cannot_be_none,
+    ).split(",")
     action_value: str = "none" if action == Action.NONE else action.value
     action: str = validate_input(
         action_value,
         "Action [approve|unapprove|needs_work]",
         "'--action' is a mandatory argument, run 'bb pr review --help' for more info",
     )
-    review_pull_request(_id, action)
+    review_pull_request(_id, action, wait)
 
 
 @_pr.command(help="Merge a pull request")
@@ -250,6 +346,9 @@ def merge(
     -   None
     """
 
+    from bb.pr.merge import merge_pull_request
+    from bb.utils.cmnd import is_git_repo
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
     _id: str = validate_input(
@@ -262,6 +361,9 @@ def merge(
 @error_handler
 def diff(
     id: str = typer.Option("", help="pull request number to show diff"),
+    output: Output = typer.Option(
+        Output.RICH, "--output", help="rich, or json/ndjson/csv for scripts"
+    ),
 ) -> None:
     """
     Takes a pull request number as input and shows the diff for that pull request.
@@ -269,6 +371,9 @@ def diff(
     -   :param id: The `diff` function takes an optional `id` parameter, which is a string representing the
         pull request number to show the diff for
     -   :type id: str
+    -   :param output: Render with rich followed by `git diff`, or only write the
+        changed files as json, ndjson or csv records
+    -   :type output: Output
     Raises:
     -   ValueError: If the repository is not a Git repository
     -   ValueError: If the PR ID is not provided
@@ -276,12 +381,15 @@ def diff(
     -   None
     """
 
+    from bb.pr.diff import show_diff
+    from bb.utils.cmnd import is_git_repo
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
     _id: str = validate_input(
         id, "Pull request number to show diff", common_vars.id_cannot_be_none
     )
-    show_diff(_id)
+    show_diff(_id, output)
 
 
 @_pr.command(help="Copy pull request url to clipboard")
@@ -300,6 +408,9 @@ def copy(id: str = typer.Option("", help="pull request number to copy")) -> None
     -   None
     """
 
+    from bb.pr.copy import copy_pull_request
+    from bb.utils.cmnd import is_git_repo
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
@@ -314,6 +425,9 @@ def copy(id: str = typer.Option("", help="pull request number to copy")) -> None
 def view(
     id: str = typer.Option("", help="pull request id to view"),
     web: Optional[bool] = typer.Option(False, help="view pull request in browser"),
+    output: Output = typer.Option(
+        Output.RICH, "--output", help="rich, or json/ndjson/csv for scripts"
+    ),
 ) -> None:
     """
     Takes a pull request ID as input and allows the user to view the pull request either
@@ -324,6 +438,9 @@ def view(
     -   :param web: A  boolean flag that determines whether to view the pull request
         in a web browser.
         :type web: Optional[bool]
+    -   :param output: Render with rich, or write the pull request as a json,
+        ndjson or csv record
+        :type output: Output
     Raises:
     -   ValueError: If the repository is not a Git repository
     -   ValueError: If the PR ID is not provided
@@ -332,7 +449,10 @@ def view(
     -   None
     """
 
+    from bb.pr.view import view_pull_request
+    from bb.utils.cmnd import is_git_repo
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
     _id = validate_input(id, "Pull request id to view", common_vars.id_cannot_be_none)
-    view_pull_request(_id, web)
+    view_pull_request(_id, web, output)
@@ -25,7 +25,7 @@ clipboard
 """
 
 from bb.utils import cmnd, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils.api import get_bitbucket_api
 
 
 def copy_pull_request(_id: str) -> None:
@@ -48,7 +48,7 @@ def copy_pull_request(_id: str) -> None:
         repository: str
         project, repository = cmnd.base_repo()
         url: str = request.get(
-            bitbucket_api.pull_request_info(project, repository, _id),
+            get_bitbucket_api().pull_request_info(project, repository, _id),
         )[1]["links"]["self"][0]["href"]
         cmnd.cp_to_clipboard(url)
         live.update(richprint.console.print("COPIED", style="bold green"))
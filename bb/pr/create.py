@@ -30,8 +30,34 @@ from typing import Optional
 from typer import confirm
 
 from bb.pr.diff import show_diff
-from bb.utils import cmnd, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils import cache, cmnd, request, richprint
+from bb.utils.api import get_bitbucket_api
+
+
+def resolve_repo_id(project: str, repository: str) -> Optional[int]:
+    """
+    Resolves the id of a repository, from the local cache when possible,
+    otherwise from the single repository endpoint.
+
+    Args:
+    -   project: str: The project name
+    -   repository: str: The repository name
+    Returns:
+    -   Optional[int]: The repository id, or None if the repository is not found
+    Raises:
+    -   ValueError: If the repository cannot be read for any other reason
+    """
+    api = get_bitbucket_api()
+    repo_id = cache.get_repo_id(api.bitbucket_host, project, repository)
+    if repo_id is None:
+        try:
+            repo_id = request.get(api.repo_info(project, repository))[1]["id"]
+        except request.StatusError as err:
+            if err.status_code != 404:
+                raise
+            return None
+        cache.set_repo_id(api.bitbucket_host, project, repository, repo_id)
+    return repo_id
 
 
 def gather_facts(
@@ -60,15 +86,14 @@ def gather_facts(
     """
 
     with richprint.live_progress(f"Gathering facts on '{repository}' ..."):
-        repo_id = None
-        for repo in request.get(bitbucket_api.get_repo_info(project))[1]["values"]:
-            if repo["name"] == repository:
-                repo_id = repo["id"]
+        repo_id = resolve_repo_id(project, repository)
 
         reviewers = []
         if repo_id is not None:
             for dict_item in request.get(
-                bitbucket_api.default_reviewers(project, repo_id, from_branch, target),
+                get_bitbucket_api().default_reviewers(
+                    project, repo_id, from_branch, target
+                ),
             )[1]:
                 reviewers.extend(
                     {"user": {"name": dict_item[key]}}
@@ -131,8 +156,8 @@ def create_pull_request(
 
     if yes or confirm("Proceed"):
         with richprint.live_progress("Creating Pull Request ..."):
-            url = bitbucket_api.pull_request_create(project, repository)
-            body = bitbucket_api.pull_request_body(
+            url = get_bitbucket_api().pull_request_create(project, repository)
+            body = get_bitbucket_api().pull_request_body(
                 title,
                 description,
                 from_branch,
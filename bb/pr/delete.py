@@ -23,69 +23,159 @@
 bb.pr.delete - deletes a pull request(s) given for the given id(s)
 """
 
+from typing import Any, Dict, List, Tuple
+
 from typer import confirm
 
+from bb.index.sync import forget
 from bb.pr.diff import show_diff
 from bb.utils import cmnd, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils.api import PullRequest, get_bitbucket_api
+
+
+def _outcome(result: Any, success: str) -> str:
+    """Describe a result from `request.run(..., return_exceptions=True)`."""
+    if isinstance(result, Exception):
+        return str(result).strip() or type(result).__name__
+    return success
+
+
+def show_pull_request(pull_request_info: PullRequest) -> None:
+    """
+    Prints the summary table of a pull request about to be deleted
+
+    Args:
+    - pull_request_info: PullRequest: The pull request
+    Returns:
+    - None
+    """
+    table = richprint.table(
+        [("SUMMARY", "bold yellow"), ("DESCRIPTION", "#FFFFFF")],
+        [
+            ("ID", str(pull_request_info.id)),
+            ("State", pull_request_info.state),
+            ("From Branch", pull_request_info.from_ref.display_id),
+            ("To Branch", pull_request_info.to_ref.display_id),
+            ("Title", pull_request_info.title),
+            ("Description", pull_request_info.description or "-"),
+        ],
+        True,
+    )
+    richprint.console.print(table)
+
+
+def delete_summary(results: Dict[str, Tuple[Any, str]]) -> None:
+    """
+    Prints one table with the outcome for every requested pull request
+
+    Args:
+    - results: dict: Pull request id mapped to its info (or None) and outcome
+    Returns:
+    - None
+    """
+    rows = []
+    for _no, (info, outcome) in results.items():
+        style = "bold green" if outcome == "Deleted" else "bold red"
+        rows.append(
+            (
+                _no,
+                info.from_ref.display_id if info else "-",
+                info.to_ref.display_id if info else "-",
+                info.title if info else "-",
+                f"[{style}]{outcome}[/{style}]" if outcome != "Skipped" else outcome,
+            )
+        )
+    richprint.console.print(
+        richprint.table(
+            [
+                ("ID", "bold white"),
+                ("FROM BRANCH", "cyan"),
+                ("TO BRANCH", "cyan"),
+                ("TITLE", "#FFFFFF"),
+                ("RESULT", "#FFFFFF"),
+            ],
+            rows,
+            True,
+        )
+    )
 
 
 def delete_pull_request(_id: list, yes: bool, diff: bool) -> None:
     """
     Deletes a pull request(s) given for the given id(s)
 
+    Pull request info is prefetched concurrently, confirmed (unless `yes`) and
+    the confirmed pull requests are then deleted concurrently, followed by a
+    single summary of every outcome.
+
     Args:
     - _id: list: The list of pull request ids
     - yes: bool: The flag to skip confirmation
     - diff: bool: The flag to show diff
     Raises:
-    - ValueError: If the pull request cannot be deleted
+    - ValueError: If any of the pull requests cannot be fetched or deleted
     Returns:
     - None
     """
     project, repository = cmnd.base_repo()
+    api = get_bitbucket_api()
+    urls = {
+        _no.strip(): api.pull_request_info(project, repository, _no.strip())
+        for _no in _id
+        if _no.strip()
+    }
 
-    for _no in _id:
-        with richprint.live_progress(f"Fetching info on {_no} ..."):
-            url = bitbucket_api.pull_request_info(project, repository, _no)
-            pull_request_info = request.get(url)
-
-        table = richprint.table(
-            [("SUMMARY", "bold yellow"), ("DESCRIPTION", "#FFFFFF")],
-            [
-                ("ID", str(pull_request_info[1]["id"])),
-                ("State", pull_request_info[1]["state"]),
-                ("From Branch", pull_request_info[1]["fromRef"]["displayId"]),
-                ("To Branch", pull_request_info[1]["toRef"]["displayId"]),
-                ("Title", pull_request_info[1]["title"]),
-                (
-                    "Description",
-                    (
-                        pull_request_info[1]["description"]
-                        if "description" in pull_request_info[1].keys()
-                        else "-"
-                    ),
-                ),
-            ],
-            True,
+    with richprint.live_progress(f"Fetching info on {len(urls)} pull request(s) ..."):
+        # the version goes into the DELETE body, a cached one fails with 409
+        infos = request.run(
+            *(request.async_get(url, fresh=True) for url in urls.values()),
+            return_exceptions=True,
         )
-        richprint.console.print(table)
 
-        if diff or confirm(
-            f"Review diff between '{pull_request_info[1]['fromRef']['displayId']}' & '{pull_request_info[1]['toRef']['displayId']}' in PR #{_no}"
-        ):
-            show_diff(_no)
+    results: Dict[str, Tuple[Any, str]] = {}
+    to_delete: List[Tuple[str, PullRequest]] = []
+    for _no, info in zip(urls, infos):
+        if isinstance(info, Exception):
+            results[_no] = (None, _outcome(info, ""))
+            continue
 
-        if yes or confirm("Proceed"):
-            with richprint.live_progress("Deleting Pull Request ..."):
-                body = {"version": int(pull_request_info[1]["version"])}
-                pull_request = request.delete(url, body)
+        pull_request_info = PullRequest.from_json(info[1])
+        if not yes or diff:
+            show_pull_request(pull_request_info)
+            if diff or confirm(
+                f"Review diff between '{pull_request_info.from_ref.display_id}' & '{pull_request_info.to_ref.display_id}' in PR #{_no}"
+            ):
+                show_diff(_no)
 
-            if pull_request != 204:
-                raise ValueError("Cannot delete pull request, Response<204>")
+        if yes or confirm("Proceed"):
+            to_delete.append((_no, pull_request_info))
+        else:
+            results[_no] = (pull_request_info, "Skipped")
 
-            richprint.console.print(
-                f"Pull Request Deleted: {pull_request_info[1]['links']['self'][0]['href']}",
-                highlight=True,
-                style="bold green",
+    if to_delete:
+        with richprint.live_progress(f"Deleting {len(to_delete)} pull request(s) ..."):
+            statuses = request.run(
+                *(
+                    request.async_delete(urls[_no], {"version": info.version})
+                    for _no, info in to_delete
+                ),
+                return_exceptions=True,
             )
+        for (_no, info), status in zip(to_delete, statuses):
+            results[_no] = (info, _outcome(status, "Deleted"))
+        forget(
+            project,
+            repository,
+            [_no for _no, _ in to_delete if results[_no][1] == "Deleted"],
+        )
+
+    results = {_no: results[_no] for _no in urls}
+    delete_summary(results)
+
+    failed = [
+        _no
+        for _no, (_, outcome) in results.items()
+        if outcome not in ("Deleted", "Skipped")
+    ]
+    if failed:
+        raise ValueError(f"Cannot delete pull request(s): {', '.join(failed)}")
@@ -24,29 +24,73 @@ bb.pr.diff - shows the diffrence in pull requests which is already raised
 TODO: show the diff contents for each file
 """
 
-from bb.utils import cmnd, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils import cmnd, output, request, richprint
+from bb.utils.api import get_bitbucket_api
 
 
-def show_diff(_id: str) -> None:
+def write_diff(project: str, repository: str, _id: str, writer) -> None:
+    """
+    Writes one record per changed file, page by page as they are fetched
+
+    Args:
+    - project: str: The project key
+    - repository: str: The repository slug
+    - _id: str: The pull request id
+    - writer: output.RecordWriter: The record writer
+    Returns:
+    - None
+    """
+    with writer:
+        for page in request.get_pages(
+            get_bitbucket_api().pull_request_difference(project, repository, _id),
+        ):
+            for i in page["values"]:
+                writer.write(
+                    {
+                        "from_hash": page["fromHash"],
+                        "to_hash": page["toHash"],
+                        "path": i["path"]["toString"],
+                        "src_path": i.get("srcPath", {}).get("toString"),
+                        "type": i["type"],
+                    }
+                )
+
+
+def show_diff(_id: str, output_format: output.Output = output.Output.RICH) -> None:
     """
     Shows the difference in the pull request which is already raised
 
     Args:
     - _id: str: The pull request id
+    - output_format: output.Output: Render with rich followed by `git diff`,
+      or only write the changed files as json, ndjson or csv records
     Raises:
     - ValueError: If the pull request cannot be fetched
     Returns:
     - None
     """
     project, repository = cmnd.base_repo()
+    writer = output.writer(output_format)
+    if writer is not None:
+        write_diff(project, repository, _id, writer)
+        return
+
     with richprint.live_progress("Fetching Contents from Pull Request ..."):
-        response = request.get(
-            bitbucket_api.pull_request_difference(project, repository, _id),
-        )[1]
+        value_args = []
+        for page in request.get_pages(
+            get_bitbucket_api().pull_request_difference(project, repository, _id),
+        ):
+            value_args.extend(
+                (
+                    f"[bold red]{page['fromHash'][:11]}[/bold red] :arrow_right: [bold green]{page['toHash'][:11]}[/bold green]",
+                    i["path"]["toString"],
+                    f"{i['type']}",
+                )
+                for i in page["values"]
+            )
 
         pr_info = request.get(
-            bitbucket_api.pull_request_info(project, repository, _id),
+            get_bitbucket_api().pull_request_info(project, repository, _id),
         )[1]
 
     header = [
@@ -54,14 +98,6 @@ def show_diff(_id: str) -> None:
         ("FILE", "bold white"),
         ("TYPE", "bold yellow"),
     ]
-    value_args = [
-        (
-            f"[bold red]{response['fromHash'][:11]}[/bold red] :arrow_right: [bold green]{response['toHash'][:11]}[/bold green]",
-            i["path"]["toString"],
-            f"{i['type']}",
-        )
-        for i in response["values"]
-    ]
     table = richprint.table(header, value_args, True)
     richprint.console.print(table)
 
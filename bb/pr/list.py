@@ -24,10 +24,11 @@ bb.pr.show lists all pr is current repo, can also show all pr's authored/revewin
 either in current repo or all repos
 """
 
-from typing import Dict, List, Tuple
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from bb.utils import cmnd, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils import cmnd, output, request, richprint
+from bb.utils.api import Participant, PullRequest, get_bitbucket_api
 
 
 def to_richprint(
@@ -71,32 +72,26 @@ def state_check(_input: str) -> str:
     return state[_input.upper()]
 
 
-def outcome(_pr: dict) -> tuple:
+def outcome(_pr: PullRequest) -> tuple:
     """
     show the current status of the pr clean/conflicted
 
     Args:
-    -   _pr: dict: The pull request dictionary
+    -   _pr: PullRequest: The pull request
     Raises:
     -   This function does not raise any exceptions
     Returns:
     -   tuple: The formatted string
     """
-    return (
-        (
-            "[bold green]CLEAN"
-            if "mergeResult" not in _pr["properties"]
-            else f"{state_check(_pr['properties']['mergeResult']['outcome'])}"
-        ),
-    )
+    return (f"{state_check(_pr.merge_outcome)}",)
 
 
-def review_status(reviewers: list) -> str:
+def review_status(reviewers: Tuple[Participant, ...]) -> str:
     """
     show the review status of the pr
 
     Args:
-    -   reviewers: list: The list of reviewers
+    -   reviewers: Tuple[Participant, ...]: The reviewers
     Raises:
     -   This function does not raise any exceptions
     Returns:
@@ -104,99 +99,332 @@ def review_status(reviewers: list) -> str:
     """
     users = []
     if reviewers:
-        users.extend(
-            f"{state_check(user['status'])}"
-            for user in reviewers
-            if bool(user["user"]["active"])
-        )
+        users.extend(f"{state_check(user.status)}" for user in reviewers if user.active)
     else:
         users.append(state_check("NONE"))
     return " & ".join(list(set(users)))
 
 
-def construct_repo_dict(role_info: list) -> dict:
+def construct_repo_dict(
+    pull_requests: Iterable[PullRequest], repo_dict: Optional[dict] = None
+) -> dict:
     """
     Constructs a dictionary containing information about pull requests.
 
     Args:
-        role_info (list): A list containing role information.
+        pull_requests (Iterable[PullRequest]): The pull requests.
+        repo_dict (Optional[dict]): A dictionary of earlier pages to add the
+            pull requests to, keeping one node per repository and state.
 
     Returns:
         dict: A dictionary containing pull request information.
 
     """
-    repo_dict: dict = {}
-    if (role_info[0]) == 200 and (len(role_info[1]["values"]) > 0):
-        for _pr in role_info[1]["values"]:
-            repo = f"{_pr['fromRef']['repository']['slug']}"
-            if repo not in repo_dict:
-                repo_dict[repo] = {}
-                if _pr["state"] not in repo_dict[repo].values():
-                    repo_dict[repo] = {_pr["state"]: {}}
-            pr_url_id: tuple = (
-                _pr["links"]["self"][0]["href"].split("/")[-1],
-                _pr["links"]["self"][0]["href"],
+    repo_dict = {} if repo_dict is None else repo_dict
+    for _pr in pull_requests:
+        repo = _pr.from_ref.repository.slug
+        repo_dict.setdefault(repo, {}).setdefault(_pr.state, {})
+        author = _pr.author
+        _list = [
+            (
+                "[bold]Status[/bold]",
+                f"{_pr.from_ref.display_id} -> {_pr.to_ref.display_id} | {outcome(_pr)[0]} | {review_status(_pr.reviewers)}",
+            ),
+            ("[bold]Tittle[/bold]", _pr.title),
+            ("[bold]Description[/bold]", _pr.description or "-"),
+            (
+                "[bold]Author[/bold]",
+                f"{author.display_name or 'name not found'} [{author.name or 'id not found'}]({author.email or 'email not found'})",
+            ),
+            ("[bold]Url[/bold]", f"[link={_pr.url}]Click Here[/link]"),
+        ]
+        repo_dict[repo][_pr.state].update({_pr.url.split("/")[-1]: _list})
+    return repo_dict
+
+
+def render_repo_dict(repo_dict: dict, repository: str, _all: bool) -> bool:
+    """
+    Renders the repositories in repo_dict, stopping at the current repository
+    unless all repositories were requested.
+
+    Args:
+        repo_dict (dict): The output of construct_repo_dict.
+        repository (str): The current repository slug.
+        _all (bool): Flag indicating whether to render every repository.
+
+    Returns:
+        bool: True if anything was rendered.
+    """
+    rendered = False
+    for repo_name, pr_repo_dict in repo_dict.items():
+        rendered = True
+        if repo_name.lower() == repository.lower() and not _all:
+            to_richprint(repo_name, pr_repo_dict)
+            break
+
+        to_richprint(repo_name, pr_repo_dict)
+    return rendered
+
+
+def emit(
+    values: List[PullRequest],
+    repository: str,
+    _all: bool,
+    writer: Optional[output.RecordWriter],
+) -> bool:
+    """
+    Renders pull requests as a tree or, for machine-readable output, writes
+    one record per pull request.
+
+    Args:
+        values (List[PullRequest]): The pull requests.
+        repository (str): The current repository slug.
+        _all (bool): Flag indicating whether to include every repository.
+        writer (Optional[output.RecordWriter]): The record writer, None to
+            render with rich.
+
+    Returns:
+        bool: True if anything was rendered or written.
+    """
+    if writer is None:
+        return render_repo_dict(construct_repo_dict(values), repository, _all)
+
+    written = False
+    for _pr in values:
+        record = output.pull_request_record(_pr)
+        # filter on the repository the record reports, forks included
+        if _all or record["repository"].lower() == repository.lower():
+            writer.write(record)
+            written = True
+    return written
+
+
+def no_pull_requests(writer: Optional[output.RecordWriter]) -> None:
+    """Tells the user nothing matched, only when rendering with rich."""
+    if writer is None:
+        richprint.console.print(
+            "There are no open pr's :clap-emoji:", style="bold white"
+        )
+
+
+def progress(message: str, writer: Optional[output.RecordWriter]):
+    """A live progress indicator, or nothing for machine-readable output."""
+    return richprint.live_progress(message) if writer is None else nullcontext()
+
+
+def list_indexed_pull_request(
+    role: str,
+    _all: bool,
+    offline: bool,
+    writer: Optional[output.RecordWriter] = None,
+) -> None:
+    """
+    Displays pull requests from the local index instead of the server.
+
+    Args:
+        role (str): The role of the user viewing the pull requests.
+        _all (bool): Flag indicating whether to display pull requests of every
+            indexed repository or only the current one.
+        offline (bool): Never contact the server. Otherwise the current
+            repository is synced first when its index is stale.
+        writer (Optional[output.RecordWriter]): Write records instead of
+            rendering with rich.
+
+    Raises:
+        ValueError: If the current repository was never synced while offline.
+
+    Returns:
+        None
+    """
+    from bb.index.sync import is_stale, sync_repository
+    from bb.utils import cache, index
+    from bb.utils.helper import current_user
+    from bb.utils.ini import parse
+
+    project, repository = cmnd.base_repo()
+    host = get_bitbucket_api().bitbucket_host
+
+    if offline:
+        conn = index.connect()
+        try:
+            synced = index.watermark(conn, host, project, repository)
+        finally:
+            conn.close()
+        if synced is None:
+            raise ValueError(
+                f"'{project}/{repository}' is not indexed, run 'bb index sync'"
             )
-            author: dict[str, str] = {
-                "display_name": _pr["author"]["user"].get(
-                    "displayName", "name not found"
-                ),
-                "name": _pr["author"]["user"].get("name", "id not found"),
-                "email_address": _pr["author"]["user"].get(
-                    "emailAddress", "email not found"
-                ),
-            }
-
-            _list = [
-                (
-                    "[bold]Status[/bold]",
-                    f"{_pr['fromRef']['displayId']} -> {_pr['toRef']['displayId']} | {outcome(_pr)[0]} | {review_status(_pr['reviewers'])}",
-                ),
-                ("[bold]Tittle[/bold]", _pr["title"]),
-                (
-                    "[bold]Description[/bold]",
-                    _pr["description"] if "description" in _pr.keys() else "-",
-                ),
-                (
-                    "[bold]Author[/bold]",
-                    f"{author['display_name']} [{author['name']}]({author['email_address']})",
-                ),
-                ("[bold]Url[/bold]", f"[link={pr_url_id[1]}]Click Here[/link]"),
+    elif is_stale(project, repository):
+        with progress("Syncing pull request index ... ", writer) as live:
+            sync_repository(project, repository)
+            if live is not None:
+                live.update(richprint.console.print("DONE", style="bold green"))
+
+    filters: dict = {}
+    if role == "current" or not _all:
+        filters.update(project=project, repository=repository)
+    if role != "current":
+        username, token, _ = parse()
+        filters.update(
+            user=(cache.get_identity(host, token) or username)
+            if offline
+            else current_user(),
+            role=role.upper(),
+        )
+
+    conn = index.connect()
+    try:
+        values = list(map(PullRequest.from_json, index.query(conn, host, **filters)))
+    finally:
+        conn.close()
+
+    if not emit(values, repository, True if writer else _all, writer):
+        no_pull_requests(writer)
+
+
+def list_repositories_pull_request(
+    project: str, repos: List[str], writer: Optional[output.RecordWriter] = None
+) -> None:
+    """
+    Displays the open pull requests of many repositories, fetched concurrently
+    and rendered as each repository completes.
+
+    Args:
+        project (str): The project key.
+        repos (List[str]): The repository slugs, every repository of the
+            project when empty.
+        writer (Optional[output.RecordWriter]): Write records instead of
+            rendering with rich.
+
+    Raises:
+        ValueError: If the pull requests of any repository cannot be fetched.
+
+    Returns:
+        None
+    """
+    api = get_bitbucket_api()
+    if not repos:
+        with progress(f"Fetching repositories of '{project}' ... ", writer):
+            repos = [
+                repo["slug"] for repo in request.get_paged(api.get_repo_info(project))
             ]
-            repo_dict[repo][_pr["state"]].update({pr_url_id[0]: _list})
-    return repo_dict
 
+    async def fetch(repo: str) -> tuple:
+        values: list = []
+        try:
+            async for page in request.async_get_pages(
+                api.current_pull_request(project, repo)
+            ):
+                values.extend(map(PullRequest.from_json, page.get("values", [])))
+        except Exception as err:  # reported once every repository is done
+            return repo, values, err
+        return repo, values, None
+
+    async def stream() -> Tuple[bool, List[str]]:
+        rendered, failed = False, []
+        async for repo, values, err in request.as_completed(
+            *(fetch(repo) for repo in repos)
+        ):
+            if err is not None:
+                failed.append(repo)
+                continue
+            rendered = emit(values, repo, True, writer) or rendered
+        return rendered, failed
 
-def list_pull_request(role: str, _all: bool) -> None:
+    with progress(
+        f"Fetching Pull Requests of {len(repos)} repositories in '{project}' ... ",
+        writer,
+    ):
+        rendered, failed = request.run(stream())[0]
+
+    if not rendered:
+        no_pull_requests(writer)
+    if failed:
+        raise ValueError(
+            f"Cannot list pull requests of repository(s): {', '.join(failed)}"
+        )
+
+
+def list_pull_request(
+    role: str,
+    _all: bool,
+    offline: bool = False,
+    cached: bool = False,
+    project: str = "",
+    repos: Optional[List[str]] = None,
+    output_format: output.Output = output.Output.RICH,
+) -> None:
     """
     Fetches and displays the pull requests based on the specified role and repository.
 
     Args:
         role (str): The role of the user viewing the pull requests. Can be "current" or a specific role.
         _all (bool): Flag indicating whether to display all pull requests or only for the current repository.
+        offline (bool): Answer from the local index without contacting the server.
+        cached (bool): Answer from the local index, syncing it first if stale.
+        project (str): List the pull requests of every repository in this
+            project, or of `repos` when given.
+        repos (List[str]): Repository slugs to list, in `project` or the
+            current repository's project.
+        output_format (output.Output): Render with rich, or stream records as
+            json, ndjson or csv.
+
+    Returns:
+        None
+    """
+    writer = output.writer(output_format)
+    with writer or nullcontext():
+        if project or repos:
+            list_repositories_pull_request(
+                project or cmnd.base_repo()[0], repos or [], writer
+            )
+        elif offline or cached:
+            list_indexed_pull_request(role, _all, offline, writer)
+        else:
+            list_remote_pull_request(role, _all, writer)
+
+
+def list_remote_pull_request(
+    role: str, _all: bool, writer: Optional[output.RecordWriter] = None
+) -> None:
+    """
+    Fetches the pull requests of the current repository, or of the user's
+    inbox for a role. Records are written page by page as they arrive, the
+    rich tree is rendered once the last page is read so every repository and
+    state gets a single node, as with a single response.
+
+    Args:
+        role (str): The role of the user viewing the pull requests.
+        _all (bool): Flag indicating whether to display all pull requests or
+            only for the current repository.
+        writer (Optional[output.RecordWriter]): Write records instead of
+            rendering with rich.
 
     Returns:
         None
     """
     project, repository = cmnd.base_repo()
-    request_url = bitbucket_api.current_pull_request(project, repository)
+    request_url = get_bitbucket_api().current_pull_request(project, repository)
     if role != "current":
-        request_url = bitbucket_api.pull_request_viewer(role)
+        request_url = get_bitbucket_api().pull_request_viewer(role)
 
-    with richprint.live_progress(f"Fetching Pull Requests ({role}) ... ") as live:
-        role_info: list = request.get(request_url)
-        repo_dict = construct_repo_dict(role_info)
+    with progress(f"Fetching Pull Requests ({role}) ... ", writer) as live:
+        rendered, repo_dict = False, {}
+        for page_no, page in enumerate(request.get_pages(request_url)):
+            if page_no == 0 and live is not None:
+                live.update(richprint.console.print("DONE", style="bold green"))
 
-        live.update(richprint.console.print("DONE", style="bold green"))
+            values = map(PullRequest.from_json, page.get("values", []))
+            if writer is None:
+                construct_repo_dict(values, repo_dict)
+            else:
+                rendered = (
+                    emit(list(values), repository, role == "current" or _all, writer)
+                    or rendered
+                )
 
-        if len(repo_dict) > 0:
-            for repo_name, pr_repo_dict in repo_dict.items():
-                if repo_name.lower() == repository.lower() and not _all:
-                    to_richprint(repo_name, pr_repo_dict)
-                    break
+        if writer is None:
+            rendered = render_repo_dict(repo_dict, repository, _all)
 
-                to_richprint(repo_name, pr_repo_dict)
-        else:
-            richprint.console.print(
-                "There are no open pr's :clap-emoji:", style="bold white"
-            )
+        if not rendered:
+            no_pull_requests(writer)
@@ -29,11 +29,11 @@ from rich import print_json
 from typer import confirm
 
 from bb.utils import cmnd, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils.api import PullRequest, get_bitbucket_api
 from bb.utils.constants import common_vars
 
 
-def pr_source_branch_delete_check(
+async def pr_source_branch_delete_check(
     project: str,
     repository: str,
     _id: str,
@@ -52,20 +52,17 @@ def pr_source_branch_delete_check(
         ValueError: If the source branch deletion validation fails.
     """
 
-    if (
-        len(
-            request.get(
-                bitbucket_api.pr_source_branch_delete_check(
-                    project, repository, _id, delete_source_branch
-                ),
-            )[1]
-        )
-        != 0
-    ):
+    response = await request.async_get(
+        get_bitbucket_api().pr_source_branch_delete_check(
+            project, repository, _id, delete_source_branch
+        ),
+        fresh=True,
+    )
+    if len(response[1]) != 0:
         raise ValueError("Source branch deletion validation failed")
 
 
-def validate_pr_source_branch_delete_check(
+async def validate_pr_source_branch_delete_check(
     project: str, repository: str, _id: str
 ) -> None:
     """
@@ -82,23 +79,22 @@ def validate_pr_source_branch_delete_check(
     Returns:
         None
     """
-    with richprint.live_progress(f"Validating Merge for '{_id}' ... ") as live:
-        validation_response = request.get(
-            bitbucket_api.validate_merge(project, repository, _id),
-        )
-        if (
-            validation_response[1]["canMerge"] is True
-            and validation_response[1]["conflicted"] is False
-            and validation_response[1]["outcome"] == "CLEAN"
-        ):
-            live.update(richprint.console.print("OK", style="green"))
-        else:
-            live.update(richprint.console.print("FAILED", style="red"))
-            print_json(data=validation_response[1])
-            raise ValueError("Merge validation failed")
+    validation_response = await request.async_get(
+        get_bitbucket_api().validate_merge(project, repository, _id),
+        fresh=True,
+    )
+    if not (
+        validation_response[1]["canMerge"] is True
+        and validation_response[1]["conflicted"] is False
+        and validation_response[1]["outcome"] == "CLEAN"
+    ):
+        print_json(data=validation_response[1])
+        raise ValueError("Merge validation failed")
 
 
-def validate_automerge_conditions(project: str, repository: str, _id: str) -> tuple:
+async def validate_automerge_conditions(
+    project: str, repository: str, _id: str
+) -> tuple:
     """
     Validates the auto-merge conditions for a pull request.
 
@@ -108,30 +104,72 @@ def validate_automerge_conditions(project: str, repository: str, _id: str) -> tu
         _id (str): The pull request ID.
 
     Returns:
-        tuple: A tuple containing the pull request information, merge information,
-        from branch, target branch, and version.
+        tuple: A tuple containing the pull request (PullRequest), merge
+        information, from branch, target branch, and version.
 
     """
-    with richprint.live_progress(
-        f"Checking for '{repository}' auto-merge conditions ... "
-    ):
-        pr_info = request.get(
-            bitbucket_api.pull_request_info(project, repository, _id),
+    pr_info = PullRequest.from_json(
+        (
+            await request.async_get(
+                get_bitbucket_api().pull_request_info(project, repository, _id),
+                fresh=True,
+            )
         )[1]
-        from_branch, target_branch, version = (
-            pr_info["fromRef"]["displayId"],
-            pr_info["toRef"]["displayId"],
-            pr_info["version"],
-        )
-        return (
-            pr_info,
-            request.get(
-                bitbucket_api.get_merge_info(project, repository, target_branch),
-            )[1],
-            from_branch,
-            target_branch,
-            version,
-        )
+    )
+    from_branch, target_branch, version = (
+        pr_info.from_ref.display_id,
+        pr_info.to_ref.display_id,
+        pr_info.version,
+    )
+    return (
+        pr_info,
+        (
+            await request.async_get(
+                get_bitbucket_api().get_merge_info(project, repository, target_branch),
+                fresh=True,
+            )
+        )[1],
+        from_branch,
+        target_branch,
+        version,
+    )
+
+
+def validate_merge(
+    project: str, repository: str, _id: str, delete_source_branch: bool
+) -> tuple:
+    """
+    Runs the pre-merge checks concurrently: source branch deletion, merge
+    validation and auto-merge conditions. Only the auto-merge lookup depends
+    on the pull request info, so a merge costs two round trips instead of four.
+
+    Args:
+        project (str): The project name.
+        repository (str): The repository name.
+        _id (str): The pull request ID.
+        delete_source_branch (bool): Flag indicating whether to delete the source branch.
+
+    Raises:
+        ValueError: If any of the checks fail.
+
+    Returns:
+        tuple: The result of `validate_automerge_conditions`.
+    """
+    with richprint.live_progress(f"Validating Merge for '{_id}' ... ") as live:
+        try:
+            *_, automerge_conditions = request.run(
+                pr_source_branch_delete_check(
+                    project, repository, _id, delete_source_branch
+                ),
+                validate_pr_source_branch_delete_check(project, repository, _id),
+                validate_automerge_conditions(project, repository, _id),
+            )
+        except ValueError:
+            live.update(richprint.console.print("FAILED", style="red"))
+            raise
+        live.update(richprint.console.print("OK", style="green"))
+
+    return automerge_conditions
 
 
 def show_merge_stats(pr_merge_response, from_branch, target_branch) -> None:
@@ -186,8 +224,8 @@ def rebase_pr(project: str, repository: str, _id: str, version: int):
         None
     """
     request.post(
-        bitbucket_api.pr_rebase(project, repository, _id, version)[1],
-        bitbucket_api.pr_rebase(project, repository, _id, version)[0],
+        get_bitbucket_api().pr_rebase(project, repository, _id, version)[1],
+        get_bitbucket_api().pr_rebase(project, repository, _id, version)[0],
     )
 
 
@@ -207,12 +245,12 @@ def delete_branch(project, repository, _id, from_branch, target_branch):
     """
     with richprint.live_progress(f"Deleting Source Ref '{from_branch}'... ") as live:
         request.post(
-            bitbucket_api.pr_cleanup(project, repository, _id),
-            bitbucket_api.pr_cleanup_body(True),
+            get_bitbucket_api().pr_cleanup(project, repository, _id),
+            get_bitbucket_api().pr_cleanup_body(True),
         )
         request.delete(
-            bitbucket_api.delete_branch(project, repository, from_branch)[1],
-            bitbucket_api.delete_branch(project, repository, from_branch)[0],
+            get_bitbucket_api().delete_branch(project, repository, from_branch)[1],
+            get_bitbucket_api().delete_branch(project, repository, from_branch)[0],
         )
         live.update(richprint.console.print("DONE", style="green"))
 
@@ -238,8 +276,8 @@ def merge_pr(
     """
     from_branch, target_branch, version = branches_and_version
     pr_merge_response = request.post(
-        f"{bitbucket_api.validate_merge(project, repository, _id)}?avatarSize=32&version={version}",
-        bitbucket_api.pr_merge_body(
+        f"{get_bitbucket_api().validate_merge(project, repository, _id)}?avatarSize=32&version={version}",
+        get_bitbucket_api().pr_merge_body(
             project, repository, _id, from_branch, target_branch
         ),
     )
@@ -271,15 +309,13 @@ def merge_pull_request(
         None
     """
     project, repository = cmnd.base_repo()
-    pr_source_branch_delete_check(project, repository, _id, delete_source_branch)
-    validate_pr_source_branch_delete_check(project, repository, _id)
     (
         pr_info,
         pr_merge_response,
         from_branch,
         target_branch,
         version,
-    ) = validate_automerge_conditions(project, repository, _id)
+    ) = validate_merge(project, repository, _id, delete_source_branch)
 
     show_merge_stats(pr_merge_response, from_branch, target_branch)
 
@@ -293,7 +329,7 @@ def merge_pull_request(
         )
 
         with richprint.live_progress(
-            f"{'Rebasing and ' if rebase_condition else ''}Merging '{pr_info['links']['self'][0]['href']}'... "
+            f"{'Rebasing and ' if rebase_condition else ''}Merging '{pr_info.url}'... "
         ) as live:
             if rebase_condition:
                 rebase_pr(project, repository, _id, version)
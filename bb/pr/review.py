@@ -24,46 +24,152 @@ bb.pr.review marks a pull request as approved/unapproved or needs_work
 based on the pr id
 """
 
-from time import sleep
+import asyncio
+import time
+from typing import Any, Dict, List
 
-from bb.utils.api import bitbucket_api
+from bb.utils import request
+from bb.utils.api import PullRequest, get_bitbucket_api
 from bb.utils.cmnd import base_repo
-from bb.utils.request import get, put
-from bb.utils.richprint import console, live_progress
+from bb.utils.helper import current_user
+from bb.utils.richprint import console, live_progress, table
 
+action_mapper = {
+    "approve": ["APPROVED", "Approving", "green"],
+    "unapprove": ["UNAPPROVED", "Unapproving", "red"],
+    "needs_work": ["NEEDS_WORK", "Work Required on", "yellow"],
+}
 
-def review_pull_request(target: int, action: str) -> None:
+outdated_pr_state = "Cannot perform action on PR. Possibly due to outdated PR state."
+
+
+async def confirm_review(
+    project: str, repository: str, target: str, user: str, status: str, timeout: float
+) -> bool:
     """
-    Perform an action on a pull request.
+    Polls the pull request until the user's review status is visible on it.
 
     Args:
-        target (int): The pull request number.
-        action (str): The action to perform on the pull request.
+        project (str): The project key.
+        repository (str): The repository slug.
+        target (str): The pull request number.
+        user (str): The reviewing user's name.
+        status (str): The expected review status, e.g. 'APPROVED'.
+        timeout (float): Seconds to keep polling before giving up.
+
+    Returns:
+        bool: True once the status is visible, False on timeout.
+    """
+    url = get_bitbucket_api().pull_request_info(project, repository, target)
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    while True:
+        pull_request = PullRequest.from_json(
+            (await request.async_get(url, fresh=True))[1]
+        )
+        for participant in pull_request.reviewers + pull_request.participants:
+            if participant.name == user and participant.status == status:
+                return True
+        if time.monotonic() + delay > deadline:
+            return False
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+
+async def review(
+    project: str, repository: str, target: str, user: str, status: str, wait: bool
+) -> str:
+    """
+    Sets the user's review status on one pull request.
+
+    Args:
+        project (str): The project key.
+        repository (str): The repository slug.
+        target (str): The pull request number.
+        user (str): The reviewing user's name.
+        status (str): The review status to set, e.g. 'APPROVED'.
+        wait (bool): Poll until the new status is visible on the pull request.
+
+    Returns:
+        str: The status that was set.
+
+    Raises:
+        ValueError: If the review cannot be set or, with `wait`, is not
+            visible in time.
+    """
+    response = await request.async_put(
+        get_bitbucket_api().action_pull_request(project, repository, target, user),
+        {"status": status},
+    )
+    if response[0] == 409:
+        raise ValueError(outdated_pr_state)
+    if response[0] == 403:
+        raise ValueError("You are not allowed to review this pull request")
+    if wait and not await confirm_review(
+        project, repository, target, user, status, timeout=5.0
+    ):
+        raise ValueError(f"Review not visible on PR #{target} yet")
+    return status
+
+
+def review_pull_request(targets: List[str], action: str, wait: bool = False) -> None:
+    """
+    Perform an action on one or more pull requests. The user is resolved once
+    and the reviews are sent concurrently.
+
+    Args:
+        targets (List[str]): The pull request numbers.
+        action (str): The action to perform on the pull requests.
+        wait (bool): Poll until each review is visible on its pull request.
+
+    Raises:
+        ValueError: If the action fails on any of the pull requests.
 
     Returns:
         None
     """
-    action_mapper = {
-        "approve": ["APPROVED", "Approving", "green"],
-        "unapprove": ["UNAPPROVED", "Unapproving", "red"],
-        "needs_work": ["NEEDS_WORK", "Work Required on", "yellow"],
-    }
+    status, verb, style = action_mapper[action]
+    targets = [str(target).strip() for target in targets if str(target).strip()]
 
     with live_progress(
-        f"{action_mapper[action][1]} pull request '{target}' ... "
+        f"{verb} pull request{'s' if len(targets) > 1 else ''} '{', '.join(targets)}' ... "
     ) as live:
-        user_id = get(bitbucket_api.whoami())
+        user_id = current_user()
         project, repository = base_repo()
-        action_data = bitbucket_api.action_pull_request(
-            project, repository, target, user_id[1]
+        results: List[Any] = request.run(
+            *(
+                review(project, repository, target, user_id, status, wait)
+                for target in targets
+            ),
+            return_exceptions=True,
+        )
+        outcomes: Dict[str, Any] = dict(zip(targets, results))
+        failed = [t for t, result in outcomes.items() if isinstance(result, Exception)]
+
+        if len(targets) == 1:
+            if failed:
+                raise outcomes[targets[0]]
+            live.update(console.print(status, style=style))
+            return
+
+        console.print(
+            "FAILED" if failed else "DONE", style="red" if failed else "green"
         )
-        body = {"status": action_mapper[action][0]}
-        response = put(action_data, body)
-        sleep(0.4)
-        if response[0] == 409:
-            raise ValueError(
-                "Cannot perform action on PR. Possibly due to outdated PR state."
-            )
-        live.update(
-            console.print(f"{action_mapper[action][0]}", style=action_mapper[action][2])
+
+    console.print(
+        table(
+            [("ID", "bold white"), ("RESULT", "#FFFFFF")],
+            [
+                (
+                    target,
+                    str(result).strip()
+                    if isinstance(result, Exception)
+                    else f"[{style}]{result}[/{style}]",
+                )
+                for target, result in outcomes.items()
+            ],
+            True,
         )
+    )
+    if failed:
+        raise ValueError(f"Cannot review pull request(s): {', '.join(failed)}")
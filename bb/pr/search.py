@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.pr.search - full-text search over the local pull request index
+"""
+
+from bb.index.sync import is_stale, sync_repository
+from bb.utils import cmnd, index, richprint
+from bb.utils.api import PullRequest, get_bitbucket_api
+
+
+def search_pull_request(
+    text: str, _all: bool, state: str, limit: int, offline: bool
+) -> None:
+    """
+    Searches indexed pull requests by title, description, author and branches.
+
+    Args:
+        text (str): The words to search for, each matched as a prefix.
+        _all (bool): Search every indexed repository, not only the current one.
+        state (str): Only pull requests in this state, 'ALL' for any state.
+        limit (int): The maximum number of results to show.
+        offline (bool): Never contact the server. Otherwise the current
+            repository is synced first when its index is stale.
+
+    Returns:
+        None
+    """
+    project, repository = cmnd.base_repo()
+    if not offline and is_stale(project, repository):
+        with richprint.live_progress("Syncing pull request index ... ") as live:
+            sync_repository(project, repository)
+            live.update(richprint.console.print("DONE", style="bold green"))
+
+    conn = index.connect()
+    try:
+        results = index.search(
+            conn,
+            get_bitbucket_api().bitbucket_host,
+            text,
+            project=None if _all else project,
+            repository=None if _all else repository,
+            state=None if state.upper() == "ALL" else state.upper(),
+            limit=limit,
+        )
+    finally:
+        conn.close()
+
+    if not results:
+        richprint.console.print(f"No pull requests match '{text}'", style="bold white")
+        return
+
+    richprint.console.print(
+        richprint.table(
+            [
+                ("ID", "bold white"),
+                ("REPOSITORY", "cyan"),
+                ("STATE", "bold yellow"),
+                ("TITLE", "#FFFFFF"),
+                ("AUTHOR", "#FFFFFF"),
+                ("BRANCHES", "cyan"),
+            ],
+            [
+                (
+                    f"[link={_pr.url}]{_pr.id}[/link]",
+                    f"{_pr.to_ref.repository.project}/{_pr.to_ref.repository.slug}",
+                    _pr.state,
+                    _pr.title,
+                    _pr.author.display_name or "-",
+                    f"{_pr.from_ref.display_id} -> {_pr.to_ref.display_id}",
+                )
+                for _pr in map(PullRequest.from_json, results)
+            ],
+            True,
+        )
+    )
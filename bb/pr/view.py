@@ -25,32 +25,49 @@ bb.pr.view open the pull request in browser
 
 import webbrowser
 
-from bb.utils.api import bitbucket_api
+from bb.utils import output
+from bb.utils.api import PullRequest, get_bitbucket_api
 from bb.utils.cmnd import base_repo
 from bb.utils.request import get
 from bb.utils.richprint import console, live_progress, table
 
 
-def view_pull_request(_id: str, web: bool) -> None:
+def view_pull_request(
+    _id: str, web: bool, output_format: output.Output = output.Output.RICH
+) -> None:
     """
     Fetches information about a pull request and displays it.
 
     Args:
         _id (str): The ID of the pull request.
         web (bool): Flag indicating whether to open the pull request in the default browser.
+        output_format (output.Output): Render with rich, or write the pull
+            request as a json, ndjson or csv record.
 
     Returns:
         None
     """
+    writer = output.writer(output_format)
+    if writer is not None:
+        project, repository = base_repo()
+        pull_request = PullRequest.from_json(
+            get(get_bitbucket_api().pull_request_info(project, repository, _id))[1]
+        )
+        with writer:
+            writer.write(output.pull_request_record(pull_request))
+        return
+
     with live_progress(f"Fetching info on pr #{_id} ... ") as live:
         project, repository = base_repo()
-        url = get(bitbucket_api.pull_request_info(project, repository, _id))
+        pull_request = PullRequest.from_json(
+            get(get_bitbucket_api().pull_request_info(project, repository, _id))[1]
+        )
         live.update(console.print("DONE", style="bold green"))
 
     if web:
         with live_progress(f"Opening pr #{_id} in default browser ... ") as live:
             try:
-                to_broweser = webbrowser.open_new(url[1]["links"]["self"][0]["href"])
+                to_broweser = webbrowser.open_new(pull_request.url)
                 if to_broweser is False:
                     raise ValueError("Unable to open pr in browser")
                 live.update(console.print("DONE", style="bold green"))
@@ -60,9 +77,9 @@ def view_pull_request(_id: str, web: bool) -> None:
 
     else:
         console.print(
-            f"PR #({url[1]['id']}): {url[1]['fromRef']['displayId']}"
+            f"PR #({pull_request.id}): {pull_request.from_ref.display_id}"
             + " -> "
-            + f"{url[1]['toRef']['displayId']}",
+            + f"{pull_request.to_ref.display_id}",
             style="bold white",
         )
 
@@ -70,16 +87,9 @@ def view_pull_request(_id: str, web: bool) -> None:
             table(
                 ["_", "_"],
                 [
-                    ("Title", url[1]["title"]),
-                    (
-                        "Description",
-                        (
-                            url[1]["description"]
-                            if "description" in url[1].keys()
-                            else "-"
-                        ),
-                    ),
-                    ("State", url[1]["state"]),
+                    ("Title", pull_request.title),
+                    ("Description", pull_request.description or "-"),
+                    ("State", pull_request.state),
                 ],
                 False,
             )
@@ -89,9 +99,9 @@ def view_pull_request(_id: str, web: bool) -> None:
             table(
                 ["_", "_"],
                 [
-                    ("ID", url[1]["author"]["user"]["name"]),
-                    ("Name", url[1]["author"]["user"]["displayName"]),
-                    ("Email", url[1]["author"]["user"]["emailAddress"]),
+                    ("ID", pull_request.author.name),
+                    ("Name", pull_request.author.display_name),
+                    ("Email", pull_request.author.email),
                 ],
                 False,
             )
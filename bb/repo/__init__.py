@@ -25,14 +25,9 @@ bb: repo - repository management
 
 from typer import Argument, Option, Typer
 
-from bb.repo.archive import archive_repository
-from bb.repo.create import create_repository
-from bb.repo.delete import delete_repository
-from bb.utils.cmnd import clone_repo
 from bb.utils.constants import common_vars
 from bb.utils.helper import error_handler, validate_input
 from bb.utils.ini import parse
-from bb.utils.richprint import console
 
 _repo = Typer(add_completion=True, no_args_is_help=True)
 
@@ -50,6 +45,9 @@ def clone(
         None
     """
 
+    from bb.utils.cmnd import clone_repo
+    from bb.utils.richprint import console
+
     name = validate_input(
         name, "project/repository to clone", common_vars.repo_cant_be_none
     )
@@ -73,6 +71,8 @@ def delete(
         None
     """
 
+    from bb.repo.delete import delete_repository
+
     project = validate_input(
         project, common_vars.project_name, common_vars.project_cant_be_none
     )
@@ -98,6 +98,8 @@ def archive(
         None
     """
 
+    from bb.repo.archive import archive_repository
+
     project = validate_input(
         project, common_vars.project_name, common_vars.project_cant_be_none
     )
@@ -123,6 +125,8 @@ def unarchive(
         None
     """
 
+    from bb.repo.archive import archive_repository
+
     project = validate_input(
         project, common_vars.project_name, common_vars.project_cant_be_none
     )
@@ -152,6 +156,8 @@ def create(
         None
     """
 
+    from bb.repo.create import create_repository
+
     project = validate_input(
         project, common_vars.project_name, common_vars.project_cant_be_none
     )
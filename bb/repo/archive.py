@@ -25,7 +25,7 @@ bb.repo.delete - deletes a bitbucket repository
 
 from typer import Exit, confirm
 
-from bb.utils.api import bitbucket_api
+from bb.utils.api import get_bitbucket_api
 from bb.utils.request import put
 from bb.utils.richprint import console, live_progress
 
@@ -55,7 +55,7 @@ def archive_repository(project: str, repo: str, archive: bool) -> None:
         f"{'Archiving' if archive else 'Unarchiving'} Repository '{project}/{repo}' ... "
     ) as live:
         request = put(
-            bitbucket_api.delete_repo(project, repo),
+            get_bitbucket_api().delete_repo(project, repo),
             {"archived": archive},
         )
 
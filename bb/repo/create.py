@@ -19,7 +19,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
-from bb.utils.api import bitbucket_api
+from bb.utils.api import get_bitbucket_api
 from bb.utils.request import post
 from bb.utils.richprint import console, live_progress
 
@@ -42,7 +42,7 @@ def create_repository(
 
     with live_progress(f"Creating '{project}/{repo}' Repository ... ") as live:
         request = post(
-            bitbucket_api.create_repo(project),
+            get_bitbucket_api().create_repo(project),
             {
                 "name": repo,
                 "slug": repo,
@@ -25,7 +25,7 @@ bb.repo.delete - deletes a bitbucket repository
 
 from typer import Exit, confirm, prompt
 
-from bb.utils.api import bitbucket_api
+from bb.utils.api import get_bitbucket_api
 from bb.utils.request import delete as delete_request
 from bb.utils.richprint import console, live_progress
 
@@ -62,7 +62,7 @@ If you prefer, you can archive this repository instead via [blue]'bb repo archiv
 
     with live_progress(f"Deleting Repository '{project}/{repo}' ... ") as live:
         request = delete_request(
-            bitbucket_api.delete_repo(project, repo),
+            get_bitbucket_api().delete_repo(project, repo),
             {},
         )
 
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.shell - runs many bb commands in one process
+
+`bb shell` reads commands interactively and `bb batch` reads them from a file
+or stdin, one per line. Every line is dispatched to the same typer app, so
+imports, the pooled HTTP connections and the caches are shared. With
+`--parallel` independent lines run on a thread pool; their output is captured
+per line and printed in line order as each completes.
+"""
+
+import io
+import shlex
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Callable, Iterable, List, Optional, Tuple, Type
+
+NESTED = ("shell", "batch", "daemon")
+
+
+def exit_code(err: SystemExit) -> int:
+    """Maps SystemExit to a process exit code, as the interpreter does."""
+    if err.code is None:
+        return 0
+    return err.code if isinstance(err.code, int) else 1
+
+
+def parse_line(line: str) -> Optional[List[str]]:
+    """
+    Splits a line into command arguments, shell style.
+
+    Args:
+        line (str): The line; a leading 'bb' is optional and '#' starts a
+            comment.
+
+    Raises:
+        ValueError: If the quoting is unbalanced or the command cannot run
+            nested.
+
+    Returns:
+        Optional[List[str]]: The arguments, None for a blank or comment line.
+    """
+    argv = shlex.split(line, comments=True)
+    if argv[:1] == ["bb"]:
+        argv = argv[1:]
+    if argv[:1] and argv[0] in NESTED:
+        raise ValueError(f"'bb {argv[0]}' cannot run inside bb shell/batch")
+    return argv or None
+
+
+def run_argv(argv: List[str]) -> int:
+    """
+    Runs one bb command in this process.
+
+    Args:
+        argv (List[str]): The command line arguments, without the program.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    from bb.cli import _bb
+    from bb.utils import richprint
+    from bb.utils.constants import common_vars
+
+    verbose = common_vars.state["verbose"]
+    try:
+        _bb(args=argv, prog_name="bb")
+        return 0
+    except SystemExit as err:
+        return exit_code(err)
+    finally:
+        common_vars.state["verbose"] = verbose
+        richprint.diagnostics_to_stderr(False)
+
+
+class _Router(io.TextIOBase):
+    """A standard stream writing to the current thread's capture, if any."""
+
+    def __init__(self, default, local: threading.local, name: str) -> None:
+        self.default = default
+        self.local = local
+        self.name = name
+
+    def _target(self):
+        return getattr(self.local, self.name, None) or self.default
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self._target(), "encoding", None) or "utf-8"
+
+    def isatty(self) -> bool:
+        # no cursor movement or live refresh while lines share the terminal
+        return False
+
+    def readable(self) -> bool:
+        return self.name == "stdin"
+
+    def writable(self) -> bool:
+        return self.name != "stdin"
+
+    def read(self, size: int = -1) -> str:
+        return self._target().read(size)
+
+    def readline(self, size: int = -1) -> str:
+        return self._target().readline(size)
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+
+class Capture:
+    """
+    Routes sys.stdin, sys.stdout and sys.stderr per thread while active, so
+    commands running concurrently do not interleave their output. Captured
+    commands read an empty stdin: a prompt aborts instead of hanging.
+    """
+
+    def __init__(self) -> None:
+        self.local = threading.local()
+        self.streams: tuple = ()
+
+    def __enter__(self) -> "Capture":
+        self.streams = (sys.stdin, sys.stdout, sys.stderr)
+        sys.stdin, sys.stdout, sys.stderr = (
+            _Router(stream, self.local, name)
+            for stream, name in zip(self.streams, ("stdin", "stdout", "stderr"))
+        )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        sys.stdin, sys.stdout, sys.stderr = self.streams
+
+    def run(self, func: Callable[..., int], *args) -> Tuple[int, str, str]:
+        """
+        Calls `func` with the current thread's streams captured.
+
+        Returns:
+            Tuple[int, str, str]: The result, captured stdout and stderr.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        self.local.stdin, self.local.stdout, self.local.stderr = (
+            io.StringIO(),
+            stdout,
+            stderr,
+        )
+        try:
+            return func(*args), stdout.getvalue(), stderr.getvalue()
+        finally:
+            self.local.stdin = self.local.stdout = self.local.stderr = None
+
+
+def _commands(lines: Iterable[str]) -> Iterable[Tuple[int, List[str]]]:
+    for number, line in enumerate(lines, 1):
+        try:
+            argv = parse_line(line)
+        except ValueError as err:
+            raise ValueError(f"line {number}: {err}") from None
+        if argv:
+            yield number, argv
+
+
+def run_lines(
+    lines: Iterable[str], parallel: int = 1, keep_going: bool = False
+) -> List[int]:
+    """
+    Runs one command per line.
+
+    Args:
+        lines (Iterable[str]): The lines, read lazily when run sequentially.
+        parallel (int): The number of lines running at once.
+        keep_going (bool): Run the remaining lines after a line fails.
+
+    Raises:
+        ValueError: If a line cannot be parsed.
+
+    Returns:
+        List[int]: The numbers of the lines that failed.
+    """
+    failed: List[int] = []
+    if parallel <= 1:
+        for number, argv in _commands(lines):
+            if run_argv(argv):
+                failed.append(number)
+                if not keep_going:
+                    break
+        return failed
+
+    commands = list(_commands(lines))
+    with Capture() as capture, ThreadPoolExecutor(parallel) as pool:
+        futures = [pool.submit(capture.run, run_argv, argv) for _, argv in commands]
+        for (number, _), future in zip(commands, futures):
+            if future.cancelled():
+                continue
+            code, out, err = future.result()
+            capture.streams[1].write(out)
+            capture.streams[2].write(err)
+            if code:
+                failed.append(number)
+                if not keep_going:
+                    for pending in futures:
+                        pending.cancel()
+    return failed
+
+
+def run_batch(path: str, parallel: int = 1, keep_going: bool = False) -> None:
+    """
+    Runs the commands of a script, one per line.
+
+    Args:
+        path (str): The script, '-' for stdin. Stdin is read up front so that
+            commands cannot consume the script's own lines.
+        parallel (int): The number of lines running at once.
+        keep_going (bool): Run the remaining lines after a line fails.
+
+    Raises:
+        ValueError: If a line cannot be parsed or any line failed.
+
+    Returns:
+        None
+    """
+    if path == "-":
+        failed = run_lines(sys.stdin.readlines(), parallel, keep_going)
+    else:
+        with open(path, encoding="utf-8") as script:
+            failed = run_lines(script, parallel, keep_going)
+    if failed:
+        raise ValueError(f"Failed line(s): {', '.join(map(str, failed))}")
+
+
+def repl() -> None:
+    """
+    Reads and runs commands until 'exit', 'quit' or end of input.
+
+    Returns:
+        None
+    """
+    try:
+        import readline  # noqa: F401 line editing and history, where available
+    except ImportError:
+        pass
+    from bb.utils.richprint import console
+
+    while True:
+        try:
+            line = input("bb> ")
+        except EOFError:
+            console.print()
+            return
+        except KeyboardInterrupt:
+            console.print()
+            continue
+        if line.strip() in ("exit", "quit"):
+            return
+        try:
+            argv = parse_line(line)
+        except ValueError as err:
+            console.print(f"{err}", style="bold red")
+            continue
+        if argv:
+            run_argv(argv)
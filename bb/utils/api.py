@@ -23,6 +23,10 @@
 bb.utils.api - contains the API model for Bitbucket server
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
 from bb.utils.ini import is_config_present, parse
 
 
@@ -79,10 +83,23 @@ class BitbucketAPI:
             project (str): The project key or ID.
 
         Returns:
-            str: The API URL for getting repository information.
+            str: The API URL for getting repository information, paged via `request.get_paged`.
+        """
+        return self.api_project_url(f"/rest/api/latest/projects/{project}/repos")
+
+    def repo_info(self, project: str, repository: str) -> str:
+        """
+        Retrieves the API URL for a single repository of a project.
+
+        Args:
+            project (str): The project key or ID.
+            repository (str): The repository slug.
+
+        Returns:
+            str: The API URL for getting the repository information.
         """
         return self.api_project_url(
-            f"/rest/api/latest/projects/{project}/repos?start=0&limit=10000"
+            f"/rest/api/latest/projects/{project}/repos/{repository}"
         )
 
     def default_reviewers(
@@ -168,10 +185,10 @@ class BitbucketAPI:
             pr_number (str): The pull request number.
 
         Returns:
-            str: The URL for the pull request difference.
+            str: The URL for the pull request difference, paged via `request.get_pages`.
         """
         return self.api_project_url(
-            f"/rest/api/latest/projects/{project}/repos/{repository}/pull-requests/{pr_number}/changes?start=0&limit=1000&changeScope=unreviewed"
+            f"/rest/api/latest/projects/{project}/repos/{repository}/pull-requests/{pr_number}/changes?changeScope=unreviewed"
         )
 
     def pull_request_info(self, project: str, repository: str, _id: str) -> str:
@@ -220,6 +237,22 @@ class BitbucketAPI:
             f"/rest/api/latest/projects/{project}/repos/{repository}/pull-requests"
         )
 
+    def pull_requests_by_update(self, project: str, repository: str) -> str:
+        """
+        Returns the URL listing pull requests of every state in the repository,
+        most recently updated first, used to sync the local index.
+
+        Args:
+            project (str): The name of the project.
+            repository (str): The name of the repository.
+
+        Returns:
+            str: The URL of the pull request listing.
+        """
+        return self.api_project_url(
+            f"/rest/api/latest/projects/{project}/repos/{repository}/pull-requests?state=ALL&order=NEWEST"
+        )
+
     def whoami(self) -> str:
         """
         Retrieves the user information from the API.
@@ -439,12 +472,15 @@ class BitbucketAPI:
         return self.api_project_url(f"/rest/api/latest/projects/{project}/repos")
 
 
-def load_bitbucket_api() -> BitbucketAPI:
+@lru_cache(maxsize=None)
+def get_bitbucket_api() -> BitbucketAPI:
     """
-    Loads the Bitbucket API by reading the configuration data and returning an instance of BitbucketAPI.
+    Returns the BitbucketAPI for the configured host, reading the configuration
+    on first use only. Failed lookups are not memoized, so a configuration
+    written later in the same process is picked up.
 
     Raises:
-        ValueError: If the configuration is not present or if the number of configuration items is not 3.
+        ValueError: If the configuration is not present.
 
     Returns:
         BitbucketAPI: An instance of the BitbucketAPI class.
@@ -456,7 +492,162 @@ def load_bitbucket_api() -> BitbucketAPI:
     return BitbucketAPI(config_data[2])
 
 
-try:
-    bitbucket_api = load_bitbucket_api()
-except ValueError:
-    bitbucket_api = None
+@dataclass(frozen=True)
+class Repository:
+    """A repository as referenced by a pull request."""
+
+    __slots__ = ("project", "slug", "name")
+
+    project: str
+    slug: str
+    name: str
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Repository":
+        """
+        Builds a Repository from an API response.
+
+        Args:
+            data (dict): The 'repository' object of a ref.
+
+        Returns:
+            Repository: The repository.
+        """
+        return cls(
+            data.get("project", {}).get("key", ""),
+            data.get("slug", ""),
+            data.get("name", ""),
+        )
+
+
+@dataclass(frozen=True)
+class Ref:
+    """The source or target branch of a pull request."""
+
+    __slots__ = ("display_id", "latest_commit", "repository")
+
+    display_id: str
+    latest_commit: str
+    repository: Repository
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Ref":
+        """
+        Builds a Ref from an API response.
+
+        Args:
+            data (dict): The 'fromRef' or 'toRef' object of a pull request.
+
+        Returns:
+            Ref: The ref.
+        """
+        return cls(
+            data.get("displayId", ""),
+            data.get("latestCommit", ""),
+            Repository.from_json(data.get("repository", {})),
+        )
+
+
+@dataclass(frozen=True)
+class Participant:
+    """The author, a reviewer or a participant of a pull request."""
+
+    __slots__ = ("name", "slug", "display_name", "email", "active", "role", "status")
+
+    name: Optional[str]
+    slug: Optional[str]
+    display_name: Optional[str]
+    email: Optional[str]
+    active: bool
+    role: str
+    status: str
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Participant":
+        """
+        Builds a Participant from an API response.
+
+        Args:
+            data (dict): An entry of 'author', 'reviewers' or 'participants'.
+
+        Returns:
+            Participant: The participant.
+        """
+        user = data.get("user", {})
+        return cls(
+            user.get("name"),
+            user.get("slug"),
+            user.get("displayName"),
+            user.get("emailAddress"),
+            bool(user.get("active", True)),
+            data.get("role", ""),
+            data.get("status", "UNAPPROVED"),
+        )
+
+
+@dataclass(frozen=True)
+class PullRequest:
+    """
+    The fields of a pull request the commands use. Responses are parsed once
+    into these slotted objects so listings do not keep whole JSON trees alive.
+    """
+
+    __slots__ = (
+        "id",
+        "version",
+        "state",
+        "title",
+        "description",
+        "from_ref",
+        "to_ref",
+        "author",
+        "reviewers",
+        "participants",
+        "merge_outcome",
+        "created",
+        "updated",
+        "url",
+    )
+
+    id: Optional[int]
+    version: int
+    state: str
+    title: str
+    description: str
+    from_ref: Ref
+    to_ref: Ref
+    author: Participant
+    reviewers: Tuple[Participant, ...]
+    participants: Tuple[Participant, ...]
+    merge_outcome: str
+    created: Optional[int]
+    updated: Optional[int]
+    url: str
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PullRequest":
+        """
+        Builds a PullRequest from an API response.
+
+        Args:
+            data (dict): The pull request as returned by the API.
+
+        Returns:
+            PullRequest: The pull request.
+        """
+        return cls(
+            data.get("id"),
+            int(data.get("version", 0)),
+            data.get("state", ""),
+            data.get("title", ""),
+            data.get("description", ""),
+            Ref.from_json(data.get("fromRef", {})),
+            Ref.from_json(data.get("toRef", {})),
+            Participant.from_json(data.get("author", {})),
+            tuple(map(Participant.from_json, data.get("reviewers", []))),
+            tuple(map(Participant.from_json, data.get("participants", []))),
+            data.get("properties", {}).get("mergeResult", {}).get("outcome", "CLEAN"),
+            data.get("createdDate"),
+            data.get("updatedDate"),
+            data.get("links", {}).get("self", [{}])[0].get("href", ""),
+        )
@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.cache - small persistent caches kept under the user's cache
+directory, so repeated invocations can skip lookups that rarely change.
+Also holds the opt-in HTTP response cache used by bb.utils.request.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+
+def cache_path() -> str:
+    """
+    Returns the path to the cache directory, honouring XDG_CACHE_HOME.
+
+    :return: The path to the bb cache directory.
+    :rtype: str
+    """
+    home: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        str(Path.home()), ".cache"
+    )
+    return os.path.join(home, "bb")
+
+
+BB_CACHE_DIR: str = cache_path()
+
+
+def load(name: str) -> dict:
+    """
+    Loads a named JSON cache, an unreadable or missing cache is treated as empty.
+
+    Args:
+        name (str): The name of the cache file, without extension.
+
+    Returns:
+        dict: The cached data.
+    """
+    try:
+        with open(
+            os.path.join(BB_CACHE_DIR, f"{name}.json"), encoding="utf-8"
+        ) as cache:
+            data = json.load(cache)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def store(name: str, data: dict) -> None:
+    """
+    Atomically writes a named JSON cache, failures are ignored as the cache
+    is only an optimisation.
+
+    Args:
+        name (str): The name of the cache file, without extension.
+        data (dict): The data to cache.
+
+    Returns:
+        None
+    """
+    cache_file = os.path.join(BB_CACHE_DIR, f"{name}.json")
+    try:
+        Path(BB_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as cache:
+            json.dump(data, cache)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+
+def _repo_key(bitbucket_host: str, project: str, repository: str) -> str:
+    """Key a repository by host, project and slug, which are case-insensitive."""
+    return f"{bitbucket_host.rstrip('/')}/{project}/{repository}".lower()
+
+
+def get_repo_id(bitbucket_host: str, project: str, repository: str) -> int | None:
+    """
+    Looks up a cached repository id.
+
+    Args:
+        bitbucket_host (str): The Bitbucket host URL.
+        project (str): The project key.
+        repository (str): The repository slug.
+
+    Returns:
+        int | None: The repository id, or None if it is not cached.
+    """
+    return load("repo_ids").get(_repo_key(bitbucket_host, project, repository))
+
+
+def set_repo_id(
+    bitbucket_host: str, project: str, repository: str, repo_id: int
+) -> None:
+    """
+    Caches the id of a repository.
+
+    Args:
+        bitbucket_host (str): The Bitbucket host URL.
+        project (str): The project key.
+        repository (str): The repository slug.
+        repo_id (int): The repository id.
+
+    Returns:
+        None
+    """
+    repo_ids = load("repo_ids")
+    repo_ids[_repo_key(bitbucket_host, project, repository)] = repo_id
+    store("repo_ids", repo_ids)
+
+
+def _identity_key(bitbucket_host: str, token: str) -> str:
+    """Key an identity by host and a fingerprint of the token, never the token."""
+    fingerprint = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+    return f"{bitbucket_host.rstrip('/').lower()}#{fingerprint}"
+
+
+def get_identity(bitbucket_host: str, token: str) -> str | None:
+    """
+    Looks up the cached user the token authenticates as.
+
+    Args:
+        bitbucket_host (str): The Bitbucket host URL.
+        token (str): The access token.
+
+    Returns:
+        str | None: The user slug, or None if it is not cached.
+    """
+    return load("identities").get(_identity_key(bitbucket_host, token))
+
+
+def set_identity(bitbucket_host: str, token: str, user: str) -> None:
+    """
+    Caches the user the token authenticates as.
+
+    Args:
+        bitbucket_host (str): The Bitbucket host URL.
+        token (str): The access token.
+        user (str): The user slug returned by whoami.
+
+    Returns:
+        None
+    """
+    identities = load("identities")
+    identities[_identity_key(bitbucket_host, token)] = user
+    store("identities", identities)
+
+
+def clear_identities() -> None:
+    """
+    Forgets every cached identity, used when the credentials are rewritten.
+
+    Returns:
+        None
+    """
+    try:
+        os.remove(os.path.join(BB_CACHE_DIR, "identities.json"))
+    except OSError:
+        pass
+
+
+@dataclass
+class CachedResponse:
+    """A GET response body stored on disk along with its validators."""
+
+    path: str
+    url: str
+    stored: float
+    content: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        Builds the headers for revalidating the entry with the server.
+
+        Returns:
+            dict[str, str]: `If-None-Match`/`If-Modified-Since` headers, if any.
+        """
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    An on-disk cache of GET responses keyed by URL and user. Entries younger
+    than `ttl` seconds are served without a request, older ones are revalidated
+    with `ETag`/`Last-Modified`; the least recently used entries are evicted
+    once the cache grows beyond `max_size` bytes.
+
+    The size of the cache is kept in a `.size` file next to the entries, so a
+    save only scans the directory when the cache is full.
+    """
+
+    SIZE_FILE = ".size"
+
+    def __init__(self, directory: str, ttl: float, max_size: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def _path(self, user: str, url: str) -> str:
+        """Returns the file holding the entry for the given user and URL."""
+        key = hashlib.sha256(f"{user}\n{url}".encode()).hexdigest()
+        return os.path.join(self.directory, key)
+
+    def lookup(self, user: str, url: str) -> CachedResponse | None:
+        """
+        Looks up the cached response for the given user and URL.
+
+        Args:
+            user (str): The user the response was fetched as.
+            url (str): The URL of the request.
+
+        Returns:
+            CachedResponse | None: The cached response, or None on a miss.
+        """
+        path = self._path(user, url)
+        try:
+            with open(path, "rb") as entry:
+                meta = json.loads(entry.readline())
+                content = entry.read()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("url") != url:
+            return None
+        return CachedResponse(
+            path,
+            url,
+            meta["stored"],
+            content,
+            meta.get("etag"),
+            meta.get("last_modified"),
+        )
+
+    def is_fresh(self, cached: CachedResponse) -> bool:
+        """
+        Checks whether an entry can be served without revalidation.
+
+        Args:
+            cached (CachedResponse): The cached response.
+
+        Returns:
+            bool: True if the entry is younger than the TTL.
+        """
+        return time.time() - cached.stored < self.ttl
+
+    def save(
+        self,
+        user: str,
+        url: str,
+        content: bytes,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        """
+        Stores a response, responses that can neither be revalidated nor
+        served within a TTL are not worth keeping and are skipped.
+
+        Args:
+            user (str): The user the response was fetched as.
+            url (str): The URL of the request.
+            content (bytes): The body of the response.
+            etag (str | None): The `ETag` header of the response.
+            last_modified (str | None): The `Last-Modified` header of the response.
+
+        Returns:
+            None
+        """
+        if not (etag or last_modified or self.ttl > 0):
+            return
+
+        path = self._path(user, url)
+        try:
+            previous = os.stat(path).st_size
+        except OSError:
+            previous = 0
+        meta = {
+            "url": url,
+            "stored": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        try:
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            tmp_file = f"{path}.{os.getpid()}.tmp"
+            header = json.dumps(meta).encode() + b"\n"
+            with open(tmp_file, "wb") as entry:
+                entry.write(header)
+                entry.write(content)
+            os.replace(tmp_file, path)
+        except OSError:
+            return
+        self._grow(len(header) + len(content) - previous)
+
+    def refresh(self, user: str, cached: CachedResponse) -> None:
+        """
+        Marks an entry as revalidated after a `304 Not Modified`.
+
+        Args:
+            user (str): The user the response was fetched as.
+            cached (CachedResponse): The revalidated entry.
+
+        Returns:
+            None
+        """
+        self.save(user, cached.url, cached.content, cached.etag, cached.last_modified)
+
+    def _size(self) -> int | None:
+        """Reads the recorded size of the cache, None if it is unknown."""
+        try:
+            with open(
+                os.path.join(self.directory, self.SIZE_FILE), encoding="utf-8"
+            ) as size:
+                return int(size.read())
+        except (OSError, ValueError):
+            return None
+
+    def _set_size(self, total: int) -> None:
+        """Records the size of the cache."""
+        path = os.path.join(self.directory, self.SIZE_FILE)
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as size:
+                size.write(str(total))
+            os.replace(tmp_file, path)
+        except OSError:
+            pass
+
+    def _grow(self, delta: int) -> None:
+        """
+        Adds the bytes written by a save to the recorded size, evicting when
+        the cache is full or its size is unknown.
+
+        Concurrent bb processes may lose an update of the recorded size, every
+        eviction pass records the size found on disk again.
+        """
+        total = self._size()
+        if total is None or total + delta > self.max_size:
+            self._evict()
+        else:
+            self._set_size(max(total + delta, 0))
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries beyond `max_size` bytes."""
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.is_file()
+                and not entry.name.startswith(".")
+                and not entry.name.endswith(".tmp")
+            ]
+        except OSError:
+            return
+
+        stats = []
+        for entry in entries:
+            try:
+                stats.append((entry.path, entry.stat()))
+            except OSError:  # evicted by another bb process meanwhile
+                continue
+        total = sum(stat.st_size for _, stat in stats)
+        for path, stat in sorted(stats, key=lambda item: item[1].st_mtime):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= stat.st_size
+        self._set_size(total)
+
+    def touch(self, cached: CachedResponse) -> None:
+        """
+        Marks an entry as recently used, so LRU eviction keeps it.
+
+        Args:
+            cached (CachedResponse): The entry that was served.
+
+        Returns:
+            None
+        """
+        try:
+            os.utime(cached.path)
+        except OSError:
+            pass
+
+
+def response_cache() -> ResponseCache | None:
+    """
+    Returns the HTTP response cache if it is enabled in the `[cache]` section
+    of the configuration file, it is opt-in and disabled by default.
+
+    Returns:
+        ResponseCache | None: The response cache, or None if it is disabled.
+    """
+    from bb.utils.ini import get_setting
+
+    if not get_setting("cache", "enabled", False):
+        return None
+    return ResponseCache(
+        os.path.join(BB_CACHE_DIR, "http"),
+        get_setting("cache", "ttl", 0.0),
+        get_setting("cache", "max_size", 64) * 1024 * 1024,
+    )
@@ -23,12 +23,16 @@
 bb.utils.cmnd - contains funcs to run native os command
 can capture relavent details from local repository
 
+Read-only lookups go through bb.utils.git first and only spawn git when the
+repository layout is not one it can read.
 """
 
+import atexit
 import platform
 import subprocess
-from typing import Dict, Optional
+from typing import IO, Dict, Optional, Tuple
 
+from bb.utils import git, timing
 from bb.utils.richprint import console
 
 
@@ -51,13 +55,14 @@ def subprocess_run(command: str, text: Optional[str] = None) -> str:
         text = text.encode("utf-8")  # type: ignore
 
     try:
-        cmnd = subprocess.run(
-            command.split(" "),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            input=text,
-            check=True,
-        )
+        with timing.span("git", command):
+            cmnd = subprocess.run(
+                command.split(" "),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                input=text,
+                check=True,
+            )
 
     except subprocess.CalledProcessError as err:
         console.print("ERROR", style="bold red")
@@ -75,6 +80,10 @@ def is_git_repo() -> bool:
     Returns:
         bool: True if the current directory is a Git repository, False otherwise.
     """
+    with timing.span("git", "read .git (repository)"):
+        found = git.find_repository() is not None
+    if found:
+        return True
     return subprocess_run("git rev-parse --is-inside-work-tree") == "true"
 
 
@@ -88,12 +97,19 @@ def base_repo() -> list:
     Raises:
         ValueError: If no remote information is found.
     """
-    cmnd = subprocess_run("git remote -v")
+    with timing.span("git", "read .git (remotes)"):
+        repository = git.find_repository()
+        remotes = repository.remotes() if repository is not None else None
+    if remotes:
+        # `git remote -v` lists remotes by name, the first one wins
+        formatted_cmnd = remotes[sorted(remotes)[0]]
+    else:
+        cmnd = subprocess_run("git remote -v")
 
-    if cmnd is None:
-        raise ValueError("no remote information is found")
+        if not cmnd:
+            raise ValueError("no remote information is found")
 
-    formatted_cmnd = cmnd.splitlines()[0].replace("\t", " ").split(" ")[1].strip()
+        formatted_cmnd = cmnd.splitlines()[0].replace("\t", " ").split(" ")[1].strip()
 
     return [
         formatted_cmnd.split("/")[-2],
@@ -101,6 +117,124 @@ def base_repo() -> list:
     ]
 
 
+class CatFile:
+    """
+    A long-lived `git cat-file --batch` coprocess.
+
+    Object requests are streamed over one pipe, so reading many objects costs
+    a single process start. The process is started on first use and lives
+    until `close` is called.
+    """
+
+    def __init__(self) -> None:
+        self._batch: Optional[subprocess.Popen] = None
+
+    @staticmethod
+    def _start() -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    @staticmethod
+    def _request(process: subprocess.Popen, rev: str) -> Tuple[IO[bytes], list]:
+        if "\n" in rev:
+            raise ValueError(f"Invalid object name '{rev}'")
+        try:
+            with timing.span("git", f"cat-file {rev}"):
+                process.stdin.write(f"{rev}\n".encode("utf-8"))
+                process.stdin.flush()
+                header = process.stdout.readline().decode("utf-8").split()
+        except (BrokenPipeError, OSError) as err:
+            raise ValueError("git cat-file exited unexpectedly") from err
+
+        if len(header) != 3:
+            raise ValueError(f"Object '{rev}' not found in repository")
+        return process.stdout, header
+
+    def read(self, rev: str) -> Tuple[str, bytes]:
+        """
+        Reads an object (`--batch`).
+
+        Args:
+            rev (str): Any revision git understands, e.g. 'HEAD:README.md'.
+
+        Returns:
+            Tuple[str, bytes]: The object type and its raw contents.
+
+        Raises:
+            ValueError: If the object does not exist.
+        """
+        if self._batch is None:
+            self._batch = self._start()
+        stdout, (_, kind, size) = self._request(self._batch, rev)
+        content = stdout.read(int(size) + 1)[:-1]
+        return kind, content
+
+    def commit_message(self, rev: str = "HEAD") -> str:
+        """
+        Returns the message of a commit, as `git log --format=%B -n 1 <rev>`.
+
+        Args:
+            rev (str): The commit to read (default: 'HEAD').
+
+        Returns:
+            str: The commit message.
+
+        Raises:
+            ValueError: If `rev` does not name a commit.
+        """
+        kind, content = self.read(f"{rev}^{{commit}}")
+        if kind != "commit":
+            raise ValueError(f"'{rev}' is not a commit")
+        _, _, message = content.partition(b"\n\n")
+        return message.decode("utf-8", errors="replace").strip()
+
+    def close(self) -> None:
+        """
+        Stops the coprocess, if it was started.
+        """
+        if self._batch is not None:
+            self._batch.stdin.close()
+            self._batch.wait()
+            self._batch.stdout.close()
+        self._batch = None
+
+
+_cat_file: Optional[CatFile] = None
+
+
+def cat_file() -> CatFile:
+    """
+    Returns the CatFile shared for the lifetime of the command.
+
+    Returns:
+        CatFile: The shared coprocess helper, closed at interpreter exit.
+    """
+    global _cat_file
+    if _cat_file is None:
+        _cat_file = CatFile()
+        atexit.register(close_cat_file)
+    return _cat_file
+
+
+def close_cat_file() -> None:
+    """
+    Stops the shared CatFile, so the next command starts one in its own
+    repository (the daemon serves commands from many working directories).
+
+    Returns:
+        None
+    """
+    global _cat_file
+    if _cat_file is not None:
+        _cat_file.close()
+        _cat_file = None
+        atexit.unregister(close_cat_file)
+
+
 def title_and_description() -> list:
     """
     Extracts the title and description from the latest git commit message.
@@ -108,7 +242,7 @@ def title_and_description() -> list:
     Returns:
         list: A list containing the title and description of the commit message.
     """
-    commit_message = subprocess_run("git log --format=%B -n 1")
+    commit_message = cat_file().commit_message()
     tmp = commit_message.split("\n")
     return [tmp[0], "\n".join(tmp[2:])]
 
@@ -120,7 +254,9 @@ def from_branch() -> str:
     Returns:
         str: The name of the current branch.
     """
-    return subprocess_run("git rev-parse --abbrev-ref HEAD")
+    repository = git.find_repository()
+    branch = repository.current_branch() if repository is not None else None
+    return branch or subprocess_run("git rev-parse --abbrev-ref HEAD")
 
 
 def git_rebase(target_branch: str) -> None:
@@ -39,6 +39,8 @@ class CommonVars:
     repository_name: str = "Repository Name"
     project_cant_be_none: str = "project can't be none"
     timeout: float = 10.0
+    page_size: int = 100
+    concurrency: int = 8
 
 
 common_vars: CommonVars = CommonVars()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.daemon - talks to a `bb daemon` over a Unix domain socket
+
+Kept free of typer, rich and httpx: `bb` imports it before anything else to
+hand the command over to a running daemon. A request is one JSON line with
+the arguments, working directory and environment, sent along with the
+client's stdin, stdout and stderr file descriptors, so the daemon reads and
+writes the caller's terminal directly. The reply is one JSON line with the
+exit code. Commands that may prompt on a terminal, and the `shell` and
+`batch` loops, are never handed over: they run in the caller's process.
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import List, Optional, Tuple
+
+from bb.utils.cache import cache_path
+
+MAX_FDS = 3
+# run in the caller's process whatever their input
+LOCAL = {"daemon", "shell", "batch"}
+# the commands that never prompt, given the option listed with them
+UNATTENDED = {
+    ("auth", "status"): "",
+    ("auth", "test"): "",
+    ("index", "sync"): "",
+    ("pr", "copy"): "--id",
+    ("pr", "diff"): "--id",
+    ("pr", "list"): "",
+    ("pr", "search"): "",
+    ("pr", "view"): "--id",
+}
+
+
+def supported() -> bool:
+    """Whether this platform can pass file descriptors over Unix sockets."""
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds")
+
+
+def socket_path() -> str:
+    """
+    Returns the daemon socket path, under $XDG_RUNTIME_DIR when set and the
+    bb cache directory otherwise.
+
+    Returns:
+        str: The socket path.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    return os.path.join(
+        os.path.join(runtime, "bb") if runtime else cache_path(), "daemon.sock"
+    )
+
+
+def encode(message: dict) -> bytes:
+    """Encodes a message as one JSON line."""
+    return json.dumps(message).encode() + b"\n"
+
+
+def receive(conn: socket.socket, fds: int = 0) -> Tuple[Optional[dict], List[int]]:
+    """
+    Reads one message, and up to `fds` file descriptors sent with it.
+
+    Args:
+        conn (socket.socket): The connected socket.
+        fds (int): The number of file descriptors to accept.
+
+    Returns:
+        Tuple[Optional[dict], List[int]]: The message, None if the peer closed
+        the connection first, and the received file descriptors.
+    """
+    buffer, received = b"", []
+    while not buffer.endswith(b"\n"):
+        if fds and not received:
+            chunk, received, _, _ = socket.recv_fds(conn, 65536, fds)
+        else:
+            chunk = conn.recv(65536)
+        if not chunk:
+            return None, received
+        buffer += chunk
+    return json.loads(buffer), received
+
+
+def request(message: dict, fds: Optional[List[int]] = None) -> Optional[dict]:
+    """
+    Sends one message to the daemon and waits for its reply.
+
+    Args:
+        message (dict): The message.
+        fds (Optional[List[int]]): File descriptors to send along.
+
+    Raises:
+        OSError: If no daemon is listening.
+
+    Returns:
+        Optional[dict]: The reply, None if the daemon closed the connection
+        without one.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path())
+        socket.send_fds(conn, [encode(message)], fds or [])
+        return receive(conn)[0]
+
+
+def interactive(argv: List[str]) -> bool:
+    """
+    Whether a command must run in the caller's process: `shell`, `batch`
+    and `daemon`, and on a terminal every command that may prompt.
+
+    Args:
+        argv (List[str]): The command line arguments, without the program.
+
+    Returns:
+        bool: True if the command is not to be forwarded.
+    """
+    words, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == "--profile":
+            skip = True  # the one global option taking a value
+        elif not arg.startswith("-"):
+            words.append(arg)
+    if words[:1] and words[0] in LOCAL:
+        return True
+    if not words or "--help" in argv:
+        return False
+    try:
+        if not sys.stdin.isatty():
+            return False  # prompts read the caller's input, as they would here
+    except (AttributeError, ValueError):
+        return True
+    option = UNATTENDED.get(tuple(words[:2]))
+    if option is None:
+        return True
+    return bool(option) and not any(
+        arg == option or arg.startswith(option + "=") for arg in argv
+    )
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """
+    Runs a command in the daemon, if one is listening.
+
+    Args:
+        argv (List[str]): The command line arguments, without the program.
+
+    Returns:
+        Optional[int]: The exit code of the command, or None when it has to
+        run in this process: no daemon, an unsupported platform,
+        BB_NO_DAEMON set, or an interactive command.
+    """
+    if os.environ.get("BB_NO_DAEMON") or not supported() or interactive(argv):
+        return None
+    try:
+        reply = request(
+            {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)},
+            [sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno()],
+        )
+    except (AttributeError, OSError, ValueError):
+        return None
+    except KeyboardInterrupt:
+        return 130
+    if reply is None:
+        print("bb: the daemon exited before the command finished", file=sys.stderr)
+        return 1
+    return int(reply.get("exit", 1))
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.git - reads repository state straight from the .git directory
+
+Lets the common lookups (is this a repository, current branch, remotes, refs)
+skip spawning git. Every reader returns None when the layout is not one it
+understands, so callers can fall back to the git executable.
+"""
+
+import configparser
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+HEADS = "refs/heads/"
+
+
+@dataclass(frozen=True)
+class Repository:
+    """
+    Locations of a repository found on disk.
+
+    Attributes:
+        worktree (Path): The working tree root.
+        git_dir (Path): The per-worktree git directory (holds HEAD).
+        common_dir (Path): The shared git directory (holds config and refs).
+    """
+
+    worktree: Path
+    git_dir: Path
+    common_dir: Path
+
+    def _read(self, path: Path) -> Optional[str]:
+        try:
+            return path.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+
+    def head(self) -> Optional[str]:
+        """
+        Returns the raw contents of HEAD: a commit id when detached, otherwise
+        the ref it points to (e.g. 'refs/heads/main').
+
+        Returns:
+            Optional[str]: The HEAD target, or None if it cannot be read or
+            the repository stores refs in a format other than files.
+        """
+        head = self._read(self.git_dir / "HEAD")
+        if head is None:
+            return None
+        if head.startswith("ref:"):
+            ref = head[len("ref:") :].strip()
+            # reftable repositories keep a placeholder HEAD on disk
+            return None if ref == f"{HEADS}.invalid" else ref
+        return head
+
+    def current_branch(self) -> Optional[str]:
+        """
+        Returns the checked out branch name, or 'HEAD' when detached, matching
+        `git rev-parse --abbrev-ref HEAD`.
+
+        Returns:
+            Optional[str]: The branch name, or None if HEAD cannot be read.
+        """
+        head = self.head()
+        if head is None:
+            return None
+        return head[len(HEADS) :] if head.startswith(HEADS) else "HEAD"
+
+    def remotes(self) -> Optional[Dict[str, str]]:
+        """
+        Returns the fetch url of each remote configured in the repository.
+
+        Returns:
+            Optional[Dict[str, str]]: Remote names mapped to their url, or None
+            if the config uses includes or url rewriting that only git can
+            evaluate, or cannot be parsed.
+        """
+        config = configparser.ConfigParser(
+            strict=False, allow_no_value=True, interpolation=None
+        )
+        try:
+            config.read(self.common_dir / "config", encoding="utf-8")
+        except configparser.Error:
+            return None
+
+        remotes: Dict[str, str] = {}
+        for section in config.sections():
+            kind, _, name = section.partition(" ")
+            if kind.lower() in ("include", "includeif"):
+                return None
+            if kind.lower() == "url" and config.has_option(section, "insteadof"):
+                return None
+            if kind.lower() == "remote" and config.get(section, "url", fallback=None):
+                remotes[name.strip('"')] = config.get(section, "url")
+        return remotes
+
+
+def _git_dirs(dot_git: Path) -> Optional[tuple]:
+    if dot_git.is_dir():
+        return dot_git, dot_git
+
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+
+    git_dir = Path(content[len("gitdir:") :].strip())
+    if not git_dir.is_absolute():
+        git_dir = dot_git.parent / git_dir
+    common_dir = git_dir
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        common_dir = (
+            common_dir / common if not Path(common).is_absolute() else Path(common)
+        )
+    except OSError:
+        pass
+    return git_dir.resolve(), common_dir.resolve()
+
+
+def find_repository(path: Optional[str] = None) -> Optional[Repository]:
+    """
+    Locates the repository containing `path` by walking up to the nearest
+    `.git` directory or `gitdir:` file (worktrees and submodules).
+
+    Args:
+        path (Optional[str]): Where to start looking (default: current directory).
+
+    Returns:
+        Optional[Repository]: The repository, or None if none is found or git
+        is steered by environment variables this reader does not emulate.
+    """
+    if "GIT_DIR" in os.environ or "GIT_WORK_TREE" in os.environ:
+        return None
+
+    start = Path(path or os.getcwd()).resolve()
+    for directory in (start, *start.parents):
+        if directory.name == ".git":
+            # inside the git directory itself, not a working tree
+            return None
+        dot_git = directory / ".git"
+        if not dot_git.exists():
+            continue
+        dirs = _git_dirs(dot_git)
+        if dirs is None or not (dirs[0] / "HEAD").is_file():
+            return None
+        return Repository(directory, *dirs)
+    return None
@@ -28,8 +28,7 @@ from typing import Any, Callable, ParamSpec, TypeVar
 
 from typer import Exit, prompt
 
-from bb.utils import constants, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils import constants
 
 P = ParamSpec("P")
 T = TypeVar("T")
@@ -46,10 +45,15 @@ def validate_config() -> None:
         ValueError: If an error occurs during the validation process.
 
     """
+    from bb.utils import request, richprint
+    from bb.utils.api import get_bitbucket_api
+
     try:
-        message = f"Validating connection with '{bitbucket_api.bitbucket_host}' ... "
+        message = (
+            f"Validating connection with '{get_bitbucket_api().bitbucket_host}' ... "
+        )
         with richprint.live_progress(message) as live:
-            response = request.get(bitbucket_api.test())
+            response = request.get(get_bitbucket_api().test())
             if response[0] == 200:
                 live.update("OK")
                 richprint.console.print("OK", style="bold green")
@@ -57,6 +61,29 @@ def validate_config() -> None:
         raise ValueError(err) from err
 
 
+def current_user() -> str:
+    """
+    Returns the slug of the user the configured token authenticates as.
+
+    The identity is cached per host and token fingerprint, so whoami is only
+    called once per set of credentials.
+
+    Returns:
+        str: The user slug.
+    """
+    from bb.utils import cache, request
+    from bb.utils.api import get_bitbucket_api
+    from bb.utils.ini import parse
+
+    _, token, bitbucket_host = parse()
+    user = cache.get_identity(bitbucket_host, token)
+    if user is None:
+        user = request.get(get_bitbucket_api().whoami())[1]
+        if user:
+            cache.set_identity(bitbucket_host, token, user)
+    return user
+
+
 def validate_input(
     _input: Any, expected: str, error: str, default: str = "", optional: bool = False
 ) -> str:
@@ -105,7 +132,9 @@ def error_tip() -> None:
     Returns:
         None
     """
-    richprint.console.print(
+    from bb.utils import richprint
+
+    richprint.diagnostic_console().print(
         "\n💻 Try running 'bb --verbose [OPTIONS] COMMAND [ARGS]' to debug",
         style="dim white",
     )
@@ -128,22 +157,27 @@ def error_handler(func: Callable[P, T]) -> Callable[P, T]:
 
     @wraps(func)
     def wrapper(*args, **kwargs):
+        from bb.utils import richprint
+
         try:
             result = func(*args, **kwargs)
             return result
         except (ValueError, Exit) as err:
-            richprint.console.print(f"{err}", style="bold red")
+            richprint.diagnostic_console().print(f"{err}", style="bold red")
             if constants.common_vars.state["verbose"]:
                 richprint.traceback_to_console()
             else:
                 error_tip()
             raise Exit(code=1)
         except Exception as err:
-            richprint.console.print(f"{err}", style="bold red")
+            richprint.diagnostic_console().print(f"{err}", style="bold red")
             if constants.common_vars.state["verbose"]:
                 richprint.traceback_to_console()
             else:
                 error_tip()
             raise Exit(code=1)
+        finally:
+            # set by a RecordWriter for the duration of the command
+            richprint.diagnostics_to_stderr(False)
 
     return wrapper
@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.index - a local SQLite index of pull requests
+
+Pull requests are stored with their participants and the raw API payload, so
+commands can answer queries from disk and render them exactly as they would
+from a live response. Titles, descriptions, authors and branches are also
+kept in an FTS5 table for `bb pr search`, each row under the rowid of its
+pull request, so rows are found and replaced without scanning it. The index lives next to the other
+caches and is kept up to date by `bb index sync`.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Iterable, List, Optional
+
+from bb.utils import cache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pull_requests (
+    host TEXT NOT NULL,
+    project TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    from_branch TEXT NOT NULL,
+    to_branch TEXT NOT NULL,
+    author TEXT NOT NULL,
+    updated INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (host, project, repository, id)
+);
+CREATE INDEX IF NOT EXISTS pull_requests_updated ON pull_requests (host, updated);
+CREATE TABLE IF NOT EXISTS participants (
+    host TEXT NOT NULL,
+    project TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    pr_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    role TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (host, project, repository, pr_id, name, role)
+);
+CREATE INDEX IF NOT EXISTS participants_user ON participants (host, name, role);
+CREATE VIRTUAL TABLE IF NOT EXISTS pull_requests_fts USING fts5 (
+    title,
+    description,
+    author,
+    branches,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    host TEXT NOT NULL,
+    project TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    last_updated INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (host, project, repository)
+);
+"""
+
+
+def index_path() -> str:
+    """
+    Returns the path of the index database inside the bb cache directory.
+
+    Returns:
+        str: The path to index.db.
+    """
+    return os.path.join(cache.BB_CACHE_DIR, "index.db")
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Opens the index, creating the database and schema on first use.
+
+    Args:
+        path (Optional[str]): The database path (default: `index_path()`).
+
+    Returns:
+        sqlite3.Connection: The connection, usable as a transaction context
+        manager.
+    """
+    path = path or index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0)
+    conn.row_factory = sqlite3.Row
+    # readers (dashboards polling `pr list --offline`) never block a sync
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _search_row(rowid: int, _pr: dict) -> tuple:
+    user = _pr["author"]["user"]
+    return (
+        rowid,
+        _pr.get("title", ""),
+        _pr.get("description", ""),
+        " ".join(
+            filter(None, (user.get(k) for k in ("displayName", "name", "emailAddress")))
+        ),
+        f"{_pr['fromRef']['displayId']} {_pr['toRef']['displayId']}",
+    )
+
+
+def _key(host: str) -> str:
+    return host.rstrip("/").lower()
+
+
+def upsert(conn: sqlite3.Connection, host: str, pull_requests: Iterable[dict]) -> int:
+    """
+    Inserts or replaces pull requests and their participants.
+
+    Args:
+        conn (sqlite3.Connection): The index connection.
+        host (str): The Bitbucket host the pull requests belong to.
+        pull_requests (Iterable[dict]): Pull requests as returned by the API.
+
+    Returns:
+        int: The number of pull requests written.
+    """
+    host = _key(host)
+    count = 0
+    for _pr in pull_requests:
+        repository = _pr["toRef"]["repository"]
+        key = (host, repository["project"]["key"], repository["slug"], _pr["id"])
+        conn.execute(
+            "DELETE FROM pull_requests_fts WHERE rowid = (SELECT rowid FROM pull_requests"
+            " WHERE host = ? AND project = ? AND repository = ? AND id = ?)",
+            key,
+        )
+        rowid = conn.execute(
+            "INSERT OR REPLACE INTO pull_requests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                *key,
+                _pr["state"],
+                _pr.get("title", ""),
+                _pr.get("description", ""),
+                _pr["fromRef"]["displayId"],
+                _pr["toRef"]["displayId"],
+                _pr["author"]["user"].get("name", ""),
+                _pr.get("updatedDate", 0),
+                json.dumps(_pr),
+            ),
+        ).lastrowid
+        conn.execute(
+            "DELETE FROM participants WHERE host = ? AND project = ? AND repository = ? AND pr_id = ?",
+            key,
+        )
+        conn.execute(
+            "INSERT INTO pull_requests_fts (rowid, title, description, author, branches)"
+            " VALUES (?, ?, ?, ?, ?)",
+            _search_row(rowid, _pr),
+        )
+        people = [
+            _pr["author"],
+            *_pr.get("reviewers", []),
+            *_pr.get("participants", []),
+        ]
+        conn.executemany(
+            "INSERT OR REPLACE INTO participants VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    *key,
+                    person["user"].get("name", ""),
+                    person["user"].get("slug", ""),
+                    person.get("role", "AUTHOR"),
+                    person.get("status", "UNAPPROVED"),
+                )
+                for person in people
+            ],
+        )
+        count += 1
+    return count
+
+
+def _indexed(
+    conn: sqlite3.Connection, host: str, project: str, repository: str
+) -> List[tuple]:
+    """The keys of the indexed pull requests of a repository, as stored."""
+    return [
+        tuple(row)
+        for row in conn.execute(
+            "SELECT host, project, repository, id FROM pull_requests WHERE host = ?"
+            " AND project = ? COLLATE NOCASE AND repository = ? COLLATE NOCASE",
+            (_key(host), project, repository),
+        )
+    ]
+
+
+def _delete(conn: sqlite3.Connection, keys: List[tuple]) -> int:
+    """Deletes pull requests with their participants and search rows."""
+    conn.executemany(
+        "DELETE FROM pull_requests_fts WHERE rowid = (SELECT rowid FROM pull_requests"
+        " WHERE host = ? AND project = ? AND repository = ? AND id = ?)",
+        keys,
+    )
+    conn.executemany(
+        "DELETE FROM pull_requests WHERE host = ? AND project = ? AND repository = ? AND id = ?",
+        keys,
+    )
+    conn.executemany(
+        "DELETE FROM participants WHERE host = ? AND project = ? AND repository = ? AND pr_id = ?",
+        keys,
+    )
+    return len(keys)
+
+
+def remove(
+    conn: sqlite3.Connection,
+    host: str,
+    project: str,
+    repository: str,
+    ids: Iterable[int],
+) -> int:
+    """
+    Removes pull requests of a repository from the index.
+
+    Args:
+        conn (sqlite3.Connection): The index connection.
+        host (str): The Bitbucket host.
+        project (str): The project key.
+        repository (str): The repository slug.
+        ids (Iterable[int]): The ids of the pull requests to remove.
+
+    Returns:
+        int: The number of pull requests removed.
+    """
+    ids = {int(_id) for _id in ids}
+    return _delete(
+        conn,
+        [key for key in _indexed(conn, host, project, repository) if key[3] in ids],
+    )
+
+
+def prune(
+    conn: sqlite3.Connection,
+    host: str,
+    project: str,
+    repository: str,
+    seen: Iterable[int],
+) -> int:
+    """
+    Removes the pull requests of a repository that a full walk of the server
+    did not return, i.e. pull requests deleted since they were indexed.
+
+    Args:
+        conn (sqlite3.Connection): The index connection.
+        host (str): The Bitbucket host.
+        project (str): The project key.
+        repository (str): The repository slug.
+        seen (Iterable[int]): The ids of every pull request on the server.
+
+    Returns:
+        int: The number of pull requests removed.
+    """
+    seen = set(seen)
+    return _delete(
+        conn,
+        [
+            key
+            for key in _indexed(conn, host, project, repository)
+            if key[3] not in seen
+        ],
+    )
+
+
+def watermark(
+    conn: sqlite3.Connection, host: str, project: str, repository: str
+) -> Optional[sqlite3.Row]:
+    """
+    Returns the sync state of a repository.
+
+    Args:
+        conn (sqlite3.Connection): The index connection.
+        host (str): The Bitbucket host.
+        project (str): The project key.
+        repository (str): The repository slug.
+
+    Returns:
+        Optional[sqlite3.Row]: A row with `last_updated` (the newest
+        updatedDate indexed) and `synced_at`, or None if never synced.
+    """
+    return conn.execute(
+        "SELECT last_updated, synced_at FROM sync_state WHERE host = ? AND project = ? AND repository = ?",
+        (_key(host), project.lower(), repository.lower()),
+    ).fetchone()
+
+
+def set_watermark(
+    conn: sqlite3.Connection,
+    host: str,
+    project: str,
+    repository: str,
+    last_updated: int,
+) -> None:
+    """
+    Records that a repository was synced up to `last_updated`.
+
+    Args:
+        conn (sqlite3.Connection): The index connection.
+        host (str): The Bitbucket host.
+        project (str): The project key.
+        repository (str): The repository slug.
+        last_updated (int): The newest updatedDate now in the index.
+
+    Returns:
+        None
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+        (_key(host), project.lower(), repository.lower(), last_updated, time.time()),
+    )
+
+
+def query(
+    conn: sqlite3.Connection,
+    host: str,
+    project: Optional[str] = None,
+    repository: Optional[str] = None,
+    user: Optional[str] = None,
+    role: Optional[str] = None,
+    state: str = "OPEN",
+) -> List[dict]:
+    """
+    Returns indexed pull requests, most recently updated first.
+
+    Args:
+        conn (sqlite3.Connection): The index connection.
+        host (str): The Bitbucket host.
+        project (Optional[str]): Only pull requests in this project.
+        repository (Optional[str]): Only pull requests in this repository.
+        user (Optional[str]): Only pull requests this user (name or slug)
+            takes part in, with `role` if given.
+        role (Optional[str]): The participant role, e.g. 'AUTHOR' or 'REVIEWER'.
+        state (str): The pull request state (default: 'OPEN').
+
+    Returns:
+        List[dict]: The pull requests, as returned by the API.
+    """
+    sql = "SELECT data FROM pull_requests pr WHERE host = ? AND state = ?"
+    args: list = [_key(host), state]
+    if project is not None:
+        sql += " AND project = ? COLLATE NOCASE"
+        args.append(project)
+    if repository is not None:
+        sql += " AND repository = ? COLLATE NOCASE"
+        args.append(repository)
+    if user is not None:
+        sql += (
+            " AND EXISTS (SELECT 1 FROM participants p WHERE p.host = pr.host"
+            " AND p.project = pr.project AND p.repository = pr.repository"
+            " AND p.pr_id = pr.id AND (p.name = ? OR p.slug = ?)"
+        )
+        args.extend([user, user])
+        if role is not None:
+            sql += " AND p.role = ?"
+            args.append(role)
+        sql += ")"
+    sql += " ORDER BY updated DESC"
+    return [json.loads(row["data"]) for row in conn.execute(sql, args)]
+
+
+def match_expression(text: str) -> str:
+    """
+    Turns free text into an FTS5 query matching every word as a prefix, so
+    user input never has to follow the FTS5 query syntax.
+
+    Args:
+        text (str): The search text.
+
+    Returns:
+        str: The FTS5 MATCH expression.
+    """
+    words = text.split()
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+def search(
+    conn: sqlite3.Connection,
+    host: str,
+    text: str,
+    project: Optional[str] = None,
+    repository: Optional[str] = None,
+    state: Optional[str] = None,
+    limit: int = 20,
+) -> List[dict]:
+    """
+    Full-text searches indexed pull requests, best matches first.
+
+    Args:
+        conn (sqlite3.Connection): The index connection.
+        host (str): The Bitbucket host.
+        text (str): Words to find in the title, description, author or branches.
+        project (Optional[str]): Only pull requests in this project.
+        repository (Optional[str]): Only pull requests in this repository.
+        state (Optional[str]): Only pull requests in this state.
+        limit (int): The maximum number of results.
+
+    Returns:
+        List[dict]: The matching pull requests, as returned by the API.
+    """
+    expression = match_expression(text)
+    if not expression:
+        return []
+
+    sql = (
+        "SELECT pr.data FROM pull_requests_fts f JOIN pull_requests pr"
+        " ON pr.rowid = f.rowid WHERE pull_requests_fts MATCH ? AND pr.host = ?"
+    )
+    args: list = [expression, _key(host)]
+    if project is not None:
+        sql += " AND pr.project = ? COLLATE NOCASE"
+        args.append(project)
+    if repository is not None:
+        sql += " AND pr.repository = ? COLLATE NOCASE"
+        args.append(repository)
+    if state is not None:
+        sql += " AND pr.state = ?"
+        args.append(state)
+    sql += (
+        " ORDER BY bm25(pull_requests_fts, 4.0, 1.0, 2.0, 2.0), pr.updated DESC LIMIT ?"
+    )
+    args.append(limit)
+    return [json.loads(row["data"]) for row in conn.execute(sql, args)]
@@ -27,7 +27,11 @@ prompts for setup if not present
 import configparser
 import os
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Tuple, TypeVar
+
+from bb.utils import timing
+
+T = TypeVar("T", str, bool, int, float)
 
 
 def config_path() -> Tuple[str, str]:
@@ -68,8 +72,6 @@ def auth_setup(bitbucket_host: str, username: str, token: str) -> None:
     Returns:
         None
     """
-    global _config_cache
-
     Path(XDG_CONFIG_HOME).mkdir(parents=True, exist_ok=True)
     Path(BB_CONFIG_FILE).touch(exist_ok=True)
 
@@ -89,7 +91,11 @@ token=xxxxxxxxxxx"""
     ini.set("auth", "token", token)
     ini.write(w_alt.open("w", encoding="utf-8"))
 
-    _config_cache = None
+    clear_cache()
+
+    from bb.utils import cache
+
+    cache.clear_identities()
 
 
 _config_cache: List[str] | None = None
@@ -119,7 +125,8 @@ def parse() -> List[str]:
         raise ValueError("Configuration required, Try running 'bb auth setup'")
 
     ini = configparser.ConfigParser()
-    ini.read(BB_CONFIG_FILE)
+    with timing.span("config", BB_CONFIG_FILE):
+        ini.read(BB_CONFIG_FILE)
     token = ini.get("auth", "token")
     username = ini.get("auth", "username")
     bitbucket_host = ini.get("auth", "bitbucket_host")
@@ -129,6 +136,52 @@ def parse() -> List[str]:
 
 
 def clear_cache() -> None:
-    """Clear the cached config to force re-read from file."""
+    """
+    Clear the cached config, and the BitbucketAPI built from it, to force
+    re-read from file once the configuration is rewritten.
+    """
     global _config_cache
     _config_cache = None
+
+    from bb.utils.api import get_bitbucket_api
+
+    get_bitbucket_api.cache_clear()
+
+
+_ini_cache: configparser.ConfigParser | None = None
+_ini_mtime: float | None = None
+
+
+def get_setting(section: str, option: str, fallback: T) -> T:
+    """
+    Reads an optional setting from the configuration file, e.g. `[cache] enabled`.
+    The value is converted to the type of the fallback.
+
+    Args:
+        section (str): The section of the configuration file.
+        option (str): The option within the section.
+        fallback (T): The value returned when the setting (or the file) is missing.
+
+    Returns:
+        T: The value of the setting.
+
+    Raises:
+        ValueError: If the setting cannot be converted to the type of the fallback.
+    """
+    global _ini_cache, _ini_mtime
+
+    current_mtime = (
+        os.path.getmtime(BB_CONFIG_FILE) if os.path.isfile(BB_CONFIG_FILE) else None
+    )
+    if _ini_cache is None or _ini_mtime != current_mtime:
+        _ini_cache = configparser.ConfigParser()
+        _ini_cache.read(BB_CONFIG_FILE)
+        _ini_mtime = current_mtime
+
+    if isinstance(fallback, bool):
+        return _ini_cache.getboolean(section, option, fallback=fallback)
+    if isinstance(fallback, int):
+        return _ini_cache.getint(section, option, fallback=fallback)
+    if isinstance(fallback, float):
+        return _ini_cache.getfloat(section, option, fallback=fallback)
+    return _ini_cache.get(section, option, fallback=fallback)
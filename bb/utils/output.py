@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.output - machine-readable output for scripts
+
+Records are written to stdout as they are produced, without going through
+rich, so large listings can be piped into tools like jq with constant memory.
+"""
+
+import csv
+import json
+import sys
+from enum import Enum
+from types import TracebackType
+from typing import IO, Any, List, Optional, Type
+
+from bb.utils.api import Participant, PullRequest
+
+
+class Output(str, Enum):
+    RICH = "rich"
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class RecordWriter:
+    """
+    Streams flat dict records as a JSON array, NDJSON or CSV.
+
+    Used as a context manager; the JSON array is opened on the first record
+    and closed on a successful exit, so an empty result is still valid JSON
+    ('[]') while a failed command never looks like one. Errors and warnings
+    go to stderr from the moment the writer is created.
+    """
+
+    def __init__(self, output: Output, stream: Optional[IO[str]] = None) -> None:
+        self.output = Output(output)
+        self.stream = stream or sys.stdout
+        self.count = 0
+        self._csv: Optional[csv.DictWriter] = None
+        from bb.utils import richprint
+
+        richprint.diagnostics_to_stderr(True)
+
+    def write(self, record: dict) -> None:
+        """
+        Writes one record.
+
+        Args:
+            record (dict): The record; for CSV the keys of the first record
+                become the header and nested values are JSON encoded.
+
+        Returns:
+            None
+        """
+        if self.output == Output.JSON:
+            self.stream.write("[\n" if self.count == 0 else ",\n")
+            self.stream.write(json.dumps(record))
+        elif self.output == Output.NDJSON:
+            self.stream.write(json.dumps(record) + "\n")
+        elif self.output == Output.CSV:
+            if self._csv is None:
+                self._csv = csv.DictWriter(
+                    self.stream, fieldnames=list(record), extrasaction="ignore"
+                )
+                self._csv.writeheader()
+            self._csv.writerow(
+                {
+                    key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                    for key, value in record.items()
+                }
+            )
+        else:
+            raise ValueError(f"'{self.output.value}' is not a record output")
+        self.count += 1
+        self.stream.flush()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is not None:
+            # the error handler reports on stderr, then restores the console
+            return
+        from bb.utils import richprint
+
+        richprint.diagnostics_to_stderr(False)
+        if self.output == Output.JSON:
+            self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+            self.stream.flush()
+
+
+def writer(output: Output) -> Optional[RecordWriter]:
+    """
+    Returns a RecordWriter for machine-readable outputs, None for rich.
+
+    Args:
+        output (Output): The selected output.
+
+    Returns:
+        Optional[RecordWriter]: The writer, or None to render with rich.
+    """
+    return None if Output(output) == Output.RICH else RecordWriter(output)
+
+
+def _user(participant: Participant) -> dict:
+    return {
+        "name": participant.name,
+        "display_name": participant.display_name,
+        "email": participant.email,
+    }
+
+
+def pull_request_record(_pr: PullRequest) -> dict:
+    """
+    Flattens a pull request into an output record.
+
+    Args:
+        _pr (PullRequest): The pull request.
+
+    Returns:
+        dict: The record.
+    """
+    reviewers: List[Any] = [
+        {**_user(reviewer), "status": reviewer.status} for reviewer in _pr.reviewers
+    ]
+    return {
+        "id": _pr.id,
+        "project": _pr.to_ref.repository.project,
+        "repository": _pr.to_ref.repository.slug,
+        "state": _pr.state,
+        "title": _pr.title,
+        "description": _pr.description,
+        "from_branch": _pr.from_ref.display_id,
+        "to_branch": _pr.to_ref.display_id,
+        "author": _user(_pr.author),
+        "reviewers": reviewers,
+        "merge_outcome": _pr.merge_outcome,
+        "version": _pr.version,
+        "created": _pr.created,
+        "updated": _pr.updated,
+        "url": _pr.url,
+    }
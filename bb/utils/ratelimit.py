@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.ratelimit - client side rate limiting for http requests
+
+Every request made through bb.utils.request takes a token from a shared
+token bucket and a slot from a max-in-flight semaphore, so fanned out
+commands stay within Bitbucket's per-user limits instead of bursting into
+429s. Configured through the `[ratelimit]` section of the config file.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+POLL_INTERVAL = 0.005  # seconds between tries for a slot held by another thread
+
+
+class TokenBucket:
+    """
+    A token bucket refilled at `rate` tokens per second, holding at most
+    `burst` tokens. Callers reserve a token and wait until it is due, so
+    concurrent callers are spaced out in arrival order. A rate of 0 disables it.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket.
+
+        Returns:
+            float: The seconds to wait before the token may be used.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Blocks until a token is available."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def async_acquire(self) -> None:
+        """Waits until a token is available without blocking the event loop."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class Governor:
+    """
+    Combines the token bucket with a cap on the number of requests in flight.
+    The cap holds across threads and their event loops: every slot, sync or
+    async, is taken from one thread semaphore.
+    """
+
+    def __init__(self, rate: float, burst: int, max_in_flight: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_in_flight = max(1, max_in_flight)
+        self._semaphore = threading.BoundedSemaphore(self.max_in_flight)
+        self._async_semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """Returns the semaphore of the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if loop not in self._async_semaphores:
+                self._async_semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+            return self._async_semaphores[loop]
+
+    async def _async_acquire(self) -> None:
+        """
+        Takes a slot from the thread semaphore without blocking the event
+        loop. Polling rather than waiting in a worker thread, so a cancelled
+        request never takes a slot it cannot give back.
+        """
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(POLL_INTERVAL)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Holds an in-flight slot, after waiting for a token, for one request."""
+        with self._semaphore:
+            self.bucket.acquire()
+            yield
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """
+        Async counterpart of `slot`. The loop's own semaphore queues its
+        requests in order, only those at its head compete for a shared slot.
+        """
+        async with self._async_semaphore():
+            await self._async_acquire()
+            try:
+                await self.bucket.async_acquire()
+                yield
+            finally:
+                self._semaphore.release()
+
+
+_governor: Governor | None = None
+_governor_lock = threading.Lock()
+
+
+def governor() -> Governor:
+    """
+    Get or create the governor shared by all requests of this process, built
+    from the `[ratelimit]` section of the config file.
+
+    Returns:
+        Governor: The shared governor.
+    """
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            from bb.utils.constants import common_vars
+            from bb.utils.ini import get_setting
+
+            _governor = Governor(
+                get_setting("ratelimit", "rate", 0.0),
+                get_setting("ratelimit", "burst", 10),
+                get_setting("ratelimit", "max_in_flight", common_vars.concurrency),
+            )
+    return _governor
@@ -22,28 +22,122 @@
 bb.utils.request - makes http requests
 
 Defines functions for making HTTP requests (GET, POST, PUT, DELETE) with
-error handling and status code interpretation.
+error handling and status code interpretation. Every verb has an async
+counterpart backed by a shared `httpx.AsyncClient`, and `run`/`gather`
+dispatch many of them concurrently under a concurrency cap. GET responses
+go through the opt-in on-disk cache of bb.utils.cache, and transient
+failures of idempotent requests are retried as per bb.utils.retry. Every
+attempt is paced by the shared limiter of bb.utils.ratelimit. Response
+bodies are decoded with orjson or msgspec when installed, the standard
+library otherwise.
 """
 
+import asyncio
+import json
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from http import HTTPStatus
-from json import JSONDecodeError
+from typing import Any
 
 import httpx
 
+from bb.utils import ratelimit, retry, timing, trace
+from bb.utils.cache import CachedResponse, ResponseCache, response_cache
 from bb.utils.constants import common_vars
 
+DECODERS = ("orjson", "msgspec", "json")
+
 _client: httpx.Client | None = None
+_client_lock = threading.Lock()
+# the async client is bound to its event loop, so each thread running
+# `run` (e.g. `bb batch --parallel`) gets its own
+_async_local = threading.local()
+
+
+def _load_decoder(
+    names: tuple[str, ...] = DECODERS,
+) -> tuple[str, Callable[[bytes], Any], tuple[type[Exception], ...]]:
+    """
+    Picks the first importable JSON decoder of `names`.
+
+    Args:
+        names (tuple[str, ...]): Backends in order of preference, any of
+            'orjson', 'msgspec' and 'json'.
+
+    Returns:
+        tuple: The backend name, its decode function taking bytes, and the
+        exceptions it raises on invalid JSON.
+    """
+    for name in names:
+        if name == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                continue
+            return name, orjson.loads, (orjson.JSONDecodeError,)
+        if name == "msgspec":
+            try:
+                import msgspec
+            except ImportError:
+                continue
+            return name, msgspec.json.decode, (msgspec.DecodeError,)
+        if name == "json":
+            return name, json.loads, (json.JSONDecodeError, UnicodeDecodeError)
+    raise ValueError(f"No JSON decoder available among: {', '.join(names)}")
+
+
+decoder, _decode, _decode_errors = _load_decoder()
+
+
+def decode(content: bytes) -> Any:
+    """
+    Decodes a JSON response body with the fastest available backend.
+
+    Args:
+        content (bytes): The raw response body.
+
+    Raises:
+        ValueError: If the body is not valid JSON.
+
+    Returns:
+        Any: The decoded body.
+    """
+    try:
+        with timing.span("decode", decoder, f"{len(content)} bytes"):
+            return _decode(content)
+    except _decode_errors as err:
+        raise ValueError(f"Invalid JSON response: {err}") from err
 
 
 def _get_client() -> httpx.Client:
     """Get or create a reusable HTTP client with connection pooling."""
     global _client
-    if _client is None:
-        _client = httpx.Client(
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                timeout=common_vars.timeout,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            )
+    return _client
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Get or create the async HTTP client for the running event loop."""
+    if getattr(_async_local, "client", None) is None:
+        _async_local.client = httpx.AsyncClient(
             timeout=common_vars.timeout,
             limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
         )
-    return _client
+    return _async_local.client
+
+
+async def _close_async_client() -> None:
+    """Close the async HTTP client, it is bound to the event loop that created it."""
+    client = getattr(_async_local, "client", None)
+    if client is not None:
+        _async_local.client = None
+        await client.aclose()
 
 
 def _get_auth() -> tuple[str, str] | None:
@@ -73,56 +167,298 @@ def http_response_definitions(status_code: int) -> str:
         return "Unknown Status Code"
 
 
-def get(url: str) -> list:
-    """
-    Sends a GET request to the specified URL and returns the response status code and data.
+def _record(
+    method: str,
+    url: str,
+    response: httpx.Response | None,
+    begin: float,
+    attempts: int,
+    cache: str | None = None,
+    error: BaseException | None = None,
+) -> None:
+    """Record a request for `bb --timings` and the BB_TRACE file."""
+    if not (timing.enabled() or trace.path()):
+        return
+    seconds = time.perf_counter() - begin
+    status = response.status_code if response is not None else None
+    size = len(response.content) if response is not None else 0
+    if cache == "stale":
+        cache = "revalidated" if status == 304 else "changed"
+    timing.record(
+        "http",
+        f"{method} {url}",
+        seconds,
+        f"{status}, {size} bytes" if error is None else type(error).__name__,
+    )
+    trace.record(
+        method,
+        url,
+        status,
+        seconds,
+        size,
+        attempts,
+        cache,
+        type(error).__name__ if error is not None else None,
+    )
 
-    Args:
-        url (str): The URL to send the GET request to.
 
-    Returns:
-        list[int, dict]: A list containing the response status code and data. The status code is an integer and the data is a dictionary.
+def _cache_state(
+    cache: ResponseCache | None, cached: CachedResponse | None
+) -> str | None:
+    """How a GET relates to the response cache: None when the cache is off."""
+    if cache is None:
+        return None
+    return "miss" if cached is None else "stale"
+
+
+def _send(
+    method: str,
+    url: str,
+    send: Callable[[], httpx.Response],
+    cache: str | None = None,
+) -> httpx.Response:
+    """Send a request through the shared rate limiter, retrying transient failures."""
+    limiter = ratelimit.governor()
+    attempts = 0
+
+    def attempt() -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        with limiter.slot():
+            return send()
+
+    begin = time.perf_counter()
+    try:
+        response = retry.send(method, attempt)
+    except Exception as err:
+        _record(method, url, None, begin, attempts, cache, err)
+        raise
+    _record(method, url, response, begin, attempts, cache)
+    return response
+
+
+async def _async_send(
+    method: str,
+    url: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+    cache: str | None = None,
+) -> httpx.Response:
+    """Async counterpart of `_send`."""
+    limiter = ratelimit.governor()
+    attempts = 0
+
+    async def attempt() -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        async with limiter.async_slot():
+            return await send()
+
+    begin = time.perf_counter()
+    try:
+        response = await retry.async_send(method, attempt)
+    except Exception as err:
+        _record(method, url, None, begin, attempts, cache, err)
+        raise
+    _record(method, url, response, begin, attempts, cache)
+    return response
 
-    Raises:
-        ValueError: If the request returns a non-200 status code.
+
+class StatusError(ValueError):
+    """
+    Raised for an unexpected status code. It is a ValueError, so it is
+    reported like any other error, and keeps the code for callers that
+    handle one status differently.
     """
-    from bb.utils.richprint import str_print
 
-    auth = _get_auth()
-    client = _get_client()
-    request = client.get(url, auth=auth) if auth else client.get(url)
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"\n[{status_code}] {http_response_definitions(status_code)}")
+        self.status_code = status_code
+
+
+def _get_result(request: httpx.Response) -> list:
+    """Map a GET response to `[status_code, data]`, raising on non-200 codes."""
+    from bb.utils.richprint import diagnostic_print
 
     if request.status_code != 200:
         if request.status_code == 400:
-            error_message = request.json().get("errors", [{}])[0].get("message", "")
+            error_message = (
+                decode(request.content).get("errors", [{}])[0].get("message", "")
+            )
             if "invalid" in error_message.lower():
-                str_print(
+                diagnostic_print(
                     f"Invalid input: {error_message}",
                     common_vars.dim_white,
                 )
             else:
-                str_print(
+                diagnostic_print(
                     f"Error: {error_message}",
                     common_vars.dim_white,
                 )
         else:
-            str_print(
+            diagnostic_print(
                 f"Unexpected error occurred. Status code: {request.status_code}, Message: {http_response_definitions(request.status_code)}",
                 common_vars.dim_white,
             )
 
-        raise ValueError(
-            f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
-        )
+        raise StatusError(request.status_code)
 
     try:
-        response_data: dict | str = request.json()
-    except JSONDecodeError:
+        response_data: dict | str = decode(request.content)
+    except ValueError:
         response_data: dict | str = request.content.decode()
 
     return [request.status_code, response_data]
 
 
+def _cache_lookup(
+    url: str, auth: tuple[str, str] | None
+) -> tuple[ResponseCache | None, CachedResponse | None]:
+    """Look up the cached response for a GET, when the response cache is enabled."""
+    cache = response_cache()
+    if cache is None:
+        return None, None
+    return cache, cache.lookup(auth[0] if auth else "", url)
+
+
+def _cache_update(
+    cache: ResponseCache | None,
+    cached: CachedResponse | None,
+    auth: tuple[str, str] | None,
+    url: str,
+    request: httpx.Response,
+) -> httpx.Response:
+    """Store a fresh GET response, or serve the cached body on `304 Not Modified`."""
+    if cache is None:
+        return request
+
+    user = auth[0] if auth else ""
+    if request.status_code == 304 and cached is not None:
+        cache.refresh(user, cached)
+        return httpx.Response(200, content=cached.content)
+    if request.status_code == 200:
+        cache.save(
+            user,
+            url,
+            request.content,
+            request.headers.get("ETag"),
+            request.headers.get("Last-Modified"),
+        )
+    return request
+
+
+def _post_result(request: httpx.Response) -> list:
+    """Map a POST response to `[status_code, data]`, raising on unexpected codes."""
+    if request.status_code not in (200, 201, 204, 409):
+        raise StatusError(request.status_code)
+
+    json_data: dict = {} if request.status_code == 204 else decode(request.content)
+    return [request.status_code, json_data]
+
+
+def _put_result(request: httpx.Response) -> list:
+    """Map a PUT response to `[status_code, data]`, raising on unexpected codes."""
+    if request.status_code not in (200, 403, 409):
+        raise StatusError(request.status_code)
+
+    return [request.status_code, decode(request.content)]
+
+
+def _delete_result(request: httpx.Response) -> int:
+    """Map a DELETE response to its status code, raising on unexpected codes."""
+    if request.status_code not in (202, 204):
+        raise StatusError(request.status_code)
+    return request.status_code
+
+
+def get(url: str, fresh: bool = False) -> list:
+    """
+    Sends a GET request to the specified URL and returns the response status code and data.
+
+    Args:
+        url (str): The URL to send the GET request to.
+        fresh (bool): Revalidate a cached response with the server even
+            within the TTL, for reads that must see the latest state.
+
+    Returns:
+        list[int, dict]: A list containing the response status code and data. The status code is an integer and the data is a dictionary.
+
+    Raises:
+        ValueError: If the request returns a non-200 status code.
+    """
+    auth = _get_auth()
+    cache, cached = _cache_lookup(url, auth)
+    if not fresh and cached is not None and cache.is_fresh(cached):
+        cache.touch(cached)
+        response = httpx.Response(200, content=cached.content)
+        _record("GET", url, response, time.perf_counter(), 0, "hit")
+        return _get_result(response)
+
+    headers = cached.conditional_headers() if cached else {}
+    client = _get_client()
+    request = _send(
+        "GET",
+        url,
+        lambda: (
+            client.get(url, auth=auth, headers=headers)
+            if auth
+            else client.get(url, headers=headers)
+        ),
+        _cache_state(cache, cached),
+    )
+    return _get_result(_cache_update(cache, cached, auth, url, request))
+
+
+def _page_url(url: str, start: int, page_size: int) -> str:
+    """Merge the paging parameters into the query string of the given URL."""
+    return str(httpx.URL(url).copy_merge_params({"start": start, "limit": page_size}))
+
+
+def get_pages(
+    url: str, page_size: int = common_vars.page_size, fresh: bool = False
+) -> Iterator[dict]:
+    """
+    Sends GET requests to a paged Bitbucket endpoint, following
+    `nextPageStart` until the server reports the last page.
+
+    Args:
+        url (str): The URL of the paged resource.
+        page_size (int): The number of values requested per page.
+        fresh (bool): Revalidate cached pages even within the TTL.
+
+    Yields:
+        dict: Each page of the response, as returned by the server.
+
+    Raises:
+        ValueError: If any of the page requests returns a non-200 status code.
+    """
+    start = 0
+    while True:
+        page: dict = get(_page_url(url, start, page_size), fresh)[1]
+        yield page
+
+        if page.get("isLastPage", True) or page.get("nextPageStart") is None:
+            return
+        start = page["nextPageStart"]
+
+
+def get_paged(url: str, page_size: int = common_vars.page_size) -> Iterator[dict]:
+    """
+    Lazily yields the values of a paged Bitbucket endpoint, one page at a time.
+
+    Args:
+        url (str): The URL of the paged resource.
+        page_size (int): The number of values requested per page.
+
+    Yields:
+        dict: Each value across all the pages of the response.
+
+    Raises:
+        ValueError: If any of the page requests returns a non-200 status code.
+    """
+    for page in get_pages(url, page_size):
+        yield from page.get("values", [])
+
+
 def post(url: str, body: dict) -> list:
     """
     Send a POST request to the specified URL with the given body.
@@ -139,17 +475,16 @@ def post(url: str, body: dict) -> list:
     """
     auth = _get_auth()
     client = _get_client()
-    request = (
-        client.post(url, auth=auth, json=body) if auth else client.post(url, json=body)
+    request = _send(
+        "POST",
+        url,
+        lambda: (
+            client.post(url, auth=auth, json=body)
+            if auth
+            else client.post(url, json=body)
+        ),
     )
-
-    if request.status_code not in (200, 201, 204, 409):
-        raise ValueError(
-            f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
-        )
-
-    json_data: dict = {} if request.status_code == 204 else request.json()
-    return [request.status_code, json_data]
+    return _post_result(request)
 
 
 def put(url: str, body: dict) -> list:
@@ -169,16 +504,16 @@ def put(url: str, body: dict) -> list:
     """
     auth = _get_auth()
     client = _get_client()
-    request = (
-        client.put(url, auth=auth, json=body) if auth else client.put(url, json=body)
+    request = _send(
+        "PUT",
+        url,
+        lambda: (
+            client.put(url, auth=auth, json=body)
+            if auth
+            else client.put(url, json=body)
+        ),
     )
-
-    if request.status_code not in (200, 403, 409):
-        raise ValueError(
-            f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
-        )
-
-    return [request.status_code, request.json()]
+    return _put_result(request)
 
 
 def delete(url: str, body: dict) -> int:
@@ -198,13 +533,261 @@ def delete(url: str, body: dict) -> int:
     """
     auth = _get_auth()
     client = _get_client()
-    request = (
-        client.request("DELETE", url, auth=auth, json=body)
-        if auth
-        else client.request("DELETE", url, json=body)
+    request = _send(
+        "DELETE",
+        url,
+        lambda: (
+            client.request("DELETE", url, auth=auth, json=body)
+            if auth
+            else client.request("DELETE", url, json=body)
+        ),
     )
-    if request.status_code not in (202, 204):
-        raise ValueError(
-            f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
+    return _delete_result(request)
+
+
+async def async_get(url: str, fresh: bool = False) -> list:
+    """
+    Async counterpart of `get`, sharing its authentication and error mapping.
+
+    Args:
+        url (str): The URL to send the GET request to.
+        fresh (bool): Revalidate a cached response with the server even
+            within the TTL, for reads that must see the latest state.
+
+    Returns:
+        list[int, dict]: A list containing the response status code and data.
+
+    Raises:
+        ValueError: If the request returns a non-200 status code.
+    """
+    auth = _get_auth()
+    cache, cached = _cache_lookup(url, auth)
+    if not fresh and cached is not None and cache.is_fresh(cached):
+        cache.touch(cached)
+        response = httpx.Response(200, content=cached.content)
+        _record("GET", url, response, time.perf_counter(), 0, "hit")
+        return _get_result(response)
+
+    headers = cached.conditional_headers() if cached else {}
+    client = _get_async_client()
+    request = await _async_send(
+        "GET",
+        url,
+        lambda: (
+            client.get(url, auth=auth, headers=headers)
+            if auth
+            else client.get(url, headers=headers)
+        ),
+        _cache_state(cache, cached),
+    )
+    return _get_result(_cache_update(cache, cached, auth, url, request))
+
+
+async def async_post(url: str, body: dict) -> list:
+    """
+    Async counterpart of `post`, sharing its authentication and error mapping.
+
+    Args:
+        url (str): The URL to send the request to.
+        body (dict): The request body as a dictionary.
+
+    Returns:
+        list[int, dict]: A list containing the status code and the response data as a dictionary.
+
+    Raises:
+        ValueError: If the request returns a status code other than 200, 201, 204, or 409.
+    """
+    auth = _get_auth()
+    client = _get_async_client()
+    request = await _async_send(
+        "POST",
+        url,
+        lambda: (
+            client.post(url, auth=auth, json=body)
+            if auth
+            else client.post(url, json=body)
+        ),
+    )
+    return _post_result(request)
+
+
+async def async_put(url: str, body: dict) -> list:
+    """
+    Async counterpart of `put`, sharing its authentication and error mapping.
+
+    Args:
+        url (str): The URL to send the request to.
+        body (dict): The request body as a dictionary.
+
+    Returns:
+        list[int, dict]: A list containing the status code and the response body as a dictionary.
+
+    Raises:
+        ValueError: If the request returns a status code other than 200, 403, or 409.
+    """
+    auth = _get_auth()
+    client = _get_async_client()
+    request = await _async_send(
+        "PUT",
+        url,
+        lambda: (
+            client.put(url, auth=auth, json=body)
+            if auth
+            else client.put(url, json=body)
+        ),
+    )
+    return _put_result(request)
+
+
+async def async_get_pages(
+    url: str, page_size: int = common_vars.page_size, fresh: bool = False
+) -> AsyncIterator[dict]:
+    """
+    Async counterpart of `get_pages`.
+
+    Args:
+        url (str): The URL of the paged resource.
+        page_size (int): The number of values requested per page.
+        fresh (bool): Revalidate cached pages even within the TTL.
+
+    Yields:
+        dict: Each page of the response, as returned by the server.
+
+    Raises:
+        ValueError: If any of the page requests returns a non-200 status code.
+    """
+    start = 0
+    while True:
+        page: dict = (await async_get(_page_url(url, start, page_size), fresh))[1]
+        yield page
+
+        if page.get("isLastPage", True) or page.get("nextPageStart") is None:
+            return
+        start = page["nextPageStart"]
+
+
+async def async_delete(url: str, body: dict) -> int:
+    """
+    Async counterpart of `delete`, sharing its authentication and error mapping.
+
+    Args:
+        url (str): The URL to send the DELETE request to.
+        body (dict): The request body to send along with the DELETE request.
+
+    Returns:
+        int: The status code of the DELETE request.
+
+    Raises:
+        ValueError: If the DELETE request returns a status code other than 202 or 204.
+    """
+    auth = _get_auth()
+    client = _get_async_client()
+    request = await _async_send(
+        "DELETE",
+        url,
+        lambda: (
+            client.request("DELETE", url, auth=auth, json=body)
+            if auth
+            else client.request("DELETE", url, json=body)
+        ),
+    )
+    return _delete_result(request)
+
+
+async def gather(
+    *aws: Awaitable[Any],
+    limit: int = common_vars.concurrency,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Awaits the given awaitables concurrently, with at most `limit` in flight.
+
+    Args:
+        *aws (Awaitable): The awaitables to run, typically `async_*` requests.
+        limit (int): The maximum number of awaitables running at once.
+        return_exceptions (bool): Return exceptions in place of results
+            instead of raising the first one, as `asyncio.gather` does.
+
+    Returns:
+        list: The results, in the same order as the awaitables were given.
+
+    Raises:
+        Exception: The first exception raised by any of the awaitables, unless
+            `return_exceptions` is set.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return list(
+        await asyncio.gather(
+            *(bounded(aw) for aw in aws), return_exceptions=return_exceptions
         )
-    return request.status_code
+    )
+
+
+async def as_completed(
+    *aws: Awaitable[Any], limit: int = common_vars.concurrency
+) -> AsyncIterator[Any]:
+    """
+    Runs the given awaitables concurrently, with at most `limit` in flight,
+    yielding each result as soon as it is available.
+
+    Args:
+        *aws (Awaitable): The awaitables to run, typically `async_*` requests.
+        limit (int): The maximum number of awaitables running at once.
+
+    Yields:
+        Any: The results, in completion order.
+
+    Raises:
+        Exception: The first exception raised by any of the awaitables, the
+            remaining ones are cancelled.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    tasks = [asyncio.ensure_future(bounded(aw)) for aw in aws]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def run(
+    *aws: Awaitable[Any],
+    limit: int = common_vars.concurrency,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Runs the given awaitables concurrently from synchronous code and returns
+    their results. This is the entry point commands use to fan out requests.
+
+    Args:
+        *aws (Awaitable): The awaitables to run, typically `async_*` requests.
+        limit (int): The maximum number of awaitables running at once.
+        return_exceptions (bool): Return exceptions in place of results
+            instead of raising the first one.
+
+    Returns:
+        list: The results, in the same order as the awaitables were given.
+
+    Raises:
+        Exception: The first exception raised by any of the awaitables, unless
+            `return_exceptions` is set.
+    """
+
+    async def _run() -> list:
+        try:
+            return await gather(*aws, limit=limit, return_exceptions=return_exceptions)
+        finally:
+            await _close_async_client()
+
+    return asyncio.run(_run())
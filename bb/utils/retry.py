@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.retry - retry policy for idempotent http requests
+
+Transient failures (429/502/503/504 and transport errors) of GET and PUT
+requests are retried with capped exponential backoff and full jitter,
+honouring `Retry-After`, within a bounded number of attempts and a total
+deadline. Configured through the `[retry]` section of the config file.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounds and backoff parameters for retrying idempotent requests."""
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    deadline: float = 30.0
+    statuses: frozenset = frozenset({429, 502, 503, 504})
+    methods: frozenset = frozenset({"GET", "PUT"})
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        response: httpx.Response | None,
+    ) -> float | None:
+        """
+        Decides whether a failed attempt is retried and how long to wait first.
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): The number of attempts made so far, starting at 1.
+            elapsed (float): The seconds spent since the first attempt.
+            response (httpx.Response | None): The response, or None on a transport error.
+
+        Returns:
+            float | None: The seconds to wait before retrying, or None to give up.
+        """
+        if method not in self.methods or attempt >= self.attempts:
+            return None
+        if response is not None and response.status_code not in self.statuses:
+            return None
+
+        # jitter, not security
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))  # nosec B311
+        if response is not None:
+            delay = max(delay, retry_after(response.headers.get("Retry-After")))
+
+        if elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+def retry_after(value: str | None) -> float:
+    """
+    Parses a `Retry-After` header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (str | None): The value of the header.
+
+    Returns:
+        float: The seconds to wait, 0 if the header is missing or malformed.
+    """
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def retry_policy() -> RetryPolicy:
+    """
+    Builds the retry policy from the `[retry]` section of the config file.
+
+    Returns:
+        RetryPolicy: The configured retry policy.
+    """
+    from bb.utils.ini import get_setting
+
+    return RetryPolicy(
+        attempts=max(1, get_setting("retry", "attempts", RetryPolicy.attempts)),
+        backoff=get_setting("retry", "backoff", RetryPolicy.backoff),
+        max_backoff=get_setting("retry", "max_backoff", RetryPolicy.max_backoff),
+        deadline=get_setting("retry", "deadline", RetryPolicy.deadline),
+    )
+
+
+def send(method: str, request: Callable[[], httpx.Response]) -> httpx.Response:
+    """
+    Sends a request, retrying it according to the configured policy.
+
+    Args:
+        method (str): The HTTP method of the request.
+        request (Callable[[], httpx.Response]): Sends one attempt of the request.
+
+    Returns:
+        httpx.Response: The response of the last attempt.
+
+    Raises:
+        httpx.TransportError: If the last attempt failed to reach the server.
+    """
+    policy = retry_policy()
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = request()
+        except httpx.TransportError:
+            delay = policy.next_delay(method, attempt, time.monotonic() - started, None)
+            if delay is None:
+                raise
+        else:
+            delay = policy.next_delay(
+                method, attempt, time.monotonic() - started, response
+            )
+            if delay is None:
+                return response
+        time.sleep(delay)
+
+
+async def async_send(
+    method: str, request: Callable[[], Awaitable[httpx.Response]]
+) -> httpx.Response:
+    """
+    Async counterpart of `send`.
+
+    Args:
+        method (str): The HTTP method of the request.
+        request (Callable[[], Awaitable[httpx.Response]]): Sends one attempt of the request.
+
+    Returns:
+        httpx.Response: The response of the last attempt.
+
+    Raises:
+        httpx.TransportError: If the last attempt failed to reach the server.
+    """
+    policy = retry_policy()
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = await request()
+        except httpx.TransportError:
+            delay = policy.next_delay(method, attempt, time.monotonic() - started, None)
+            if delay is None:
+                raise
+        else:
+            delay = policy.next_delay(
+                method, attempt, time.monotonic() - started, response
+            )
+            if delay is None:
+                return response
+        await asyncio.sleep(delay)
@@ -24,6 +24,7 @@ bb.utils.richprint - uses py rich api to pretty print information to console
 """
 
 import sys
+import threading
 
 from rich.columns import Columns
 from rich.console import Console, Group
@@ -33,10 +34,47 @@ from rich.table import Table
 from rich.text import Text
 from rich.tree import Tree
 
+from bb.utils import timing
 from bb.utils.constants import common_vars
 
+
+class _Console(Console):
+    """A Console timing its output, for `bb --timings`."""
+
+    def print(self, *objects, **kwargs) -> None:
+        with timing.span("render", "console output"):
+            super().print(*objects, **kwargs)
+
+
 # Setting up the console.
-console = Console()
+console = _Console()
+# Diagnostics go here while stdout carries machine-readable records.
+err_console = _Console(stderr=True)
+_diagnostics = threading.local()
+
+
+def diagnostics_to_stderr(enabled: bool) -> None:
+    """
+    Routes errors, warnings and tips of the current thread to stderr, so
+    json, ndjson and csv written to stdout stay parseable.
+
+    Args:
+        enabled (bool): True while records are written to stdout.
+
+    Returns:
+        None
+    """
+    _diagnostics.stderr = enabled
+
+
+def diagnostic_console() -> Console:
+    """
+    Returns the console for errors, warnings and tips.
+
+    Returns:
+        Console: stderr while records are written to stdout, else the console.
+    """
+    return err_console if getattr(_diagnostics, "stderr", False) else console
 
 
 def str_print(text: str, style: str) -> None:
@@ -55,6 +93,23 @@ def str_print(text: str, style: str) -> None:
     console.print(text)
 
 
+def diagnostic_print(text: str, style: str) -> None:
+    """
+    Prints the given diagnostic text with the specified style, on stderr
+    while records are written to stdout.
+
+    Args:
+        text (str): The text to be printed.
+        style (str): The style to be applied to the text.
+
+    Returns:
+        None
+    """
+    text = Text(text)
+    text.stylize(style)
+    diagnostic_console().print(text)
+
+
 def table(header_args: list, value_args: list, show_header: bool) -> Table:
     """
     Generate a rich table using the provided header arguments and value arguments.
@@ -87,7 +142,7 @@ def traceback_to_console():
     The `show_locals` parameter is set to False to exclude local variables from the printed traceback.
     An extra line is added after the traceback for better readability.
     """
-    console.print_exception(show_locals=False, extra_lines=1)
+    diagnostic_console().print_exception(show_locals=False, extra_lines=1)
 
 
 def live_progress(message: str):
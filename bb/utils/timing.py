@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.timing - wall time per phase for `bb --timings`, and `--profile`
+
+Phases are recorded only while enabled, so the hooks in the request, config,
+git and console layers cost a flag check otherwise. Identical events (e.g.
+every console print) are grouped in the report, which goes to stderr to keep
+machine-readable output on stdout intact.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+
+class Event(NamedTuple):
+    phase: str
+    label: str
+    seconds: float
+    detail: str = ""
+
+
+_events: List[Event] = []
+_enabled = False
+_started = 0.0
+
+
+def enabled() -> bool:
+    """Whether timings are being recorded."""
+    return _enabled
+
+
+def start() -> None:
+    """
+    Starts recording for a new command. The first command of a process also
+    records the startup (imports and argument parsing) since `bb.main`.
+
+    Returns:
+        None
+    """
+    global _enabled, _started
+    import bb
+
+    _events.clear()
+    _enabled, _started = True, time.perf_counter()
+    if bb._started is not None:
+        record("startup", "imports and argument parsing", _started - bb._started)
+        _started, bb._started = bb._started, None
+
+
+def record(phase: str, label: str, seconds: float, detail: str = "") -> None:
+    """
+    Records an event, when enabled.
+
+    Args:
+        phase (str): The phase, e.g. 'http'.
+        label (str): What was timed, e.g. the URL.
+        seconds (float): The wall time.
+        detail (str): Extra information, e.g. the status and size.
+
+    Returns:
+        None
+    """
+    if _enabled:
+        _events.append(Event(phase, label, seconds, detail))
+
+
+@contextmanager
+def span(phase: str, label: str, detail: str = "") -> Iterator[None]:
+    """Records the wall time of the block as one event, when enabled."""
+    if not _enabled:
+        yield
+        return
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, label, time.perf_counter() - begin, detail)
+
+
+def summary(events: List[Event]) -> List[Tuple[str, str, str, int, float]]:
+    """
+    Groups identical events, keeping the order they first occurred in.
+
+    Args:
+        events (List[Event]): The recorded events.
+
+    Returns:
+        List[Tuple[str, str, str, int, float]]: Phase, label, detail (of
+        single events only), count and total seconds.
+    """
+    groups: Dict[Tuple[str, str], list] = {}
+    for event in events:
+        group = groups.setdefault((event.phase, event.label), [event.detail, 0, 0.0])
+        group[1] += 1
+        group[2] += event.seconds
+    return [
+        (phase, label, detail if count == 1 else "", count, seconds)
+        for (phase, label), (detail, count, seconds) in groups.items()
+    ]
+
+
+def finish() -> None:
+    """
+    Stops recording and prints the report to stderr.
+
+    Returns:
+        None
+    """
+    global _enabled
+    from rich.console import Console
+
+    from bb.utils.richprint import table
+
+    total = time.perf_counter() - _started
+    _enabled = False
+    events = list(_events)
+    _events.clear()
+
+    rows = [
+        (phase, label, detail, str(count), f"{seconds * 1000:.1f}")
+        for phase, label, detail, count, seconds in summary(events)
+    ]
+    phases: Dict[str, float] = {}
+    for event in events:
+        phases[event.phase] = phases.get(event.phase, 0.0) + event.seconds
+    rows.extend(
+        (f"[bold]{phase}[/bold]", "total", "", "", f"[bold]{seconds * 1000:.1f}[/bold]")
+        for phase, seconds in phases.items()
+    )
+    other = total - sum(phases.values())
+    if other > 0:
+        # concurrent requests overlap, then nothing is left unaccounted
+        rows.append(
+            ("other", "lazy imports, command logic", "", "", f"{other * 1000:.1f}")
+        )
+    rows.append(("[bold]wall[/bold]", "", "", "", f"[bold]{total * 1000:.1f}[/bold]"))
+    Console(stderr=True).print(
+        table(
+            [
+                ("PHASE", "bold cyan"),
+                ("WHAT", "#FFFFFF"),
+                ("DETAIL", "dim white"),
+                ("CALLS", "#FFFFFF"),
+                ("MS", "bold yellow"),
+            ],
+            rows,
+            True,
+        )
+    )
+
+
+def profile(path: str) -> Callable[[], None]:
+    """
+    Starts profiling the command with cProfile.
+
+    Args:
+        path (str): Where the pstats dump is written, readable with
+            `python -m pstats <path>`.
+
+    Returns:
+        Callable[[], None]: Stops profiling and writes the dump.
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def stop() -> None:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+    return stop
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.trace - NDJSON trace of the HTTP requests made by bb
+
+Set BB_TRACE to a file path and every request sent through bb.utils.request
+is appended to it as one JSON line, for aggregation across machines. URLs are
+reduced to templates (project, repository and ids replaced by placeholders)
+so requests to the same endpoint group together.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+_lock = threading.Lock()
+
+# (pattern, replacement) applied to the path, in order
+TEMPLATES = (
+    (re.compile(r"/projects/[^/]+"), "/projects/{project}"),
+    (re.compile(r"/repos/[^/]+"), "/repos/{repository}"),
+    (re.compile(r"/participants/[^/]+"), "/participants/{user}"),
+    (re.compile(r"/automerge/path/.+"), "/automerge/path/{ref}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+)
+
+
+def path() -> Optional[str]:
+    """The trace file, from BB_TRACE; None when tracing is off."""
+    return os.environ.get("BB_TRACE") or None
+
+
+def url_template(url: str) -> str:
+    """
+    Reduces a URL to its endpoint: path placeholders and query parameter
+    names only, e.g. '/rest/api/latest/projects/{project}/repos/{repository}
+    /pull-requests?limit&start'.
+
+    Args:
+        url (str): The request URL.
+
+    Returns:
+        str: The template.
+    """
+    parts = urlsplit(url)
+    template = parts.path
+    for pattern, replacement in TEMPLATES:
+        template = pattern.sub(replacement, template)
+    names = sorted({name for name, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    return f"{template}?{'&'.join(names)}" if names else template
+
+
+def record(
+    method: str,
+    url: str,
+    status: Optional[int],
+    seconds: float,
+    size: int,
+    attempts: int,
+    cache: Optional[str] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Appends one request to the trace file, when BB_TRACE is set.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The request URL.
+        status (Optional[int]): The final status code, None if no response.
+        seconds (float): The latency, including retries and rate limiting.
+        size (int): The response body size in bytes.
+        attempts (int): The attempts made, 1 without retries and 0 when
+            served from the cache.
+        cache (Optional[str]): For GETs with the response cache enabled:
+            'hit', 'revalidated', 'changed' or 'miss'.
+        error (Optional[str]): The exception type when the request failed.
+
+    Returns:
+        None
+    """
+    trace_file = path()
+    if trace_file is None:
+        return
+    entry = {
+        "ts": round(time.time(), 3),
+        "pid": os.getpid(),
+        "method": method,
+        "host": urlsplit(url).netloc,
+        "endpoint": url_template(url),
+        "status": status,
+        "latency_ms": round(seconds * 1000, 2),
+        "bytes": size,
+        "attempts": attempts,
+        "retries": max(attempts - 1, 0),
+        "cache": cache,
+        "error": error,
+    }
+    line = json.dumps(entry) + "\n"
+    try:
+        with _lock, open(trace_file, "a", encoding="utf-8") as trace:
+            trace.write(line)
+    except OSError:
+        # tracing must never fail the command
+        pass
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+"""
+Fixtures of the benchmark suite: a fake Bitbucket server running in-process
+and a throwaway git checkout pointing at it, so the real commands run end to
+end without a Bitbucket instance.
+
+The fake server is tuned with environment variables:
+
+-   BB_BENCH_LATENCY: seconds added to every response [Default: 0]
+-   BB_BENCH_PAGE_SIZE: the most values returned per page [Default: 25]
+-   BB_BENCH_PULL_REQUESTS: pull requests in the repository [Default: 100]
+-   BB_BENCH_CHANGES: files changed by every pull request [Default: 500]
+-   BB_BENCH_PAYLOAD: bytes of every pull request description [Default: 256]
+-   BB_BENCH_REVIEWERS: reviewers of every pull request [Default: 3]
+-   BB_BENCH_MAX_PEAK_MIB: memory budget of a single command [Default: 64]
+"""
+
+import dataclasses
+import functools
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+PROJECT, REPOSITORY = "PRJ", "repo"
+FROM_BRANCH, TARGET_BRANCH = "feature/bench", "master"
+
+_REPO = r"/projects/(?P<project>[^/]+)/repos/(?P<repo>[^/]+)"
+_PR = _REPO + r"/pull-requests/(?P<id>\d+)"
+_API = "/rest/api/latest"
+
+
+@dataclasses.dataclass(frozen=True)
+class Settings:
+    """The shape of the data served by the fake Bitbucket server."""
+
+    latency: float = 0.0
+    page_size: int = 25
+    pull_requests: int = 100
+    changes: int = 500
+    payload: int = 256
+    reviewers: int = 3
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Reads the settings from the BB_BENCH_* environment variables.
+
+        Returns:
+            Settings: The settings, defaults for the variables not set.
+        """
+        values = {}
+        for field in dataclasses.fields(cls):
+            value = os.environ.get(f"BB_BENCH_{field.name.upper()}")
+            if value:
+                values[field.name] = field.type(value)
+        return cls(**values)
+
+
+def _user(index: int) -> dict:
+    return {
+        "name": f"user{index}",
+        "slug": f"user{index}",
+        "displayName": f"User {index}",
+        "emailAddress": f"user{index}@example.com",
+        "active": True,
+    }
+
+
+def _ref(branch: str, commit: str) -> dict:
+    return {
+        "id": f"refs/heads/{branch}",
+        "displayId": branch,
+        "latestCommit": commit,
+        "repository": {
+            "slug": REPOSITORY,
+            "name": REPOSITORY,
+            "project": {"key": PROJECT},
+        },
+    }
+
+
+class FakeBitbucket:
+    """
+    Serves the Bitbucket Server REST endpoints used by the benchmarked
+    commands from a thread of the benchmark process.
+
+    Responses are encoded once and reused, so the server spends as little of
+    the shared interpreter as possible and the measurements stay on the client.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.routes: list = [
+            ("GET", _API + _PR + "/changes", self._changes),
+            ("GET", _API + _PR + "/merge", self._can_merge),
+            ("POST", _API + _PR + "/merge", self._merge),
+            ("GET", _API + _PR, self._pull_request),
+            ("GET", _API + _REPO + "/pull-requests", self._pull_requests),
+            ("GET", _API + "/inbox/pull-requests", self._pull_requests),
+            ("GET", _API + _REPO, self._repository),
+            ("GET", "/rest/pull-request-cleanup/latest" + _PR, self._no_blockers),
+            (
+                "GET",
+                "/rest/branch-utils/latest" + _REPO + "/automerge/path/.+",
+                self._automerge,
+            ),
+            (
+                "GET",
+                "/rest/default-reviewers/latest" + _REPO + "/reviewers",
+                self._default_reviewers,
+            ),
+        ]
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server, used as `bitbucket_host`."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBitbucket":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def configure(self, **changes) -> None:
+        """
+        Changes the served data, e.g. `configure(page_size=100)`.
+
+        Args:
+            **changes: The Settings fields to change.
+        """
+        self.settings = dataclasses.replace(self.settings, **changes)
+        self._encoded.cache_clear()
+
+    def pull_request(self, _id: int) -> dict:
+        """
+        Builds the pull request with the given id.
+
+        Args:
+            _id (int): The pull request id.
+
+        Returns:
+            dict: The pull request, as returned by Bitbucket.
+        """
+        return {
+            "id": _id,
+            "version": 1,
+            "state": "OPEN",
+            "title": f"Pull request {_id}",
+            "description": "x" * self.settings.payload,
+            "fromRef": _ref(FROM_BRANCH, f"{_id:040x}"),
+            "toRef": _ref(TARGET_BRANCH, "f" * 40),
+            "author": {"user": _user(0), "role": "AUTHOR", "status": "UNAPPROVED"},
+            "reviewers": [
+                {"user": _user(index), "role": "REVIEWER", "status": "APPROVED"}
+                for index in range(1, self.settings.reviewers + 1)
+            ],
+            "participants": [],
+            "properties": {"mergeResult": {"outcome": "CLEAN"}},
+            "createdDate": 1700000000000 + _id,
+            "updatedDate": 1700000000000 + _id,
+            "links": {
+                "self": [
+                    {
+                        "href": f"{self.url}/projects/{PROJECT}/repos/{REPOSITORY}/pull-requests/{_id}"
+                    }
+                ]
+            },
+        }
+
+    def _change(self, index: int) -> dict:
+        return {
+            "path": {"toString": f"src/module_{index}.py"},
+            "type": "MODIFY",
+        }
+
+    def _page(self, build: Callable, total: int, query: dict, **extra) -> dict:
+        start = int(query.get("start", ["0"])[0])
+        limit = min(int(query.get("limit", ["25"])[0]), self.settings.page_size)
+        end = min(start + limit, total)
+        return {
+            "size": end - start,
+            "limit": limit,
+            "start": start,
+            "isLastPage": end >= total,
+            "nextPageStart": end if end < total else None,
+            "values": [build(index) for index in range(start + 1, end + 1)],
+            **extra,
+        }
+
+    def _pull_requests(self, match, query) -> dict:
+        return self._page(self.pull_request, self.settings.pull_requests, query)
+
+    def _changes(self, match, query) -> dict:
+        return self._page(
+            self._change,
+            self.settings.changes,
+            query,
+            fromHash=f"{int(match['id']):040x}",
+            toHash="f" * 40,
+        )
+
+    def _pull_request(self, match, query) -> dict:
+        return self.pull_request(int(match["id"]))
+
+    def _can_merge(self, match, query) -> dict:
+        return {"canMerge": True, "conflicted": False, "outcome": "CLEAN", "vetoes": []}
+
+    def _merge(self, match, query) -> dict:
+        return {**self.pull_request(int(match["id"])), "state": "MERGED"}
+
+    def _no_blockers(self, match, query) -> list:
+        return []
+
+    def _automerge(self, match, query) -> dict:
+        return {"status": {"id": "NO_PATH", "available": False}, "path": []}
+
+    def _default_reviewers(self, match, query) -> list:
+        return [_user(index) for index in range(1, self.settings.reviewers + 1)]
+
+    def _repository(self, match, query) -> dict:
+        return {"id": 1, "slug": match["repo"], "name": match["repo"]}
+
+    @functools.lru_cache(maxsize=None)
+    def _encoded(self, method: str, url: str) -> tuple:
+        parts = urlsplit(url)
+        for route_method, pattern, build in self.routes:
+            match = re.fullmatch(pattern, parts.path)
+            if route_method == method and match:
+                return 200, json.dumps(build(match, parse_qs(parts.query))).encode()
+        return 404, json.dumps({"errors": [{"message": f"{url} not found"}]}).encode()
+
+    def respond(self, method: str, url: str) -> tuple:
+        """
+        Answers a request after the configured latency.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The path and query string of the request.
+
+        Returns:
+            tuple: The status code and the encoded JSON body.
+        """
+        with self._lock:
+            self.requests += 1
+        if self.settings.latency:
+            time.sleep(self.settings.latency)
+        return self._encoded(method, url)
+
+    def _handler(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _reply(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                status, body = fake.respond(self.command, self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+@pytest.fixture(scope="session")
+def bitbucket():
+    """The fake Bitbucket server, shared by the whole session."""
+    fake = FakeBitbucket(Settings.from_env()).start()
+    yield fake
+    fake.stop()
+
+
+def _git(cwd: str, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture(scope="session")
+def checkout(tmp_path_factory, bitbucket) -> str:
+    """
+    A git repository on the source branch of the fake pull requests, with
+    both branches fetched from an `origin` on the fake server.
+    """
+    path = str(tmp_path_factory.mktemp("checkout"))
+    _git(path, "init", "-q", "-b", TARGET_BRANCH)
+    _git(path, "config", "user.name", "bench")
+    _git(path, "config", "user.email", "bench@example.com")
+    _git(
+        path,
+        "remote",
+        "add",
+        "origin",
+        f"{bitbucket.url}/scm/{PROJECT}/{REPOSITORY}.git",
+    )
+    for index in range(50):
+        with open(
+            os.path.join(path, f"module_{index}.py"), "w", encoding="utf-8"
+        ) as file:
+            file.write(f"VALUE = {index}\n")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "initial")
+    _git(path, "checkout", "-q", "-b", FROM_BRANCH)
+    for index in range(0, 50, 2):
+        with open(
+            os.path.join(path, f"module_{index}.py"), "a", encoding="utf-8"
+        ) as file:
+            file.write(f"CHANGED = {index}\n")
+    _git(path, "commit", "-q", "-am", "change")
+    for branch in (TARGET_BRANCH, FROM_BRANCH):
+        _git(path, "update-ref", f"refs/remotes/origin/{branch}", branch)
+    return path
+
+
+@pytest.fixture
+def sink():
+    """A stream discarding everything written to it."""
+    with open(os.devnull, "w", encoding="utf-8") as stream:
+        yield stream
+
+
+@pytest.fixture
+def workspace(monkeypatch, tmp_path, sink, bitbucket, checkout):
+    """
+    Runs a benchmark inside the checkout, configured against the fake server
+    with empty caches and the console rendering to a terminal-like sink.
+    """
+    from bb.utils import api, cache, cmnd, ini, richprint
+
+    config = tmp_path / "config.ini"
+    config.write_text(
+        f"[auth]\nbitbucket_host = {bitbucket.url}\nusername = bench\ntoken = bench\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(ini, "BB_CONFIG_FILE", str(config))
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(checkout)
+    monkeypatch.setattr(sys, "stdout", sink)
+    ini.clear_cache()
+    api.get_bitbucket_api.cache_clear()
+
+    richprint.console.__init__(file=sink, force_terminal=True, width=120)
+    settings = bitbucket.settings
+    try:
+        yield bitbucket
+    finally:
+        bitbucket.configure(**dataclasses.asdict(settings))
+        richprint.console.__init__()
+        cmnd.close_cat_file()
+        ini.clear_cache()
+        api.get_bitbucket_api.cache_clear()
+
+
+@pytest.fixture
+def footprint(benchmark, bitbucket) -> Callable:
+    """
+    Runs a benchmarked command once more to record the requests it sends and
+    its peak memory, failing when the peak exceeds BB_BENCH_MAX_PEAK_MIB.
+    """
+    budget = float(os.environ.get("BB_BENCH_MAX_PEAK_MIB") or 64)
+
+    def measure(func: Callable, *args) -> None:
+        requests = bitbucket.requests
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["requests"] = bitbucket.requests - requests
+        benchmark.extra_info["peak_memory_kib"] = round(peak / 1024)
+        assert peak <= budget * 1024 * 1024, (
+            f"peak memory of {peak / 1024 / 1024:.1f} MiB exceeds {budget} MiB"
+        )
+
+    return measure
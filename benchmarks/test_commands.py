@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+"""
+Wall time, requests and peak memory of the commands, end to end against the
+fake Bitbucket server.
+"""
+
+import pytest
+from conftest import FROM_BRANCH, PROJECT, REPOSITORY, TARGET_BRANCH
+
+from bb.pr.create import gather_facts
+from bb.pr.diff import show_diff
+from bb.pr.list import list_pull_request
+from bb.pr.merge import merge_pull_request
+from bb.utils.output import Output
+
+
+@pytest.mark.parametrize("output_format", [Output.RICH, Output.NDJSON])
+def test_list_pull_request(benchmark, workspace, footprint, output_format):
+    args = ("current", False, False, False, "", None, output_format)
+    benchmark(list_pull_request, *args)
+    footprint(list_pull_request, *args)
+
+
+def test_list_pull_request_by_role(benchmark, workspace, footprint):
+    benchmark(list_pull_request, "author", True)
+    footprint(list_pull_request, "author", True)
+
+
+def test_merge_pull_request(benchmark, workspace, footprint, monkeypatch):
+    monkeypatch.setattr("bb.pr.merge.confirm", lambda *args, **kwargs: False)
+    benchmark(merge_pull_request, "1", False, False, True)
+    footprint(merge_pull_request, "1", False, False, True)
+
+
+def test_gather_facts(benchmark, workspace, footprint):
+    args = (TARGET_BRANCH, FROM_BRANCH, PROJECT, REPOSITORY, "Title", "Description")
+    benchmark(gather_facts, *args)
+    footprint(gather_facts, *args)
+
+
+@pytest.mark.parametrize("output_format", [Output.RICH, Output.JSON])
+def test_show_diff(benchmark, workspace, footprint, output_format):
+    benchmark(show_diff, "1", output_format)
+    footprint(show_diff, "1", output_format)
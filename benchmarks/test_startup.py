@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+"""
+Start-up cost: importing bb and running the cheapest command in a fresh
+interpreter, as every invocation without the daemon does.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ENV = {**os.environ, "BB_NO_DAEMON": "1"}
+
+
+def _cumulative_import_us(module: str) -> int:
+    """Reads the cumulative import time of a module from `-X importtime`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        env=ENV,
+        text=True,
+    ).stderr
+    for line in stderr.splitlines():
+        _, cumulative, name = line.rsplit("|", 2)
+        if name.strip() == module:
+            return int(cumulative)
+    raise ValueError(f"{module} is missing from the import times")
+
+
+@pytest.mark.parametrize("module", ["bb", "bb.cli"])
+def test_import(benchmark, module):
+    command = [sys.executable, "-c", f"import {module}"]
+    benchmark.pedantic(
+        subprocess.run,
+        args=(command,),
+        kwargs={"check": True, "env": ENV},
+        rounds=10,
+        warmup_rounds=1,
+    )
+    benchmark.extra_info["import_us"] = _cumulative_import_us(module)
+
+
+def test_version(benchmark):
+    command = [sys.executable, "-c", "import bb; bb.main()", "--version"]
+    benchmark.pedantic(
+        subprocess.run,
+        args=(command,),
+        kwargs={"check": True, "env": ENV, "capture_output": True},
+        rounds=10,
+        warmup_rounds=1,
+    )
@@ -19,15 +19,18 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
+from unittest.mock import patch
+
+import pytest
 from props import Api
 
-from bb.utils.api import bitbucket_api
+from bb.utils.api import BitbucketAPI, PullRequest, get_bitbucket_api
 
 property = Api()
 
 
 def test_test():
-    test = bitbucket_api.test()
+    test = get_bitbucket_api().test()
     assert (
         test == f"{property.bitbucket_host}/rest/api/latest/inbox/pull-requests/count"
     )
@@ -35,7 +38,7 @@ def test_test():
 
 
 def test_pull_request_create():
-    pull_request_create = bitbucket_api.pull_request_create(
+    pull_request_create = get_bitbucket_api().pull_request_create(
         property.project, property.repository
     )
     assert (
@@ -46,16 +49,24 @@ def test_pull_request_create():
 
 
 def test_get_repo_info():
-    get_repo_info = bitbucket_api.get_repo_info(property.project)
+    get_repo_info = get_bitbucket_api().get_repo_info(property.project)
     assert (
         get_repo_info
-        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos?start=0&limit=10000"
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos"
     )
     assert isinstance(get_repo_info, str)
 
 
+def test_repo_info():
+    repo_info = get_bitbucket_api().repo_info(property.project, property.repository)
+    assert (
+        repo_info
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}"
+    )
+
+
 def test_default_reviewers():
-    default_reviewers = bitbucket_api.default_reviewers(
+    default_reviewers = get_bitbucket_api().default_reviewers(
         property.project,
         property.repo_id,
         property.from_branch,
@@ -78,7 +89,7 @@ def test_default_reviewers():
 
 
 def test_pull_request_body():
-    pull_request_body = bitbucket_api.pull_request_body(
+    pull_request_body = get_bitbucket_api().pull_request_body(
         property.title,
         property.description,
         property.from_branch,
@@ -118,20 +129,20 @@ def test_pull_request_body():
 
 
 def test_pull_request_difference():
-    pull_request_difference = bitbucket_api.pull_request_difference(
+    pull_request_difference = get_bitbucket_api().pull_request_difference(
         property.project, property.repository, property.pr_no
     )
 
     assert (
         pull_request_difference
-        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}/pull-requests/{property.pr_no}/changes?start=0&limit=1000&changeScope=unreviewed"
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}/pull-requests/{property.pr_no}/changes?changeScope=unreviewed"
     )
 
     assert isinstance(pull_request_difference, str)
 
 
 def test_pull_request_info():
-    pull_request_info = bitbucket_api.pull_request_info(
+    pull_request_info = get_bitbucket_api().pull_request_info(
         property.project, property.repository, property.pr_no
     )
 
@@ -144,7 +155,7 @@ def test_pull_request_info():
 
 
 def test_pull_request_viewer():
-    pull_request_viewer = bitbucket_api.pull_request_viewer(property.role)
+    pull_request_viewer = get_bitbucket_api().pull_request_viewer(property.role)
 
     assert (
         pull_request_viewer
@@ -155,7 +166,7 @@ def test_pull_request_viewer():
 
 
 def test_current_pull_request():
-    current_pull_request = bitbucket_api.current_pull_request(
+    current_pull_request = get_bitbucket_api().current_pull_request(
         property.project, property.repository
     )
 
@@ -167,15 +178,26 @@ def test_current_pull_request():
     assert isinstance(current_pull_request, str)
 
 
+def test_pull_requests_by_update():
+    url = get_bitbucket_api().pull_requests_by_update(
+        property.project, property.repository
+    )
+
+    assert (
+        url
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}/pull-requests?state=ALL&order=NEWEST"
+    )
+
+
 def test_whoami():
-    whoami = bitbucket_api.whoami()
+    whoami = get_bitbucket_api().whoami()
 
     assert whoami == f"{property.bitbucket_host}/plugins/servlet/applinks/whoami"
     assert isinstance(whoami, str)
 
 
 def test_action_pull_request():
-    action_pull_request = bitbucket_api.action_pull_request(
+    action_pull_request = get_bitbucket_api().action_pull_request(
         property.project,
         property.repository,
         property.target,
@@ -190,7 +212,7 @@ def test_action_pull_request():
 
 
 def test_pr_source_branch_delete_check():
-    pr_source_branch_delete_check = bitbucket_api.pr_source_branch_delete_check(
+    pr_source_branch_delete_check = get_bitbucket_api().pr_source_branch_delete_check(
         property.project,
         property.repository,
         property.pr_no,
@@ -205,7 +227,7 @@ def test_pr_source_branch_delete_check():
 
 
 def test_validate_merge():
-    validate_merge = bitbucket_api.validate_merge(
+    validate_merge = get_bitbucket_api().validate_merge(
         property.project, property.repository, property.pr_no
     )
     assert (
@@ -216,7 +238,9 @@ def test_validate_merge():
 
 
 def test_merge_config():
-    merge_config = bitbucket_api.merge_config(property.project, property.repository)
+    merge_config = get_bitbucket_api().merge_config(
+        property.project, property.repository
+    )
 
     assert (
         merge_config
@@ -226,7 +250,7 @@ def test_merge_config():
 
 
 def test_get_merge_info():
-    get_merge_info = bitbucket_api.get_merge_info(
+    get_merge_info = get_bitbucket_api().get_merge_info(
         property.project, property.repository, property.target
     )
     assert (
@@ -237,7 +261,7 @@ def test_get_merge_info():
 
 
 def test_pr_merge_body():
-    pr_merge_body = bitbucket_api.pr_merge_body(
+    pr_merge_body = get_bitbucket_api().pr_merge_body(
         property.project,
         property.repository,
         property.pr_no,
@@ -254,7 +278,7 @@ def test_pr_merge_body():
 
 
 def test_pr_cleanup():
-    pr_cleanup = bitbucket_api.pr_cleanup(
+    pr_cleanup = get_bitbucket_api().pr_cleanup(
         property.project, property.repository, property.pr_no
     )
     assert (
@@ -266,14 +290,14 @@ def test_pr_cleanup():
 
 def test_pr_cleanup_body():
     for prop in property.delete_source_branch:
-        pr_cleanup_body = bitbucket_api.pr_cleanup_body(prop)
+        pr_cleanup_body = get_bitbucket_api().pr_cleanup_body(prop)
         assert isinstance(prop, bool)
         assert pr_cleanup_body == {"deleteSourceRef": prop, "retargetDependents": prop}
         assert isinstance(pr_cleanup_body, dict)
 
 
 def test_pr_rebase():
-    pr_rebase = bitbucket_api.pr_rebase(
+    pr_rebase = get_bitbucket_api().pr_rebase(
         property.project,
         property.repository,
         property.pr_no,
@@ -288,7 +312,7 @@ def test_pr_rebase():
 
 
 def test_delete_branch():
-    delete_branch = bitbucket_api.delete_branch(
+    delete_branch = get_bitbucket_api().delete_branch(
         property.project,
         property.repository,
         property.from_branch,
@@ -301,7 +325,7 @@ def test_delete_branch():
 
 
 def test_delete_repo():
-    delete_repo = bitbucket_api.delete_repo(property.project, property.repository)
+    delete_repo = get_bitbucket_api().delete_repo(property.project, property.repository)
     assert (
         delete_repo
         == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}"
@@ -311,10 +335,70 @@ def test_delete_repo():
 
 
 def test_create_repo():
-    create_repo = bitbucket_api.create_repo(property.project)
+    create_repo = get_bitbucket_api().create_repo(property.project)
     assert (
         create_repo
         == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos"
     )
 
     assert isinstance(create_repo, str)
+
+
+def test_get_bitbucket_api_is_memoized():
+    get_bitbucket_api.cache_clear()
+    with patch("bb.utils.api.parse", return_value=["u", "t", "host"]) as mock_parse:
+        api = get_bitbucket_api()
+        assert isinstance(api, BitbucketAPI)
+        assert api.bitbucket_host == "host"
+        assert get_bitbucket_api() is api
+        mock_parse.assert_called_once()
+    get_bitbucket_api.cache_clear()
+
+
+def test_get_bitbucket_api_without_config():
+    get_bitbucket_api.cache_clear()
+    with patch("bb.utils.api.is_config_present", return_value=False):
+        with pytest.raises(ValueError, match="Configuration not present"):
+            get_bitbucket_api()
+    with patch("bb.utils.api.parse", return_value=["u", "t", "host"]):
+        assert get_bitbucket_api().bitbucket_host == "host"
+    get_bitbucket_api.cache_clear()
+
+
+def test_pull_request_from_json():
+    _pr = PullRequest.from_json(
+        {
+            "id": 7,
+            "version": 3,
+            "state": "OPEN",
+            "title": "Title",
+            "fromRef": {
+                "displayId": "src",
+                "latestCommit": "abc",
+                "repository": {"slug": "repo", "project": {"key": "PRJ"}},
+            },
+            "toRef": {"displayId": "dst"},
+            "author": {"user": {"name": "jdoe", "active": True}, "role": "AUTHOR"},
+            "reviewers": [
+                {"user": {"name": "asmith", "active": False}, "status": "APPROVED"}
+            ],
+            "links": {"self": [{"href": "http://example.com/7"}]},
+            "unused": {"nested": ["payload"]},
+        }
+    )
+    assert (_pr.id, _pr.version, _pr.url) == (7, 3, "http://example.com/7")
+    assert _pr.from_ref.repository.project == "PRJ"
+    assert _pr.to_ref.repository.slug == ""
+    assert _pr.author.name == "jdoe"
+    assert _pr.reviewers[0].status == "APPROVED"
+    assert _pr.reviewers[0].active is False
+    assert _pr.participants == ()
+    assert _pr.description == ""
+    assert _pr.merge_outcome == "CLEAN"
+
+
+def test_pull_request_is_slotted():
+    _pr = PullRequest.from_json({})
+    assert not hasattr(_pr, "__dict__")
+    with pytest.raises(AttributeError):
+        _pr.title = "changed"
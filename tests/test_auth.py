@@ -87,7 +87,7 @@ def test_status_no_config(mock_is_config):
 
 
 @patch("bb.auth.is_config_present", return_value=True)
-@patch("bb.auth.console.print")
+@patch("bb.utils.richprint.console.print")
 def test_setup_config_present(mock_print, mock_is_config):
     result = runner.invoke(_auth, ["setup"])
     assert result.exit_code == 0
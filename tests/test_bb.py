@@ -19,6 +19,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
+import json
+import subprocess
+import sys
+
 from typer.testing import CliRunner
 
 from bb import _bb
@@ -38,3 +42,25 @@ def test_verbose():
     result = runner.invoke(_bb, ["--verbose", "pr", "--help"])
     assert result.exit_code == 0
     assert common_vars.state["verbose"] is True
+
+
+def test_import_is_lazy():
+    # loading the CLI must not pull in command implementations or heavy
+    # dependencies, and bb's own share of startup (typer excluded) stays small
+    code = (
+        "import json, sys, time\n"
+        "import typer\n"
+        "start = time.perf_counter()\n"
+        "import bb.cli\n"
+        "elapsed = time.perf_counter() - start\n"
+        "heavy = ['httpx', 'rich.console', 'rich.live', 'rich.table', 'webbrowser',\n"
+        "         'bb.utils.request', 'bb.utils.richprint', 'bb.pr.create']\n"
+        "print(json.dumps({'elapsed': elapsed,\n"
+        "                  'loaded': [m for m in heavy if m in sys.modules]}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout)
+    assert report["loaded"] == []
+    assert report["elapsed"] < 0.25
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from bb.utils import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path / "bb"))
+    return tmp_path / "bb"
+
+
+def test_cache_path(monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/xdg-cache")
+    assert cache.cache_path() == os.path.join("/tmp/xdg-cache", "bb")
+
+
+def test_load_missing_cache():
+    assert cache.load("missing") == {}
+
+
+def test_store_and_load(cache_dir):
+    cache.store("example", {"key": "value"})
+    assert cache.load("example") == {"key": "value"}
+    assert os.listdir(cache_dir) == ["example.json"]
+
+
+def test_load_corrupt_cache(cache_dir):
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "example.json").write_text("{not json")
+    assert cache.load("example") == {}
+
+
+def test_repo_id_roundtrip():
+    assert cache.get_repo_id("https://bitbucket.org.com", "PRJ", "repo") is None
+    cache.set_repo_id("https://bitbucket.org.com/", "PRJ", "Repo", 42)
+    assert cache.get_repo_id("https://bitbucket.org.com", "prj", "repo") == 42
+    assert cache.get_repo_id("https://other.host", "prj", "repo") is None
+
+
+def test_response_cache_roundtrip(cache_dir):
+    response_cache = cache.ResponseCache(str(cache_dir / "http"), 0, 1024)
+    assert response_cache.lookup("user", "https://host/api") is None
+
+    response_cache.save("user", "https://host/api", b'{"a": 1}', '"etag"', None)
+    cached = response_cache.lookup("user", "https://host/api")
+
+    assert cached.content == b'{"a": 1}'
+    assert cached.conditional_headers() == {"If-None-Match": '"etag"'}
+    assert response_cache.lookup("other", "https://host/api") is None
+    assert not response_cache.is_fresh(cached)
+
+
+def test_response_cache_skips_unvalidated_without_ttl(cache_dir):
+    response_cache = cache.ResponseCache(str(cache_dir / "http"), 0, 1024)
+    response_cache.save("user", "https://host/api", b"{}", None, None)
+    assert response_cache.lookup("user", "https://host/api") is None
+
+    response_cache.ttl = 60
+    response_cache.save("user", "https://host/api", b"{}", None, None)
+    cached = response_cache.lookup("user", "https://host/api")
+    assert response_cache.is_fresh(cached)
+    assert cached.conditional_headers() == {}
+
+
+def test_response_cache_evicts_least_recently_used(cache_dir):
+    response_cache = cache.ResponseCache(str(cache_dir / "http"), 60, 250)
+    response_cache.save("user", "https://host/old", b"x" * 100, None, None)
+    old = response_cache.lookup("user", "https://host/old")
+    os.utime(old.path, (1, 1))
+
+    response_cache.save("user", "https://host/new", b"x" * 100, None, None)
+
+    assert response_cache.lookup("user", "https://host/old") is None
+    assert response_cache.lookup("user", "https://host/new") is not None
+
+
+def test_response_cache_scans_only_when_full(cache_dir):
+    response_cache = cache.ResponseCache(str(cache_dir / "http"), 60, 1024)
+    response_cache.save("user", "https://host/first", b"x" * 100, None, None)
+
+    with patch("bb.utils.cache.os.scandir", wraps=os.scandir) as mock_scandir:
+        response_cache.save("user", "https://host/second", b"x" * 100, None, None)
+        response_cache.save("user", "https://host/second", b"x" * 100, None, None)
+        mock_scandir.assert_not_called()
+
+        response_cache.save("user", "https://host/large", b"x" * 900, None, None)
+        mock_scandir.assert_called_once()
+
+    assert response_cache.lookup("user", "https://host/large") is not None
+    assert response_cache._size() == sum(
+        entry.stat().st_size
+        for entry in os.scandir(cache_dir / "http")
+        if not entry.name.startswith(".")
+    )
+
+
+def test_response_cache_evict_tolerates_removed_entry(cache_dir):
+    response_cache = cache.ResponseCache(str(cache_dir / "http"), 60, 1024)
+    response_cache.save("user", "https://host/kept", b"x" * 100, None, None)
+
+    class Removed:
+        name = "0" * 64
+        path = str(cache_dir / "http" / name)
+
+        def is_file(self):
+            return True
+
+        def stat(self):
+            raise FileNotFoundError(self.path)
+
+    real_entries = list(os.scandir(cache_dir / "http"))
+    with patch("bb.utils.cache.os.scandir", return_value=[Removed(), *real_entries]):
+        response_cache._evict()
+
+    assert response_cache.lookup("user", "https://host/kept") is not None
+
+
+def test_response_cache_disabled_by_default():
+    with patch("bb.utils.ini.get_setting", side_effect=lambda s, o, f: f):
+        assert cache.response_cache() is None
+
+
+def test_response_cache_enabled(cache_dir):
+    settings = {("cache", "enabled"): True, ("cache", "ttl"): 30.0}
+    with patch(
+        "bb.utils.ini.get_setting",
+        side_effect=lambda s, o, f: settings.get((s, o), f),
+    ):
+        response_cache = cache.response_cache()
+
+    assert response_cache.directory == str(cache_dir / "http")
+    assert response_cache.ttl == 30.0
+    assert response_cache.max_size == 64 * 1024 * 1024
+
+
+def test_identity_roundtrip(cache_dir):
+    assert cache.get_identity("https://bitbucket.org.com", "token") is None
+    cache.set_identity("https://Bitbucket.org.com/", "token", "jdoe")
+    assert cache.get_identity("https://bitbucket.org.com", "token") == "jdoe"
+    assert cache.get_identity("https://bitbucket.org.com", "other") is None
+    assert "token" not in (cache_dir / "identities.json").read_text()
+
+
+def test_clear_identities():
+    cache.set_identity("https://bitbucket.org.com", "token", "jdoe")
+    cache.clear_identities()
+    assert cache.get_identity("https://bitbucket.org.com", "token") is None
+    cache.clear_identities()
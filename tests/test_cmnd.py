@@ -11,14 +11,16 @@ from bb.utils import cmnd
 property = Cmnd()
 
 
+@patch("bb.utils.cmnd.git.find_repository", return_value=None)
 @patch("bb.utils.cmnd.subprocess_run")
-def test_base_repo(mock_subprocess_run):
+def test_base_repo(mock_subprocess_run, mock_find):
     mock_subprocess_run.return_value = "origin\thttps://bitbucket.org/myproject/myrepo.git (fetch)\norigin\thttps://bitbucket.org/myproject/myrepo.git (push)"
     assert cmnd.base_repo() == ["myproject", "myrepo"]
 
 
+@patch("bb.utils.cmnd.git.find_repository", return_value=None)
 @patch("bb.utils.cmnd.subprocess_run")
-def test_from_branch(mock_subprocess_run):
+def test_from_branch(mock_subprocess_run, mock_find):
     mock_subprocess_run.return_value = "main"
     assert cmnd.from_branch() == "main"
 
@@ -31,20 +33,24 @@ def test_git_rebase(mock_subprocess_run):
     mock_subprocess_run.assert_any_call("git push --force-with-lease")
 
 
-@patch("bb.utils.cmnd.subprocess_run")
-def test_title_and_description(mock_subprocess_run):
-    mock_subprocess_run.return_value = "My Title\n\nMy Description\nLine 2"
+@patch("bb.utils.cmnd.cat_file")
+def test_title_and_description(mock_cat_file):
+    mock_cat_file.return_value.commit_message.return_value = (
+        "My Title\n\nMy Description\nLine 2"
+    )
     assert cmnd.title_and_description() == ["My Title", "My Description\nLine 2"]
 
 
+@patch("bb.utils.cmnd.git.find_repository", return_value=None)
 @patch("bb.utils.cmnd.subprocess_run")
-def test_is_git_repo(mock_subprocess_run):
+def test_is_git_repo(mock_subprocess_run, mock_find):
     mock_subprocess_run.return_value = "true"
     assert cmnd.is_git_repo() is True
 
 
+@patch("bb.utils.cmnd.git.find_repository", return_value=None)
 @patch("bb.utils.cmnd.subprocess_run")
-def test_is_git_repo_false(mock_subprocess_run):
+def test_is_git_repo_false(mock_subprocess_run, mock_find):
     mock_subprocess_run.return_value = "false"
     assert cmnd.is_git_repo() is False
 
@@ -116,8 +122,9 @@ def test_checkout_and_pull_modified(mock_subprocess_run):
         cmnd.checkout_and_pull("main")
 
 
+@patch("bb.utils.cmnd.git.find_repository", return_value=None)
 @patch("bb.utils.cmnd.subprocess_run")
-def test_base_repo_no_remote(mock_subprocess_run):
+def test_base_repo_no_remote(mock_subprocess_run, mock_find):
     mock_subprocess_run.return_value = None
     with pytest.raises(ValueError, match="no remote information is found"):
         cmnd.base_repo()
@@ -153,3 +160,68 @@ def test_show_git_diff_error(mock_check_call):
     mock_check_call.side_effect = subprocess.CalledProcessError(1, "git diff")
     with pytest.raises(ValueError):
         cmnd.show_git_diff("source", "target")
+
+
+def _repository(**kwargs):
+    repository = MagicMock()
+    for name, value in kwargs.items():
+        getattr(repository, name).return_value = value
+    return repository
+
+
+@patch("bb.utils.cmnd.subprocess_run")
+def test_native_lookups_do_not_spawn_git(mock_subprocess_run):
+    repository = _repository(
+        current_branch="feature/x",
+        remotes={
+            "upstream": "https://bitbucket.org/other/fork.git",
+            "origin": "ssh://git@bitbucket.org:7999/myproject/myrepo.git",
+        },
+    )
+    with patch("bb.utils.cmnd.git.find_repository", return_value=repository):
+        assert cmnd.is_git_repo() is True
+        assert cmnd.from_branch() == "feature/x"
+        assert cmnd.base_repo() == ["myproject", "myrepo"]
+    mock_subprocess_run.assert_not_called()
+
+
+@patch("bb.utils.cmnd.subprocess_run", return_value="develop")
+def test_from_branch_falls_back_to_git(mock_subprocess_run):
+    repository = _repository(current_branch=None, remotes=None)
+    with patch("bb.utils.cmnd.git.find_repository", return_value=repository):
+        assert cmnd.from_branch() == "develop"
+    mock_subprocess_run.assert_called_once_with("git rev-parse --abbrev-ref HEAD")
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for env in ("GIT_DIR", "GIT_WORK_TREE", "GIT_INDEX_FILE"):
+        monkeypatch.delenv(env, raising=False)
+    author = ["-c", "user.name=bb", "-c", "user.email=bb@example.com"]
+    subprocess.run(["git", "init", "-q"], check=True)
+    (tmp_path / "file.txt").write_text("hello\n")
+    subprocess.run(["git", "add", "file.txt"], check=True)
+    subprocess.run(
+        ["git", *author, "commit", "-q", "-m", "Title\n\nBody line"], check=True
+    )
+    return tmp_path
+
+
+def test_cat_file_reuses_one_process(git_repo):
+    reader = cmnd.CatFile()
+    try:
+        assert reader.commit_message() == "Title\n\nBody line"
+        process = reader._batch
+        assert reader.read("HEAD:file.txt") == ("blob", b"hello\n")
+        assert reader._batch is process
+        with pytest.raises(ValueError, match="not found"):
+            reader.read("HEAD:missing.txt")
+        assert reader.read("HEAD:file.txt")[1] == b"hello\n"
+    finally:
+        reader.close()
+    assert process.poll() is not None
+
+
+def test_cat_file_shared_instance():
+    assert cmnd.cat_file() is cmnd.cat_file()
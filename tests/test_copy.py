@@ -22,7 +22,7 @@
 from unittest.mock import patch
 
 from bb.pr.copy import copy_pull_request
-from bb.utils.api import bitbucket_api
+from bb.utils.api import get_bitbucket_api
 
 
 @patch("bb.pr.copy.cmnd.base_repo")
@@ -39,6 +39,6 @@ def test_copy_pull_request(mock_cp_to_clipboard, mock_get, mock_base_repo):
     # Assert
     mock_base_repo.assert_called_once()
     mock_get.assert_called_once_with(
-        bitbucket_api.pull_request_info("project", "repository", "123")
+        get_bitbucket_api().pull_request_info("project", "repository", "123")
     )
     mock_cp_to_clipboard.assert_called_once_with("test_url")
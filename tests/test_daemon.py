@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from bb.cli import _bb
+from bb.daemon.server import Server
+from bb.utils import daemon
+
+pytestmark = pytest.mark.skipif(
+    not daemon.supported(), reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def runtime_dir(tmp_path, monkeypatch):
+    # keep the socket path short, AF_UNIX paths are limited to ~100 bytes
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.delenv("BB_NO_DAEMON", raising=False)
+    return tmp_path
+
+
+def test_socket_path(runtime_dir):
+    assert daemon.socket_path() == str(runtime_dir / "bb" / "daemon.sock")
+
+
+def test_forward_without_daemon(runtime_dir):
+    assert daemon.forward(["--version"]) is None
+
+
+def test_forward_skipped(runtime_dir, monkeypatch):
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(daemon, "request", lambda *_: pytest.fail("forwarded"))
+        assert daemon.forward(["daemon", "status"]) is None
+        monkeypatch.setenv("BB_NO_DAEMON", "1")
+        assert daemon.forward(["--version"]) is None
+
+
+def test_interactive_commands_run_locally(runtime_dir, monkeypatch):
+    monkeypatch.setattr(daemon, "request", lambda *_: pytest.fail("forwarded"))
+    monkeypatch.setattr(sys, "stdin", type("Tty", (), {"isatty": lambda _: True})())
+    for argv in (
+        ["shell"],
+        ["--verbose", "batch", "commands.txt"],
+        ["pr", "merge", "--id", "1", "--yes"],
+        ["pr", "view"],
+        ["auth", "setup"],
+        ["repo", "delete"],
+    ):
+        assert daemon.interactive(argv), argv
+        assert daemon.forward(argv) is None
+    for argv in (
+        ["--version"],
+        ["pr", "list", "--all"],
+        ["--profile", "out.prof", "pr", "view", "--id", "7"],
+        ["pr", "diff", "--id=7"],
+        ["pr", "merge", "--help"],
+    ):
+        assert not daemon.interactive(argv), argv
+
+    # without a terminal prompts read the caller's input wherever they run
+    monkeypatch.setattr(sys, "stdin", type("Pipe", (), {"isatty": lambda _: False})())
+    assert not daemon.interactive(["pr", "merge", "--id", "1"])
+    assert daemon.interactive(["batch"])
+
+
+def test_receive_with_fds():
+    left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    read_fd, write_fd = os.pipe()
+    with left, right:
+        socket.send_fds(left, [daemon.encode({"argv": ["x" * 100000]})], [write_fd])
+        message, fds = daemon.receive(right, 1)
+        assert message == {"argv": ["x" * 100000]}
+        os.write(fds[0], b"ok")
+        assert os.read(read_fd, 2) == b"ok"
+        left.close()
+        assert daemon.receive(right) == (None, [])
+    for fd in (read_fd, write_fd, *fds):
+        os.close(fd)
+
+
+def test_bind_replaces_stale_socket(runtime_dir):
+    path = daemon.socket_path()
+    stale = Server(path).bind()
+    stale.close()  # the file stays behind, nobody listens
+    listener = Server(path).bind()
+    with listener:
+        with pytest.raises(ValueError, match="already listening"):
+            Server(path).bind()
+        assert os.stat(path).st_mode & 0o077 == 0
+
+
+def bb(*args, cwd=None):
+    return subprocess.run(
+        [sys.executable, "-c", "import bb; bb.main()", *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env=os.environ,
+    )
+
+
+def test_commands_run_in_daemon(runtime_dir, tmp_path):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "bb.daemon.server"], env=os.environ
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(daemon.socket_path()):
+            assert time.monotonic() < deadline and server.poll() is None
+            time.sleep(0.05)
+
+        version = bb("--version")
+        assert version.returncode == 0
+        assert "bb version" in version.stdout
+
+        # runs in the client's directory, which is not a git repository
+        work = tmp_path / "work"
+        work.mkdir()
+        failed = bb("pr", "list", cwd=work)
+        assert failed.returncode == 1
+        assert "not a git repository" in failed.stdout
+
+        assert daemon.request({"control": "status"})["served"] == 2
+        assert daemon.request({"control": "stop"})["pid"] == server.pid
+        assert server.wait(timeout=10) == 0
+        assert not os.path.exists(daemon.socket_path())
+    finally:
+        server.kill()
+
+
+SLOW_SERVER = """
+import sys, time
+from bb.daemon import server
+
+def slow(argv, cwd, env, fds):
+    time.sleep(float(argv[0]))
+    open(argv[1], "w").close()
+    return 0
+
+server.run_command = slow
+server.Server(sys.argv[1]).serve()
+"""
+
+
+def test_commands_run_concurrently_and_abort_on_hangup(runtime_dir, tmp_path):
+    path = daemon.socket_path()
+    server = subprocess.Popen([sys.executable, "-c", SLOW_SERVER, path])
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(path):
+            assert time.monotonic() < deadline and server.poll() is None
+            time.sleep(0.05)
+
+        def send(seconds, marker):
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.connect(path)
+            message = {"argv": [str(seconds), str(marker)], "cwd": "", "env": {}}
+            socket.send_fds(conn, [daemon.encode(message)], [0, 1, 2])
+            return conn
+
+        slow, fast = tmp_path / "slow", tmp_path / "fast"
+        hung_up = send(2, slow)
+        started = time.monotonic()
+        with send(0, fast) as conn:
+            assert daemon.receive(conn)[0] == {"exit": 0}
+        assert time.monotonic() - started < 2  # not queued behind the slow one
+        assert fast.exists()
+
+        hung_up.close()  # an interrupted client
+        time.sleep(3)
+        assert not slow.exists()
+        assert daemon.request({"control": "status"})["served"] == 2
+        daemon.request({"control": "stop"})
+        assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+
+
+def test_silent_client_does_not_stall_the_daemon(runtime_dir):
+    path = daemon.socket_path()
+    server = subprocess.Popen([sys.executable, "-c", SLOW_SERVER, path])
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(path):
+            assert time.monotonic() < deadline and server.poll() is None
+            time.sleep(0.05)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+            silent.connect(path)
+            time.sleep(0.1)  # accepted before the status request
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(10)  # fail rather than hang behind the silent one
+                conn.connect(path)
+                conn.sendall(daemon.encode({"control": "status"}))
+                assert daemon.receive(conn)[0]["served"] == 0
+        daemon.request({"control": "stop"})
+        assert server.wait(timeout=10) == 0
+    finally:
+        server.kill()
+
+
+def test_status_without_daemon(runtime_dir):
+    result = CliRunner().invoke(_bb, ["daemon", "status"])
+    assert result.exit_code == 1
+    assert "not running" in result.stdout
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import pytest
+
+from bb.utils import git
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+OTHER = "fedcba9876543210fedcba9876543210fedcba98"
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    monkeypatch.delenv("GIT_WORK_TREE", raising=False)
+    git_dir = tmp_path / "repo" / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "refs" / "heads" / "main").write_text(f"{SHA}\n")
+    (git_dir / "packed-refs").write_text(
+        f"# pack-refs with: peeled fully-peeled sorted\n{OTHER} refs/heads/release\n"
+    )
+    (git_dir / "config").write_text(
+        "[core]\n\tbare = false\n"
+        '[remote "origin"]\n'
+        "\turl = https://bitbucket.org/scm/proj/repo.git\n"
+        "\tfetch = +refs/heads/*:refs/remotes/origin/*\n"
+        "\tfetch = +refs/tags/*:refs/tags/*\n"
+        '[branch "main"]\n\tremote = origin\n'
+    )
+    return tmp_path / "repo"
+
+
+def test_find_repository_from_subdirectory(repo):
+    (repo / "src" / "pkg").mkdir(parents=True)
+    repository = git.find_repository(str(repo / "src" / "pkg"))
+    assert repository.worktree == repo.resolve()
+    assert repository.git_dir == repository.common_dir == (repo / ".git").resolve()
+
+
+def test_find_repository_none(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    monkeypatch.delenv("GIT_WORK_TREE", raising=False)
+    assert git.find_repository(str(tmp_path)) is None
+
+
+def test_find_repository_defers_to_git_env(repo, monkeypatch):
+    monkeypatch.setenv("GIT_DIR", str(repo / ".git"))
+    assert git.find_repository(str(repo)) is None
+
+
+def test_find_repository_inside_git_dir(repo):
+    assert git.find_repository(str(repo / ".git" / "refs")) is None
+
+
+def test_current_branch(repo):
+    repository = git.find_repository(str(repo))
+    assert repository.current_branch() == "main"
+    assert repository.head() == "refs/heads/main"
+
+
+def test_detached_head(repo):
+    (repo / ".git" / "HEAD").write_text(f"{OTHER}\n")
+    repository = git.find_repository(str(repo))
+    assert repository.current_branch() == "HEAD"
+    assert repository.head() == OTHER
+
+
+def test_reftable_head_is_unreadable(repo):
+    (repo / ".git" / "HEAD").write_text("ref: refs/heads/.invalid\n")
+    assert git.find_repository(str(repo)).current_branch() is None
+
+
+def test_remotes(repo):
+    assert git.find_repository(str(repo)).remotes() == {
+        "origin": "https://bitbucket.org/scm/proj/repo.git"
+    }
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        "[include]\n\tpath = other.config\n",
+        '[url "ssh://git@host/"]\n\tinsteadOf = https://host/\n',
+    ],
+)
+def test_remotes_defer_to_git(repo, extra):
+    with open(repo / ".git" / "config", "a") as config:
+        config.write(extra)
+    assert git.find_repository(str(repo)).remotes() is None
+
+
+def test_linked_worktree(repo, tmp_path):
+    worktree_git = repo / ".git" / "worktrees" / "wt"
+    worktree_git.mkdir(parents=True)
+    (worktree_git / "HEAD").write_text("ref: refs/heads/release\n")
+    (worktree_git / "commondir").write_text("../..\n")
+    worktree = tmp_path / "wt"
+    worktree.mkdir()
+    (worktree / ".git").write_text(f"gitdir: {worktree_git}\n")
+
+    repository = git.find_repository(str(worktree))
+    assert repository.worktree == worktree.resolve()
+    assert repository.git_dir == worktree_git.resolve()
+    assert repository.common_dir == (repo / ".git").resolve()
+    assert repository.current_branch() == "release"
+    assert repository.remotes()["origin"].endswith("proj/repo.git")
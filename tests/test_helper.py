@@ -5,7 +5,13 @@ from unittest.mock import patch
 import pytest
 from typer import Exit
 
-from bb.utils.helper import error_handler, error_tip, validate_config, validate_input
+from bb.utils.helper import (
+    current_user,
+    error_handler,
+    error_tip,
+    validate_config,
+    validate_input,
+)
 
 
 def test_validate_input():
@@ -44,16 +50,16 @@ def test_validate_input():
         validate_input(["hello"], "Enter a string", "Invalid input")
 
 
-@patch("bb.utils.helper.request.get")
-@patch("bb.utils.helper.richprint.console.print")
+@patch("bb.utils.request.get")
+@patch("bb.utils.richprint.console.print")
 def test_validate_config_success(mock_print, mock_get):
     mock_get.return_value = [200, "OK"]
     validate_config()
     mock_print.assert_called_once_with("OK", style="bold green")
 
 
-@patch("bb.utils.helper.request.get")
-@patch("bb.utils.helper.richprint.live_progress")
+@patch("bb.utils.request.get")
+@patch("bb.utils.richprint.live_progress")
 def test_validate_config_non_200(mock_live, mock_get):
     mock_get.return_value = [404, "Not Found"]
     mock_live.return_value.__enter__ = mock_live
@@ -61,7 +67,7 @@ def test_validate_config_non_200(mock_live, mock_get):
     validate_config()
 
 
-@patch("bb.utils.helper.request.get")
+@patch("bb.utils.request.get")
 def test_validate_config_error(mock_get):
     mock_get.side_effect = Exception("API error")
     with pytest.raises(ValueError, match="API error"):
@@ -92,7 +98,7 @@ def test_validate_input_optional(mock_prompt):
 
 
 @patch("bb.utils.constants.common_vars.state", {"verbose": False})
-@patch("bb.utils.helper.richprint.console.print")
+@patch("bb.utils.richprint.console.print")
 @patch("bb.utils.helper.error_tip")
 def test_error_handler_value_error(mock_error_tip, mock_print):
     @error_handler
@@ -108,7 +114,7 @@ def test_error_handler_value_error(mock_error_tip, mock_print):
 
 
 @patch("bb.utils.constants.common_vars.state", {"verbose": False})
-@patch("bb.utils.helper.richprint.console.print")
+@patch("bb.utils.richprint.console.print")
 @patch("bb.utils.helper.error_tip")
 def test_error_handler_exception_non_verbose(mock_error_tip, mock_print):
     @error_handler
@@ -124,8 +130,8 @@ def test_error_handler_exception_non_verbose(mock_error_tip, mock_print):
 
 
 @patch("bb.utils.constants.common_vars.state", {"verbose": True})
-@patch("bb.utils.helper.richprint.console.print")
-@patch("bb.utils.helper.richprint.traceback_to_console")
+@patch("bb.utils.richprint.console.print")
+@patch("bb.utils.richprint.traceback_to_console")
 def test_error_handler_value_error_verbose(mock_traceback, mock_print):
     @error_handler
     def my_func():
@@ -149,8 +155,8 @@ def test_error_handler_success():
 
 
 @patch("bb.utils.constants.common_vars.state", {"verbose": True})
-@patch("bb.utils.helper.richprint.console.print")
-@patch("bb.utils.helper.richprint.traceback_to_console")
+@patch("bb.utils.richprint.console.print")
+@patch("bb.utils.richprint.traceback_to_console")
 def test_error_handler_verbose(mock_traceback, mock_print):
     @error_handler
     def my_func():
@@ -164,7 +170,28 @@ def test_error_handler_verbose(mock_traceback, mock_print):
     mock_traceback.assert_called_once()
 
 
-@patch("bb.utils.helper.richprint.console.print")
+@patch("bb.utils.richprint.console.print")
 def test_error_tip(mock_print):
     error_tip()
     mock_print.assert_called_once()
+
+
+@patch("bb.utils.ini.parse", return_value=["user", "token", "https://host"])
+@patch("bb.utils.cache.set_identity")
+@patch("bb.utils.cache.get_identity", return_value="cached")
+@patch("bb.utils.request.get")
+def test_current_user_cached(mock_get, mock_get_identity, mock_set_identity, _):
+    assert current_user() == "cached"
+    mock_get_identity.assert_called_once_with("https://host", "token")
+    mock_get.assert_not_called()
+    mock_set_identity.assert_not_called()
+
+
+@patch("bb.utils.ini.parse", return_value=["user", "token", "https://host"])
+@patch("bb.utils.cache.set_identity")
+@patch("bb.utils.cache.get_identity", return_value=None)
+@patch("bb.utils.request.get", return_value=[200, "jdoe"])
+def test_current_user_miss(mock_get, mock_get_identity, mock_set_identity, _):
+    assert current_user() == "jdoe"
+    mock_get.assert_called_once()
+    mock_set_identity.assert_called_once_with("https://host", "token", "jdoe")
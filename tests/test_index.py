@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import os
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from bb import _bb
+from bb.index.sync import forget, is_stale, sync_repository
+from bb.utils import cache, index
+from bb.utils.api import get_bitbucket_api
+
+HOST = "https://bitbucket.example.com"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path / "bb"))
+    return tmp_path / "bb"
+
+
+def make_pr(_id, updated, state="OPEN", author="jdoe", reviewer="asmith"):
+    return {
+        "id": _id,
+        "title": f"PR {_id}",
+        "state": state,
+        "updatedDate": updated,
+        "links": {"self": [{"href": f"{HOST}/pull-requests/{_id}"}]},
+        "fromRef": {"displayId": "feature", "repository": {"slug": "repo"}},
+        "toRef": {
+            "displayId": "master",
+            "repository": {"slug": "repo", "project": {"key": "PRJ"}},
+        },
+        "author": {"user": {"name": author, "slug": author}, "role": "AUTHOR"},
+        "reviewers": [
+            {
+                "user": {"name": reviewer, "slug": reviewer},
+                "role": "REVIEWER",
+                "status": "UNAPPROVED",
+            }
+        ],
+        "properties": {},
+    }
+
+
+def test_upsert_and_query():
+    conn = index.connect()
+    try:
+        assert index.upsert(conn, HOST, [make_pr(1, 10), make_pr(2, 20)]) == 2
+        index.upsert(conn, HOST, [make_pr(1, 30, state="MERGED")])
+
+        assert [p["id"] for p in index.query(conn, HOST)] == [2]
+        assert [p["id"] for p in index.query(conn, HOST, state="MERGED")] == [1]
+        assert index.query(conn, HOST, project="prj", repository="REPO")
+        assert index.query(conn, HOST, user="asmith", role="REVIEWER")
+        assert not index.query(conn, HOST, user="asmith", role="AUTHOR")
+        assert index.query(conn, HOST, user="jdoe", role="AUTHOR")
+        assert not index.query(conn, "https://other.example.com")
+    finally:
+        conn.close()
+
+
+def test_watermark_roundtrip():
+    conn = index.connect()
+    try:
+        assert index.watermark(conn, HOST, "PRJ", "repo") is None
+        index.set_watermark(conn, HOST + "/", "PRJ", "Repo", 42)
+        assert index.watermark(conn, HOST, "prj", "repo")["last_updated"] == 42
+    finally:
+        conn.close()
+
+
+@patch("bb.index.sync.request.get_pages")
+def test_sync_repository_is_incremental(mock_get_pages):
+    mock_get_pages.return_value = iter(
+        [{"values": [make_pr(3, 30), make_pr(2, 20)]}, {"values": [make_pr(1, 10)]}]
+    )
+    assert sync_repository("PRJ", "repo") == 3
+    assert not is_stale("PRJ", "repo")
+
+    # a second sync stops at the first page reaching the previous watermark
+    pages = [
+        {"values": [make_pr(4, 40), make_pr(3, 30)]},
+        {"values": [make_pr(2, 20)]},
+    ]
+    consumed = []
+
+    def walk(url, fresh=False):
+        # the sync must not move the watermark on top of cached pages
+        assert fresh
+        for page in pages:
+            consumed.append(page)
+            yield page
+
+    mock_get_pages.side_effect = walk
+    assert sync_repository("PRJ", "repo") == 2
+    assert len(consumed) == 1
+    assert "state=ALL" in mock_get_pages.call_args[0][0]
+
+    conn = index.connect()
+    try:
+        assert [
+            p["id"] for p in index.query(conn, get_bitbucket_api().bitbucket_host)
+        ] == [4, 3, 2, 1]
+        assert (
+            index.watermark(conn, get_bitbucket_api().bitbucket_host, "PRJ", "repo")[
+                "last_updated"
+            ]
+            == 40
+        )
+    finally:
+        conn.close()
+
+
+@patch("bb.index.sync.request.get_pages")
+def test_full_sync_removes_deleted_pull_requests(mock_get_pages):
+    mock_get_pages.return_value = iter(
+        [{"values": [make_pr(3, 30), make_pr(2, 20), make_pr(1, 10)]}]
+    )
+    sync_repository("PRJ", "repo")
+
+    # pull request 2 was deleted on the server
+    mock_get_pages.return_value = iter([{"values": [make_pr(3, 30), make_pr(1, 10)]}])
+    assert sync_repository("prj", "REPO", full=True) == 2
+
+    host = get_bitbucket_api().bitbucket_host
+    conn = index.connect()
+    try:
+        assert [p["id"] for p in index.query(conn, host)] == [3, 1]
+        assert [p["id"] for p in index.search(conn, host, "PR")] == [3, 1]
+        assert not conn.execute("SELECT 1 FROM participants WHERE pr_id = 2").fetchone()
+    finally:
+        conn.close()
+
+
+def test_forget_removes_deleted_pull_requests():
+    host = get_bitbucket_api().bitbucket_host
+    conn = index.connect()
+    try:
+        with conn:
+            index.upsert(conn, host, [make_pr(2, 20), make_pr(1, 10)])
+    finally:
+        conn.close()
+
+    forget("PRJ", "repo", ["2"])
+
+    conn = index.connect()
+    try:
+        assert [p["id"] for p in index.query(conn, host)] == [1]
+    finally:
+        conn.close()
+
+
+def test_forget_without_index(cache_dir):
+    forget("PRJ", "repo", ["1"])
+    assert not os.path.exists(index.index_path())
+
+
+def test_is_stale_without_sync():
+    assert is_stale("PRJ", "repo")
+
+
+@patch("bb.index.sync.sync_repository", return_value=5)
+@patch("bb.utils.cmnd.base_repo", return_value=["PRJ", "repo"])
+@patch("bb.utils.cmnd.is_git_repo", return_value=True)
+def test_index_sync_command(mock_is_git, mock_base_repo, mock_sync):
+    result = CliRunner().invoke(_bb, ["index", "sync", "--full"])
+    assert result.exit_code == 0
+    mock_sync.assert_called_once_with("PRJ", "repo", True)
+    assert "5 pull request(s) indexed" in result.stdout
+
+
+@patch("bb.index.sync.sync_repository", return_value=0)
+@patch("bb.utils.cmnd.is_git_repo")
+def test_index_sync_command_explicit_repo(mock_is_git, mock_sync):
+    result = CliRunner().invoke(
+        _bb, ["index", "sync", "--project", "OTHER", "--repo", "thing"]
+    )
+    assert result.exit_code == 0
+    mock_is_git.assert_not_called()
+    mock_sync.assert_called_once_with("OTHER", "thing", False)
+
+
+@patch("bb.index.sync.sync_repository", return_value=0)
+@patch("bb.utils.cmnd.base_repo", return_value=["PRJ", "repo"])
+@patch("bb.utils.cmnd.is_git_repo", return_value=True)
+def test_index_sync_command_partial_repo(mock_is_git, mock_base_repo, mock_sync):
+    runner = CliRunner()
+    assert runner.invoke(_bb, ["index", "sync", "--project", "OTHER"]).exit_code == 0
+    assert runner.invoke(_bb, ["index", "sync", "--repo", "thing"]).exit_code == 0
+    assert [c.args for c in mock_sync.call_args_list] == [
+        ("OTHER", "repo", False),
+        ("PRJ", "thing", False),
+    ]
+
+
+def test_match_expression():
+    assert index.match_expression('fix "login" bug') == '"fix"* """login"""* "bug"*'
+    assert index.match_expression("   ") == ""
+
+
+def test_search_ranks_and_filters():
+    docs = make_pr(2, 20)
+    docs["title"] = "Refactor login handler"
+    docs["description"] = "fixes the session timeout"
+    other = make_pr(3, 30, state="MERGED")
+    other["title"] = "Bump dependencies"
+    other["description"] = "login page unaffected"
+    conn = index.connect()
+    try:
+        index.upsert(conn, HOST, [make_pr(1, 10), docs, other])
+        assert [p["id"] for p in index.search(conn, HOST, "login")] == [2, 3]
+        assert [p["id"] for p in index.search(conn, HOST, "log sess")] == [2]
+        assert [p["id"] for p in index.search(conn, HOST, "login", state="MERGED")] == [
+            3
+        ]
+        assert sorted(p["id"] for p in index.search(conn, HOST, "jdo")) == [1, 2, 3]
+        assert index.search(conn, HOST, "login", repository="elsewhere") == []
+        assert index.search(conn, HOST, 'AND OR "(') == []
+
+        # re-indexing a pull request replaces its search entry
+        docs["title"] = "Rename handler"
+        index.upsert(conn, HOST, [docs])
+        assert [p["id"] for p in index.search(conn, HOST, "refactor")] == []
+    finally:
+        conn.close()
+
+
+def test_search_rows_follow_pull_requests():
+    conn = index.connect()
+    try:
+        with conn:
+            index.upsert(conn, HOST, [make_pr(1, 10), make_pr(2, 20)])
+            index.upsert(conn, HOST, [make_pr(1, 30)])
+            index.remove(conn, HOST, "PRJ", "repo", [2])
+        search_rows = conn.execute("SELECT rowid FROM pull_requests_fts").fetchall()
+        pr_rows = conn.execute("SELECT rowid FROM pull_requests").fetchall()
+        assert [tuple(row) for row in search_rows] == [tuple(row) for row in pr_rows]
+        assert [p["id"] for p in index.search(conn, HOST, "PR")] == [1]
+    finally:
+        conn.close()
@@ -72,7 +72,9 @@ def test_auth_setup():
         ini_module.BB_CONFIG_FILE = test_config_file
         ini_module.XDG_CONFIG_HOME = os.path.join(tmpdir, "bb")
         try:
-            auth_setup("https://bitbucket.example.com", "testuser", "testtoken")
+            with patch("bb.utils.cache.clear_identities") as mock_clear:
+                auth_setup("https://bitbucket.example.com", "testuser", "testtoken")
+            mock_clear.assert_called_once()
             assert os.path.isfile(test_config_file)
             with open(test_config_file) as f:
                 content = f.read()
@@ -87,8 +89,54 @@ def test_auth_setup():
             importlib.reload(api_module)
 
 
+def test_auth_setup_switches_host(tmp_path, monkeypatch):
+    import bb.utils.ini as ini_module
+    from bb.utils.api import get_bitbucket_api
+
+    monkeypatch.setattr(ini_module, "XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.setattr(ini_module, "BB_CONFIG_FILE", str(tmp_path / "config.ini"))
+    get_bitbucket_api.cache_clear()
+    try:
+        with patch("bb.utils.cache.clear_identities"):
+            auth_setup("https://old.example.com", "user", "token")
+            assert get_bitbucket_api().bitbucket_host == "https://old.example.com"
+
+            # e.g. `auth setup` run from `bb shell`, within the same second
+            auth_setup("https://new.example.com", "user", "token")
+            assert get_bitbucket_api().bitbucket_host == "https://new.example.com"
+    finally:
+        ini_module.clear_cache()
+
+
 def test_clear_cache():
     from bb.utils.ini import clear_cache
 
     clear_cache()
     clear_cache()
+
+
+def test_get_setting(tmp_path, monkeypatch):
+    import bb.utils.ini as ini_module
+
+    config_file = tmp_path / "config.ini"
+    config_file.write_text(
+        "[cache]\nenabled = yes\nttl = 2.5\nmax_size = 8\nname = bb\n"
+    )
+    monkeypatch.setattr(ini_module, "BB_CONFIG_FILE", str(config_file))
+
+    assert ini_module.get_setting("cache", "enabled", False) is True
+    assert ini_module.get_setting("cache", "ttl", 0.0) == 2.5
+    assert ini_module.get_setting("cache", "max_size", 64) == 8
+    assert ini_module.get_setting("cache", "name", "") == "bb"
+    assert ini_module.get_setting("retry", "attempts", 3) == 3
+
+
+def test_get_setting_invalid(tmp_path, monkeypatch):
+    import bb.utils.ini as ini_module
+
+    config_file = tmp_path / "config.ini"
+    config_file.write_text("[cache]\nmax_size = lots\n")
+    monkeypatch.setattr(ini_module, "BB_CONFIG_FILE", str(config_file))
+
+    with pytest.raises(ValueError):
+        ini_module.get_setting("cache", "max_size", 64)
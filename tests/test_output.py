@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import csv
+import io
+import json
+
+import pytest
+
+from bb.utils import output
+from bb.utils.api import PullRequest
+
+PR = PullRequest.from_json(
+    {
+        "id": 7,
+        "title": "Title",
+        "description": "Line 1, with comma",
+        "state": "OPEN",
+        "version": 2,
+        "links": {"self": [{"href": "http://example.com/7"}]},
+        "fromRef": {"displayId": "src"},
+        "toRef": {
+            "displayId": "dst",
+            "repository": {"slug": "repo", "project": {"key": "PRJ"}},
+        },
+        "author": {"user": {"name": "jdoe", "displayName": "J Doe"}},
+        "reviewers": [{"user": {"name": "asmith"}, "status": "APPROVED"}],
+        "properties": {"mergeResult": {"outcome": "CONFLICTED"}},
+    }
+)
+
+
+def test_writer_for_rich_is_none():
+    assert output.writer(output.Output.RICH) is None
+    assert isinstance(output.writer(output.Output.CSV), output.RecordWriter)
+
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_json_array_is_valid(count):
+    stream = io.StringIO()
+    with output.RecordWriter(output.Output.JSON, stream) as writer:
+        for i in range(count):
+            writer.write({"id": i})
+    assert json.loads(stream.getvalue()) == [{"id": i} for i in range(count)]
+
+
+def test_ndjson_streams_one_record_per_line():
+    stream = io.StringIO()
+    with output.RecordWriter(output.Output.NDJSON, stream) as writer:
+        writer.write({"id": 1})
+        assert stream.getvalue() == '{"id": 1}\n'
+        writer.write({"id": 2})
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {"id": 1},
+        {"id": 2},
+    ]
+
+
+def test_csv_encodes_nested_values():
+    stream = io.StringIO()
+    with output.RecordWriter(output.Output.CSV, stream) as writer:
+        writer.write(output.pull_request_record(PR))
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert rows[0]["id"] == "7"
+    assert rows[0]["description"] == "Line 1, with comma"
+    assert json.loads(rows[0]["author"])["name"] == "jdoe"
+
+
+def test_pull_request_record():
+    record = output.pull_request_record(PR)
+    assert record["project"] == "PRJ"
+    assert record["repository"] == "repo"
+    assert record["from_branch"] == "src"
+    assert record["merge_outcome"] == "CONFLICTED"
+    assert record["reviewers"] == [
+        {"name": "asmith", "display_name": None, "email": None, "status": "APPROVED"}
+    ]
+    assert record["url"] == "http://example.com/7"
+
+
+def test_json_not_closed_on_error():
+    stream = io.StringIO()
+    with pytest.raises(ValueError):
+        with output.RecordWriter(output.Output.JSON, stream):
+            raise ValueError("boom")
+    assert stream.getvalue() == ""
+
+
+def test_diagnostics_go_to_stderr_with_records(capsys):
+    import httpx
+    from typer import Exit
+
+    from bb.utils import request, richprint
+    from bb.utils.helper import error_handler
+
+    @error_handler
+    def command():
+        with output.writer(output.Output.JSON):
+            request._get_result(httpx.Response(404))
+
+    with pytest.raises(Exit):
+        command()
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Status code: 404" in captured.err
+    assert "[404] Not Found" in captured.err
+    assert "--verbose" in captured.err
+    # the next command reports on the console again
+    assert richprint.diagnostic_console() is richprint.console
@@ -24,6 +24,7 @@ from unittest.mock import patch
 from typer.testing import CliRunner
 
 from bb.pr import _pr
+from bb.utils.output import Output
 
 runner = CliRunner()
 
@@ -32,8 +33,8 @@ runner = CliRunner()
     "bb.utils.helper.prompt",
     side_effect=lambda text, default="", show_default=True: default,
 )
-@patch("bb.pr.create_pull_request")
-@patch("bb.pr.is_git_repo", return_value=True)
+@patch("bb.pr.create.create_pull_request")
+@patch("bb.utils.cmnd.is_git_repo", return_value=True)
 @patch("bb.utils.cmnd.title_and_description", return_value=["Test Title", "Test Desc"])
 def test_create(mock_title_desc, mock_is_git, mock_create_pr, mock_prompt):
     result = runner.invoke(_pr, ["create", "--target", "main", "--yes"])
@@ -48,7 +49,7 @@ def test_create(mock_title_desc, mock_is_git, mock_create_pr, mock_prompt):
 
 
 @patch("bb.utils.helper.prompt", return_value="1")
-@patch("bb.pr.delete_pull_request")
+@patch("bb.pr.delete.delete_pull_request")
 @patch("bb.utils.cmnd.is_git_repo", return_value=True)
 def test_delete(mock_is_git, mock_delete_pr, mock_prompt):
     result = runner.invoke(_pr, ["delete", "--id", "1", "--yes"])
@@ -57,7 +58,7 @@ def test_delete(mock_is_git, mock_delete_pr, mock_prompt):
 
 
 @patch("bb.utils.helper.prompt", return_value="1")
-@patch("bb.pr.copy_pull_request")
+@patch("bb.pr.copy.copy_pull_request")
 @patch("bb.utils.cmnd.is_git_repo", return_value=True)
 def test_copy(mock_is_git, mock_copy_pr, mock_prompt):
     result = runner.invoke(_pr, ["copy", "--id", "1"])
@@ -66,24 +67,62 @@ def test_copy(mock_is_git, mock_copy_pr, mock_prompt):
 
 
 @patch("bb.utils.helper.prompt", return_value="1")
-@patch("bb.pr.show_diff")
+@patch("bb.pr.diff.show_diff")
 @patch("bb.utils.cmnd.is_git_repo", return_value=True)
 def test_diff(mock_is_git, mock_show_diff, mock_prompt):
     result = runner.invoke(_pr, ["diff", "--id", "1"])
     assert result.exit_code == 0
-    mock_show_diff.assert_called_once_with("1")
+    mock_show_diff.assert_called_once_with("1", Output.RICH)
 
 
-@patch("bb.pr.list_pull_request")
+@patch("bb.pr.list.list_pull_request")
 @patch("bb.utils.cmnd.is_git_repo", return_value=True)
 def test_list(mock_is_git, mock_list_pr):
     result = runner.invoke(_pr, ["list"])
     assert result.exit_code == 0
-    mock_list_pr.assert_called_once_with("current", False)
+    mock_list_pr.assert_called_once_with(
+        "current", False, False, False, output_format=Output.RICH
+    )
+
+
+@patch("bb.pr.list.list_pull_request")
+@patch("bb.utils.cmnd.is_git_repo", return_value=True)
+def test_list_output(mock_is_git, mock_list_pr):
+    result = runner.invoke(_pr, ["list", "--output", "ndjson"])
+    assert result.exit_code == 0
+    assert mock_list_pr.call_args.kwargs["output_format"] == Output.NDJSON
+
+
+@patch("bb.pr.list.list_pull_request")
+@patch("bb.utils.cmnd.is_git_repo", return_value=False)
+def test_list_project(mock_is_git, mock_list_pr):
+    result = runner.invoke(_pr, ["list", "--project", "PRJ", "--repos", "a, b"])
+    assert result.exit_code == 0
+    mock_list_pr.assert_called_once_with(
+        "current", False, project="PRJ", repos=["a", "b"], output_format=Output.RICH
+    )
+
+
+@patch("bb.pr.list.list_pull_request")
+@patch("bb.utils.cmnd.is_git_repo", return_value=True)
+def test_list_project_rejects_index(mock_is_git, mock_list_pr):
+    for flag in ("--offline", "--cached"):
+        result = runner.invoke(_pr, ["list", "--repos", "a", flag])
+        assert result.exit_code == 1
+        assert "cannot be combined" in result.stdout
+    mock_list_pr.assert_not_called()
+
+
+@patch("bb.pr.search.search_pull_request")
+@patch("bb.utils.cmnd.is_git_repo", return_value=True)
+def test_search(mock_is_git, mock_search_pr):
+    result = runner.invoke(_pr, ["search", "login bug", "--all", "--offline"])
+    assert result.exit_code == 0
+    mock_search_pr.assert_called_once_with("login bug", True, "ALL", 20, True)
 
 
 @patch("bb.utils.helper.prompt", return_value="1")
-@patch("bb.pr.merge_pull_request")
+@patch("bb.pr.merge.merge_pull_request")
 @patch("bb.utils.cmnd.is_git_repo", return_value=True)
 def test_merge(mock_is_git, mock_merge_pr, mock_prompt):
     result = runner.invoke(_pr, ["merge", "--id", "1", "--yes"])
@@ -92,66 +131,66 @@ def test_merge(mock_is_git, mock_merge_pr, mock_prompt):
 
 
 @patch("bb.utils.helper.prompt", side_effect=["1", "approve"])
-@patch("bb.pr.review_pull_request")
+@patch("bb.pr.review.review_pull_request")
 @patch("bb.utils.cmnd.is_git_repo", return_value=True)
 def test_review(mock_is_git, mock_review_pr, mock_prompt):
     result = runner.invoke(_pr, ["review", "--id", "1", "--action", "approve"])
     assert result.exit_code == 0
-    mock_review_pr.assert_called_once_with("1", "approve")
+    mock_review_pr.assert_called_once_with(["1"], "approve", False)
 
 
 @patch("bb.utils.helper.prompt", return_value="1")
-@patch("bb.pr.view_pull_request")
+@patch("bb.pr.view.view_pull_request")
 @patch("bb.utils.cmnd.is_git_repo", return_value=True)
 def test_view(mock_is_git, mock_view_pr, mock_prompt):
     result = runner.invoke(_pr, ["view", "--id", "1"])
     assert result.exit_code == 0
-    mock_view_pr.assert_called_once_with("1", False)
+    mock_view_pr.assert_called_once_with("1", False, Output.RICH)
 
 
 def test_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["list"])
         assert result.exit_code == 1
 
 
 def test_create_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["create", "--target", "main"])
         assert result.exit_code == 1
 
 
 def test_delete_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["delete", "--id", "1"])
         assert result.exit_code == 1
 
 
 def test_review_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["review", "--id", "1", "--action", "approve"])
         assert result.exit_code == 1
 
 
 def test_merge_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["merge", "--id", "1"])
         assert result.exit_code == 1
 
 
 def test_diff_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["diff", "--id", "1"])
         assert result.exit_code == 1
 
 
 def test_view_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["view", "--id", "1"])
         assert result.exit_code == 1
 
 
 def test_copy_not_git_repo():
-    with patch("bb.pr.is_git_repo", return_value=False):
+    with patch("bb.utils.cmnd.is_git_repo", return_value=False):
         result = runner.invoke(_pr, ["copy", "--id", "1"])
         assert result.exit_code == 1
@@ -3,16 +3,19 @@ from unittest.mock import patch
 
 import pytest
 
-from bb.pr.create import create_pull_request, gather_facts
+from bb.pr.create import create_pull_request, gather_facts, resolve_repo_id
+from bb.utils import request
 
 
+@patch("bb.pr.create.cache.set_repo_id")
+@patch("bb.pr.create.cache.get_repo_id", return_value=None)
 @patch("bb.pr.create.request.get")
 @patch("bb.pr.create.richprint.table")
 @patch("bb.pr.create.richprint.console.print")
-def test_gather_facts(mock_print, mock_table, mock_get):
+def test_gather_facts(mock_print, mock_table, mock_get, mock_get_id, mock_set_id):
     # Mocking requests
     mock_get.side_effect = [
-        [200, {"values": [{"name": "repo_name", "id": 123}]}],
+        [200, {"name": "repo_name", "id": 123}],
         [200, [{"name": "Reviewer 1"}, {"name": "Reviewer 2"}]],
     ]
 
@@ -128,13 +131,15 @@ def test_create_pull_request_same_branch(mock_from_branch):
         create_pull_request("main", True, False, False, "Title", "Desc")
 
 
+@patch("bb.pr.create.cache.set_repo_id")
+@patch("bb.pr.create.cache.get_repo_id", return_value=None)
 @patch("bb.pr.create.request.get")
 @patch("bb.pr.create.richprint.table")
 @patch("bb.pr.create.richprint.console.print")
-def test_gather_facts_no_repo(mock_print, mock_table, mock_get):
-    mock_get.side_effect = [
-        [200, {"values": []}],
-    ]
+def test_gather_facts_no_repo(
+    mock_print, mock_table, mock_get, mock_get_id, mock_set_id
+):
+    mock_get.side_effect = request.StatusError(404)
 
     reviewers = gather_facts(
         "target_branch",
@@ -147,3 +152,38 @@ def test_gather_facts_no_repo(mock_print, mock_table, mock_get):
 
     assert reviewers == []
     mock_table.assert_called_once()
+
+
+@patch("bb.pr.create.cache.set_repo_id")
+@patch("bb.pr.create.cache.get_repo_id", return_value=None)
+@patch("bb.pr.create.request.get", return_value=[200, {"id": 123}])
+def test_resolve_repo_id_caches_lookup(mock_get, mock_get_id, mock_set_id):
+    assert resolve_repo_id("project", "repo_name") == 123
+    assert mock_get.call_args.args[0].endswith(
+        "/rest/api/latest/projects/project/repos/repo_name"
+    )
+    mock_set_id.assert_called_once()
+    assert mock_set_id.call_args.args[1:] == ("project", "repo_name", 123)
+
+
+@patch("bb.pr.create.cache.get_repo_id", return_value=123)
+@patch("bb.pr.create.request.get")
+def test_resolve_repo_id_cache_hit(mock_get, mock_get_id):
+    assert resolve_repo_id("project", "repo_name") == 123
+    mock_get.assert_not_called()
+
+
+@patch("bb.pr.create.cache.get_repo_id", return_value=None)
+@patch("bb.pr.create.request.get", side_effect=request.StatusError(404))
+def test_resolve_repo_id_not_found(mock_get, mock_get_id):
+    assert resolve_repo_id("project", "repo_name") is None
+
+
+@pytest.mark.parametrize("status_code", [401, 403, 503])
+@patch("bb.pr.create.cache.get_repo_id", return_value=None)
+def test_resolve_repo_id_failure_propagates(mock_get_id, status_code):
+    with patch(
+        "bb.pr.create.request.get", side_effect=request.StatusError(status_code)
+    ):
+        with pytest.raises(ValueError, match=str(status_code)):
+            resolve_repo_id("project", "repo_name")
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import asyncio
 from unittest.mock import patch
 
 import pytest
@@ -9,7 +10,7 @@ from bb.pr.delete import delete_pull_request
 @patch("bb.pr.delete.show_diff")
 @patch("bb.pr.delete.cmnd.base_repo", return_value=("project", "repo_name"))
 @patch(
-    "bb.pr.delete.request.get",
+    "bb.pr.delete.request.async_get",
     return_value=[
         200,
         {
@@ -23,25 +24,32 @@ from bb.pr.delete import delete_pull_request
         },
     ],
 )
-@patch("bb.pr.delete.request.delete", return_value=204)
+@patch("bb.pr.delete.request.async_delete", return_value=204)
 @patch("bb.pr.delete.confirm", return_value=True)
 @patch("bb.pr.delete.richprint.console.print")
+@patch("bb.pr.delete.forget")
 def test_delete_pull_request(
-    mock_print, mock_confirm, mock_delete, mock_get, mock_base_repo, mock_show_diff
+    mock_forget,
+    mock_print,
+    mock_confirm,
+    mock_delete,
+    mock_get,
+    mock_base_repo,
+    mock_show_diff,
 ):
     delete_pull_request(["1", "2"], True, False)
 
-    # 2 requests per ID (one for get version, one for delete) -> 2 ids * 2 = 4
-    # Wait, GET is 1 per ID. Delete is 1 per ID.
     assert mock_get.call_count == 2
+    assert all(call.kwargs == {"fresh": True} for call in mock_get.call_args_list)
     assert mock_delete.call_count == 2
     mock_print.assert_called()
+    mock_forget.assert_called_once_with("project", "repo_name", ["1", "2"])
 
 
 @patch("bb.pr.delete.show_diff")
 @patch("bb.pr.delete.cmnd.base_repo", return_value=("project", "repo_name"))
 @patch(
-    "bb.pr.delete.request.get",
+    "bb.pr.delete.request.async_get",
     return_value=[
         200,
         {
@@ -55,13 +63,13 @@ def test_delete_pull_request(
         },
     ],
 )
-@patch("bb.pr.delete.request.delete", return_value=409)
+@patch("bb.pr.delete.request.async_delete", side_effect=ValueError("Response<409>"))
 @patch("bb.pr.delete.confirm", return_value=True)
 @patch("bb.pr.delete.richprint.console.print")
 def test_delete_pull_request_error(
     mock_print, mock_confirm, mock_delete, mock_get, mock_base_repo, mock_show_diff
 ):
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError, match="Cannot delete pull request"):
         delete_pull_request(["1"], True, False)
 
     assert mock_get.call_count == 1
@@ -72,7 +80,7 @@ def test_delete_pull_request_error(
 @patch("bb.pr.delete.show_diff")
 @patch("bb.pr.delete.cmnd.base_repo", return_value=("project", "repo_name"))
 @patch(
-    "bb.pr.delete.request.get",
+    "bb.pr.delete.request.async_get",
     return_value=[
         200,
         {
@@ -86,7 +94,7 @@ def test_delete_pull_request_error(
         },
     ],
 )
-@patch("bb.pr.delete.request.delete", return_value=204)
+@patch("bb.pr.delete.request.async_delete", return_value=204)
 @patch("bb.pr.delete.confirm", return_value=False)
 @patch("bb.pr.delete.richprint.console.print")
 def test_delete_pull_request_no_confirm(
@@ -102,7 +110,7 @@ def test_delete_pull_request_no_confirm(
 @patch("bb.pr.delete.show_diff")
 @patch("bb.pr.delete.cmnd.base_repo", return_value=("project", "repo_name"))
 @patch(
-    "bb.pr.delete.request.get",
+    "bb.pr.delete.request.async_get",
     return_value=[
         200,
         {
@@ -116,7 +124,7 @@ def test_delete_pull_request_no_confirm(
         },
     ],
 )
-@patch("bb.pr.delete.request.delete", return_value=204)
+@patch("bb.pr.delete.request.async_delete", return_value=204)
 @patch("bb.pr.delete.confirm", return_value=True)
 @patch("bb.pr.delete.richprint.console.print")
 def test_delete_pull_request_with_diff(
@@ -127,3 +135,73 @@ def test_delete_pull_request_with_diff(
     assert mock_get.call_count == 1
     assert mock_delete.call_count == 1
     mock_show_diff.assert_called_once()
+
+
+def _info(_no):
+    return {
+        "id": int(_no),
+        "state": "OPEN",
+        "title": f"Title {_no}",
+        "fromRef": {"displayId": "src"},
+        "toRef": {"displayId": "dst"},
+        "version": 3,
+        "links": {"self": [{"href": "url"}]},
+    }
+
+
+@patch("bb.pr.delete.cmnd.base_repo", return_value=("project", "repo_name"))
+@patch("bb.pr.delete.confirm")
+@patch("bb.pr.delete.richprint.console.print")
+def test_delete_pull_request_bulk_is_concurrent(mock_print, mock_confirm, _):
+    in_flight = {"get": 0, "delete": 0}
+    peak = {"get": 0, "delete": 0}
+
+    async def track(kind, value):
+        in_flight[kind] += 1
+        peak[kind] = max(peak[kind], in_flight[kind])
+        await asyncio.sleep(0.01)
+        in_flight[kind] -= 1
+        return value
+
+    async def fake_get(url, fresh=False):
+        assert fresh
+        return await track("get", [200, _info(url.rsplit("/", 1)[-1])])
+
+    async def fake_delete(url, body):
+        assert body == {"version": 3}
+        return await track("delete", 204)
+
+    with (
+        patch("bb.pr.delete.request.async_get", side_effect=fake_get),
+        patch(
+            "bb.pr.delete.request.async_delete", side_effect=fake_delete
+        ) as mock_delete,
+    ):
+        delete_pull_request([str(i) for i in range(1, 21)], True, False)
+
+    assert mock_delete.call_count == 20
+    assert peak["get"] > 1 and peak["delete"] > 1
+    mock_confirm.assert_not_called()
+    # one aggregated summary table instead of a table per pull request
+    assert mock_print.call_count == 1
+
+
+@patch("bb.pr.delete.cmnd.base_repo", return_value=("project", "repo_name"))
+@patch("bb.pr.delete.richprint.console.print")
+def test_delete_pull_request_bulk_reports_failures(mock_print, _):
+    async def fake_get(url, fresh=False):
+        _no = url.rsplit("/", 1)[-1]
+        if _no == "2":
+            raise ValueError("Pull request not found")
+        return [200, _info(_no)]
+
+    with (
+        patch("bb.pr.delete.request.async_get", side_effect=fake_get),
+        patch("bb.pr.delete.request.async_delete", return_value=204) as mock_delete,
+    ):
+        with pytest.raises(ValueError, match="Cannot delete pull request\\(s\\): 2"):
+            delete_pull_request(["1", " 2", "3"], True, False)
+
+    assert mock_delete.call_count == 2
+    summary = mock_print.call_args[0][0]
+    assert summary.row_count == 3
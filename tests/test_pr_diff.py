@@ -37,3 +37,43 @@ def test_show_diff(
     assert mock_get.call_count == 2
     mock_print.assert_called()
     mock_table.assert_called()
+
+
+@patch("bb.pr.diff.cmnd.base_repo", return_value=("project", "repo_name"))
+@patch("bb.pr.diff.request.get")
+@patch("bb.pr.diff.cmnd.show_git_diff")
+@patch("bb.pr.diff.richprint")
+def test_show_diff_csv(mock_richprint, mock_show_git_diff, mock_get, _, capsys):
+    import csv
+    import io
+
+    from bb.utils.output import Output
+
+    mock_get.return_value = [
+        200,
+        {
+            "fromHash": "abc",
+            "toHash": "def",
+            "isLastPage": True,
+            "values": [
+                {"path": {"toString": "new.txt"}, "type": "ADD"},
+                {
+                    "path": {"toString": "b.txt"},
+                    "srcPath": {"toString": "a.txt"},
+                    "type": "MOVE",
+                },
+            ],
+        },
+    ]
+
+    show_diff("1", Output.CSV)
+
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [(row["path"], row["type"]) for row in rows] == [
+        ("new.txt", "ADD"),
+        ("b.txt", "MOVE"),
+    ]
+    assert rows[1]["src_path"] == "a.txt"
+    mock_get.assert_called_once()
+    mock_show_git_diff.assert_not_called()
+    assert mock_richprint.mock_calls == []
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from unittest.mock import patch
 
+import pytest
+
 from bb.pr.list import list_pull_request
 
 
@@ -136,3 +138,213 @@ def test_list_pull_request_with_reviewers(mock_base_repo, mock_get):
     list_pull_request("current", False)
 
     mock_get.assert_called_once()
+
+
+@pytest.fixture
+def indexed(tmp_path, monkeypatch):
+    from bb.utils import cache, index
+    from bb.utils.api import get_bitbucket_api
+
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path / "bb"))
+    host = get_bitbucket_api().bitbucket_host
+    _pr = {
+        "id": 7,
+        "title": "Indexed PR",
+        "links": {"self": [{"href": "http://example.com/7"}]},
+        "state": "OPEN",
+        "updatedDate": 100,
+        "fromRef": {"repository": {"slug": "repo_name"}, "displayId": "src"},
+        "toRef": {
+            "displayId": "dst",
+            "repository": {"slug": "repo_name", "project": {"key": "project"}},
+        },
+        "author": {"user": {"name": "jdoe", "displayName": "User"}},
+        "reviewers": [],
+        "properties": {},
+    }
+    conn = index.connect()
+    with conn:
+        index.upsert(conn, host, [_pr])
+        index.set_watermark(conn, host, "project", "repo_name", 100)
+    conn.close()
+
+
+@patch("bb.pr.list.to_richprint")
+@patch("bb.pr.list.request.get_pages")
+@patch("bb.pr.list.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_list_pull_request_offline(
+    mock_base_repo, mock_get_pages, mock_render, indexed
+):
+    list_pull_request("current", False, offline=True)
+
+    mock_get_pages.assert_not_called()
+    repo_name, pr_repo_dict = mock_render.call_args[0]
+    assert repo_name == "repo_name"
+    assert list(pr_repo_dict["OPEN"]) == ["7"]
+
+
+@patch("bb.pr.list.to_richprint")
+@patch("bb.pr.list.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_list_pull_request_offline_by_author(mock_base_repo, mock_render, indexed):
+    with patch("bb.utils.cache.get_identity", return_value="jdoe"):
+        list_pull_request("author", True, offline=True)
+    mock_render.assert_called_once()
+
+    mock_render.reset_mock()
+    with patch("bb.utils.cache.get_identity", return_value="someone-else"):
+        list_pull_request("reviewer", True, offline=True)
+    mock_render.assert_not_called()
+
+
+@patch("bb.pr.list.cmnd.base_repo", return_value=("project", "other_repo"))
+def test_list_pull_request_offline_not_indexed(mock_base_repo, indexed):
+    with pytest.raises(ValueError, match="run 'bb index sync'"):
+        list_pull_request("current", False, offline=True)
+
+
+@patch("bb.index.sync.sync_repository")
+@patch("bb.index.sync.is_stale", return_value=True)
+@patch("bb.pr.list.to_richprint")
+@patch("bb.pr.list.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_list_pull_request_cached_syncs_when_stale(
+    mock_base_repo, mock_render, mock_stale, mock_sync, indexed
+):
+    list_pull_request("current", False, cached=True)
+    mock_sync.assert_called_once_with("project", "repo_name")
+    mock_render.assert_called_once()
+
+
+def _repo_pr(slug, _id, target=None):
+    return {
+        "id": _id,
+        "title": f"PR {_id}",
+        "links": {"self": [{"href": f"http://example.com/{slug}/{_id}"}]},
+        "state": "OPEN",
+        "fromRef": {"repository": {"slug": slug}, "displayId": "src"},
+        "toRef": {"repository": {"slug": target or slug}, "displayId": "dst"},
+        "author": {"user": {"displayName": "User"}},
+        "reviewers": [],
+        "properties": {},
+    }
+
+
+@patch("bb.pr.list.to_richprint")
+@patch("bb.pr.list.request.get_paged")
+def test_list_repositories_pull_request(mock_get_paged, mock_render):
+    import asyncio
+
+    mock_get_paged.return_value = iter([{"slug": "a"}, {"slug": "b"}, {"slug": "c"}])
+    delays = {"a": 0.03, "b": 0.0, "c": 0.01}
+
+    async def fake_pages(url):
+        slug = url.split("/repos/")[1].split("/")[0]
+        await asyncio.sleep(delays[slug])
+        if slug == "c":
+            return
+        yield {"values": [_repo_pr(slug, 1)], "isLastPage": True}
+
+    with patch("bb.pr.list.request.async_get_pages", side_effect=fake_pages):
+        list_pull_request("current", False, project="PRJ")
+
+    # rendered as each repository completes, not in listing order
+    assert [call[0][0] for call in mock_render.call_args_list] == ["b", "a"]
+
+
+@patch("bb.pr.list.to_richprint")
+@patch("bb.pr.list.request.get_paged")
+@patch("bb.pr.list.cmnd.base_repo", return_value=("PRJ", "repo_name"))
+def test_list_repositories_pull_request_failure(
+    mock_base_repo, mock_get_paged, mock_render
+):
+    async def fake_pages(url):
+        if "/repos/bad/" in url:
+            raise ValueError("[404] Not Found")
+        yield {"values": [_repo_pr("good", 1)], "isLastPage": True}
+
+    with patch("bb.pr.list.request.async_get_pages", side_effect=fake_pages):
+        with pytest.raises(ValueError, match="repository\\(s\\): bad"):
+            list_pull_request("current", False, repos=["good", "bad"])
+
+    mock_get_paged.assert_not_called()
+    mock_render.assert_called_once()
+
+
+@patch("bb.pr.list.richprint")
+@patch("bb.pr.list.request.get_pages")
+@patch("bb.pr.list.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_list_pull_request_ndjson(
+    mock_base_repo, mock_get_pages, mock_richprint, capsys
+):
+    import json
+
+    from bb.utils.output import Output
+
+    mock_get_pages.return_value = iter(
+        [
+            {"values": [_repo_pr("repo_name", 1)], "isLastPage": False},
+            {"values": [_repo_pr("repo_name", 2)], "isLastPage": True},
+        ]
+    )
+
+    list_pull_request("current", False, output_format=Output.NDJSON)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["id"] for record in records] == [1, 2]
+    # machine-readable output never goes through rich
+    assert mock_richprint.mock_calls == []
+
+
+@patch("bb.pr.list.richprint")
+@patch("bb.pr.list.request.get_pages")
+@patch("bb.pr.list.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_list_pull_request_json_keeps_forks(
+    mock_base_repo, mock_get_pages, mock_richprint, capsys
+):
+    import json
+
+    from bb.utils.output import Output
+
+    mock_get_pages.return_value = iter(
+        [
+            {
+                "values": [
+                    _repo_pr("fork", 1, target="repo_name"),
+                    _repo_pr("repo_name", 2, target="elsewhere"),
+                ],
+                "isLastPage": True,
+            }
+        ]
+    )
+
+    list_pull_request("author", False, output_format=Output.JSON)
+
+    # kept by the repository the records report, the target of the pull request
+    records = json.loads(capsys.readouterr().out)
+    assert [(r["id"], r["repository"]) for r in records] == [(1, "repo_name")]
+
+
+@patch("bb.pr.list.to_richprint")
+@patch("bb.pr.list.request.get_pages")
+@patch("bb.pr.list.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_list_pull_request_pages_share_tree(
+    mock_base_repo, mock_get_pages, mock_render
+):
+    mock_get_pages.return_value = iter(
+        [
+            {
+                "values": [_repo_pr("repo_name", 1), _repo_pr("fork", 2)],
+                "isLastPage": False,
+            },
+            {"values": [_repo_pr("repo_name", 3)], "isLastPage": False},
+            {"values": [_repo_pr("fork", 4)], "isLastPage": True},
+        ]
+    )
+
+    list_pull_request("current", False)
+
+    # one tree for the current repository, with the pull requests of every
+    # page, rendering stops there as for a single response
+    mock_render.assert_called_once()
+    repo_name, pr_repo_dict = mock_render.call_args[0]
+    assert repo_name == "repo_name"
+    assert list(pr_repo_dict["OPEN"]) == ["1", "3"]
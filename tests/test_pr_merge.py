@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,37 +12,39 @@ from bb.pr.merge import (
     rebase_pr,
     show_merge_stats,
     validate_automerge_conditions,
+    validate_merge,
     validate_pr_source_branch_delete_check,
 )
+from bb.utils.api import PullRequest
 
 
-@patch("bb.pr.merge.request.get")
+@patch("bb.pr.merge.request.async_get")
 def test_pr_source_branch_delete_check(mock_get):
     mock_get.return_value = [200, []]
-    pr_source_branch_delete_check("proj", "repo", "1", True)
+    asyncio.run(pr_source_branch_delete_check("proj", "repo", "1", True))
 
     mock_get.return_value = [200, [{"error": "exists"}]]
     with pytest.raises(ValueError):
-        pr_source_branch_delete_check("proj", "repo", "1", True)
+        asyncio.run(pr_source_branch_delete_check("proj", "repo", "1", True))
 
 
-@patch("bb.pr.merge.request.get")
+@patch("bb.pr.merge.request.async_get")
 def test_validate_pr_source_branch_delete_check(mock_get):
     mock_get.return_value = [
         200,
         {"canMerge": True, "conflicted": False, "outcome": "CLEAN"},
     ]
-    validate_pr_source_branch_delete_check("proj", "repo", "1")
+    asyncio.run(validate_pr_source_branch_delete_check("proj", "repo", "1"))
 
     mock_get.return_value = [
         200,
         {"canMerge": False, "conflicted": True, "outcome": "CONFLICTED"},
     ]
     with pytest.raises(ValueError):
-        validate_pr_source_branch_delete_check("proj", "repo", "1")
+        asyncio.run(validate_pr_source_branch_delete_check("proj", "repo", "1"))
 
 
-@patch("bb.pr.merge.request.get")
+@patch("bb.pr.merge.request.async_get")
 def test_validate_automerge_conditions(mock_get):
     mock_get.side_effect = [
         [
@@ -55,8 +58,8 @@ def test_validate_automerge_conditions(mock_get):
         [200, {"status": {"id": "NO_PATH"}}],
     ]
 
-    pr_info, merge_info, src, dst, ver = validate_automerge_conditions(
-        "proj", "repo", "1"
+    pr_info, merge_info, src, dst, ver = asyncio.run(
+        validate_automerge_conditions("proj", "repo", "1")
     )
     assert src == "src"
     assert dst == "dst"
@@ -104,6 +107,67 @@ def test_merge_pr_conflict(mock_post):
     assert merge_pr(mock_live, "proj", "repo", "1", ("src", "dst", 1)) == 409
 
 
+@patch("bb.pr.merge.pr_source_branch_delete_check")
+@patch("bb.pr.merge.validate_pr_source_branch_delete_check")
+@patch("bb.pr.merge.validate_automerge_conditions")
+def test_validate_merge(mock_automerge, mock_validate, mock_delete_check):
+    mock_automerge.return_value = ("pr_info", {}, "src", "dst", 1)
+
+    assert validate_merge("proj", "repo", "1", True) == (
+        "pr_info",
+        {},
+        "src",
+        "dst",
+        1,
+    )
+    mock_delete_check.assert_awaited_once_with("proj", "repo", "1", True)
+    mock_validate.assert_awaited_once_with("proj", "repo", "1")
+    mock_automerge.assert_awaited_once_with("proj", "repo", "1")
+
+
+@patch("bb.pr.merge.request.async_get")
+def test_validate_merge_runs_checks_concurrently(mock_get):
+    in_flight, peak = 0, 0
+
+    async def fake_get(url, fresh=False):
+        nonlocal in_flight, peak
+        # merge checks never trust a cached response
+        assert fresh
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "cleanup" in url:
+            return [200, []]
+        if url.endswith("/merge"):
+            return [200, {"canMerge": True, "conflicted": False, "outcome": "CLEAN"}]
+        if "automerge" in url:
+            return [200, {"status": {"id": "NO_PATH"}}]
+        return [
+            200,
+            {
+                "fromRef": {"displayId": "src"},
+                "toRef": {"displayId": "dst"},
+                "version": 1,
+            },
+        ]
+
+    mock_get.side_effect = fake_get
+
+    assert validate_merge("proj", "repo", "1", False)[2:] == ("src", "dst", 1)
+    assert mock_get.call_count == 4
+    assert peak == 3
+
+
+@patch("bb.pr.merge.validate_pr_source_branch_delete_check")
+@patch("bb.pr.merge.validate_automerge_conditions")
+@patch("bb.pr.merge.request.async_get")
+def test_validate_merge_failure(mock_get, mock_automerge, mock_validate):
+    mock_get.return_value = [200, [{"error": "exists"}]]
+    with pytest.raises(ValueError, match="Source branch deletion validation failed"):
+        validate_merge("proj", "repo", "1", True)
+
+
 @patch("bb.pr.merge.cmnd.base_repo", return_value=("proj", "repo"))
 @patch("bb.pr.merge.pr_source_branch_delete_check")
 @patch("bb.pr.merge.validate_pr_source_branch_delete_check")
@@ -125,7 +189,7 @@ def test_merge_pull_request(
     mock_base_repo,
 ):
     mock_validate_automerge.return_value = (
-        {"links": {"self": [{"href": "url"}]}},
+        PullRequest.from_json({"links": {"self": [{"href": "url"}]}}),
         {},
         "src",
         "dst",
@@ -1,28 +1,86 @@
 # -*- coding: utf-8 -*-
+import asyncio
 from unittest.mock import patch
 
 import pytest
 
-from bb.pr.review import review_pull_request
+from bb.pr.review import confirm_review, review_pull_request
 
 
 @patch("bb.pr.review.base_repo", return_value=("project", "repo_name"))
-@patch("bb.pr.review.bitbucket_api.whoami", return_value="whoami_url")
-@patch("bb.pr.review.get", return_value=[200, "username"])
-@patch("bb.pr.review.put", return_value=[200, {}])
-def test_review_pull_request(mock_put, mock_get, mock_whoami, mock_base_repo):
-    review_pull_request(1, "approve")
+@patch("bb.pr.review.current_user", return_value="username")
+@patch("bb.pr.review.request.async_put", return_value=[200, {}])
+def test_review_pull_request(mock_put, mock_get, mock_base_repo):
+    review_pull_request(["1"], "approve")
     assert mock_get.call_count == 1
     assert mock_put.call_count == 1
+    assert mock_put.call_args[0][1] == {"status": "APPROVED"}
 
 
 @patch("bb.pr.review.base_repo", return_value=("project", "repo_name"))
-@patch("bb.pr.review.bitbucket_api.whoami", return_value="whoami_url")
-@patch("bb.pr.review.get", return_value=[200, "username"])
-@patch("bb.pr.review.put", return_value=[409, {}])
-def test_review_pull_request_error(mock_put, mock_get, mock_whoami, mock_base_repo):
+@patch("bb.pr.review.current_user", return_value="username")
+@patch("bb.pr.review.request.async_put", return_value=[409, {}])
+def test_review_pull_request_error(mock_put, mock_get, mock_base_repo):
     with pytest.raises(
         ValueError,
         match="Cannot perform action on PR. Possibly due to outdated PR state.",
     ):
-        review_pull_request(1, "approve")
+        review_pull_request(["1"], "approve")
+
+
+@patch("bb.pr.review.base_repo", return_value=("project", "repo_name"))
+@patch("bb.pr.review.current_user", return_value="username")
+@patch("bb.pr.review.console.print")
+def test_review_many_resolves_user_once_and_fans_out(
+    mock_print, mock_get, mock_base_repo
+):
+    in_flight, peak = [0], [0]
+
+    async def fake_put(url, body):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return [409 if "/pull-requests/3/" in url else 200, {}]
+
+    with patch("bb.pr.review.request.async_put", side_effect=fake_put) as mock_put:
+        with pytest.raises(ValueError, match="Cannot review pull request\\(s\\): 3"):
+            review_pull_request(["1", " 2", "3"], "needs_work")
+
+    assert mock_get.call_count == 1
+    assert mock_put.call_count == 3
+    assert peak[0] > 1
+    summary = mock_print.call_args[0][0]
+    assert summary.row_count == 3
+
+
+@patch("bb.pr.review.base_repo", return_value=("project", "repo_name"))
+@patch("bb.pr.review.current_user", return_value="username")
+@patch("bb.pr.review.request.async_put", return_value=[200, {}])
+def test_review_pull_request_wait(mock_put, mock_get, mock_base_repo):
+    pending = [
+        200,
+        {"reviewers": [{"user": {"name": "username"}, "status": "UNAPPROVED"}]},
+    ]
+    visible = [
+        200,
+        {"reviewers": [{"user": {"name": "username"}, "status": "APPROVED"}]},
+    ]
+    with patch(
+        "bb.pr.review.request.async_get", side_effect=[pending, visible]
+    ) as mock_async_get:
+        review_pull_request(["1"], "approve", wait=True)
+    assert mock_async_get.call_count == 2
+    # every poll revalidates, a cached response would never change
+    assert all(call.kwargs == {"fresh": True} for call in mock_async_get.call_args_list)
+
+
+@patch("bb.pr.review.request.async_get", return_value=[200, {"reviewers": []}])
+def test_confirm_review_timeout(mock_async_get):
+    assert (
+        asyncio.run(
+            confirm_review("project", "repo", "1", "username", "APPROVED", timeout=0)
+        )
+        is False
+    )
+    mock_async_get.assert_called_once()
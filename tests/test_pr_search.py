@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import patch
+
+import pytest
+
+from bb.pr.search import search_pull_request
+from bb.utils import cache, index
+from bb.utils.api import get_bitbucket_api
+
+
+@pytest.fixture(autouse=True)
+def indexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path / "bb"))
+    _pr = {
+        "id": 7,
+        "title": "Speed up login",
+        "description": "cache the session",
+        "links": {"self": [{"href": "http://example.com/7"}]},
+        "state": "OPEN",
+        "updatedDate": 100,
+        "fromRef": {"repository": {"slug": "repo_name"}, "displayId": "src"},
+        "toRef": {
+            "displayId": "dst",
+            "repository": {"slug": "repo_name", "project": {"key": "project"}},
+        },
+        "author": {"user": {"name": "jdoe", "displayName": "User"}},
+        "reviewers": [],
+        "properties": {},
+    }
+    conn = index.connect()
+    with conn:
+        index.upsert(conn, get_bitbucket_api().bitbucket_host, [_pr])
+    conn.close()
+
+
+@patch("bb.pr.search.sync_repository")
+@patch("bb.pr.search.richprint.console.print")
+@patch("bb.pr.search.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_search_pull_request(mock_base_repo, mock_print, mock_sync):
+    search_pull_request("login", False, "ALL", 20, True)
+
+    mock_sync.assert_not_called()
+    results = mock_print.call_args[0][0]
+    assert results.row_count == 1
+
+
+@patch("bb.pr.search.richprint.console.print")
+@patch("bb.pr.search.cmnd.base_repo", return_value=("project", "repo_name"))
+def test_search_pull_request_no_match(mock_base_repo, mock_print):
+    search_pull_request("login", False, "MERGED", 20, True)
+    assert "No pull requests match" in mock_print.call_args[0][0]
+
+
+@patch("bb.pr.search.sync_repository")
+@patch("bb.pr.search.is_stale", return_value=True)
+@patch("bb.pr.search.richprint.live_progress")
+@patch("bb.pr.search.richprint.console.print")
+@patch("bb.pr.search.cmnd.base_repo", return_value=("project", "other"))
+def test_search_pull_request_syncs_stale_index(
+    mock_base_repo, mock_print, mock_live, mock_stale, mock_sync
+):
+    search_pull_request("login", True, "OPEN", 20, False)
+
+    mock_sync.assert_called_once_with("project", "other")
+    assert mock_print.call_args[0][0].row_count == 1
@@ -61,3 +61,32 @@ def test_view_pull_request_web_error(mock_webbrowser, mock_get, mock_base_repo):
 
     mock_get.assert_called_once()
     mock_webbrowser.assert_called_once_with("http://example.com")
+
+
+@patch("bb.pr.view.live_progress")
+@patch("bb.pr.view.base_repo", return_value=("project", "repo_name"))
+@patch("bb.pr.view.get")
+def test_view_pull_request_json(mock_get, mock_base_repo, mock_live, capsys):
+    import json
+
+    from bb.utils.output import Output
+
+    mock_get.return_value = [
+        200,
+        {
+            "id": 1,
+            "title": "Test Title",
+            "state": "OPEN",
+            "fromRef": {"displayId": "src"},
+            "toRef": {"displayId": "dst"},
+            "author": {"user": {"name": "jdoe"}},
+            "links": {"self": [{"href": "http://example.com/1"}]},
+        },
+    ]
+
+    view_pull_request("1", False, Output.JSON)
+
+    records = json.loads(capsys.readouterr().out)
+    assert records[0]["id"] == 1
+    assert records[0]["author"]["name"] == "jdoe"
+    mock_live.assert_not_called()
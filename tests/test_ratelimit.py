@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from bb.utils import ratelimit
+from bb.utils.ratelimit import Governor, TokenBucket
+
+
+def test_token_bucket_disabled():
+    bucket = TokenBucket(0, 1)
+    assert all(bucket.reserve() == 0 for _ in range(100))
+
+
+@patch("bb.utils.ratelimit.time.monotonic", return_value=100.0)
+def test_token_bucket_spaces_out_beyond_burst(mock_monotonic):
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.1
+    assert round(bucket.reserve(), 6) == 0.2
+
+
+@patch("bb.utils.ratelimit.time.monotonic")
+def test_token_bucket_refills(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    bucket = TokenBucket(rate=10, burst=1)
+    assert bucket.reserve() == 0
+    mock_monotonic.return_value = 100.5
+    assert bucket.reserve() == 0
+
+
+@patch("bb.utils.ratelimit.time.sleep")
+def test_token_bucket_acquire_sleeps(mock_sleep):
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.acquire()
+    mock_sleep.assert_not_called()
+    bucket.acquire()
+    mock_sleep.assert_called_once()
+
+
+def test_governor_caps_async_in_flight():
+    limiter = Governor(rate=0, burst=1, max_in_flight=2)
+    in_flight, peak = 0, 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter.async_slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    asyncio.run(main())
+    assert peak == 2
+
+
+def test_governor_caps_in_flight_across_threads():
+    limiter = Governor(rate=0, burst=1, max_in_flight=2)
+    lock = threading.Lock()
+    in_flight, peak = 0, 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter.async_slot():
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(4)))
+
+    def sync_call():
+        nonlocal in_flight, peak
+        with limiter.slot():
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+    threads = [threading.Thread(target=asyncio.run, args=(main(),)) for _ in range(3)]
+    threads.append(threading.Thread(target=sync_call))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+    # every slot was given back
+    assert limiter._semaphore.acquire(blocking=False)
+
+
+def test_governor_sync_slot():
+    limiter = Governor(rate=0, burst=1, max_in_flight=1)
+    with limiter.slot():
+        assert not limiter._semaphore.acquire(blocking=False)
+    assert limiter._semaphore.acquire(blocking=False)
+
+
+def test_governor_from_config(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_governor", None)
+    settings = {("ratelimit", "rate"): 5.0, ("ratelimit", "max_in_flight"): 3}
+    with patch(
+        "bb.utils.ini.get_setting",
+        side_effect=lambda s, o, f: settings.get((s, o), f),
+    ):
+        limiter = ratelimit.governor()
+
+    assert limiter.bucket.rate == 5.0
+    assert limiter.max_in_flight == 3
+    assert ratelimit.governor() is limiter
+    monkeypatch.setattr(ratelimit, "_governor", None)
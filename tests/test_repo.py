@@ -86,7 +86,7 @@ def test_delete_repository_non_202():
 
 
 @patch("bb.utils.helper.prompt", return_value="test")
-@patch("bb.repo.archive_repository")
+@patch("bb.repo.archive.archive_repository")
 def test_archive(mock_archive, mock_prompt):
     result = runner.invoke(_repo, ["archive", "--project", "demo", "--repo", "test"])
     assert result.exit_code == 0
@@ -94,7 +94,7 @@ def test_archive(mock_archive, mock_prompt):
 
 
 @patch("bb.repo.parse", return_value=["u", "t", "host"])
-@patch("bb.repo.clone_repo")
+@patch("bb.utils.cmnd.clone_repo")
 def test_clone(mock_clone, mock_parse):
     result = runner.invoke(_repo, ["clone", "demo/test"])
     assert result.exit_code == 0
@@ -102,7 +102,7 @@ def test_clone(mock_clone, mock_parse):
 
 
 @patch("bb.utils.helper.prompt", return_value="test")
-@patch("bb.repo.create_repository")
+@patch("bb.repo.create.create_repository")
 def test_create(mock_create, mock_prompt):
     result = runner.invoke(_repo, ["create", "--project", "demo", "--repo", "test"])
     assert result.exit_code == 0
@@ -110,7 +110,7 @@ def test_create(mock_create, mock_prompt):
 
 
 @patch("bb.utils.helper.prompt", return_value="test")
-@patch("bb.repo.delete_repository")
+@patch("bb.repo.delete.delete_repository")
 def test_delete(mock_delete, mock_prompt):
     result = runner.invoke(_repo, ["delete", "--project", "demo", "--repo", "test"])
     assert result.exit_code == 0
@@ -118,7 +118,7 @@ def test_delete(mock_delete, mock_prompt):
 
 
 @patch("bb.utils.helper.prompt", return_value="test")
-@patch("bb.repo.archive_repository")
+@patch("bb.repo.archive.archive_repository")
 def test_unarchive(mock_archive, mock_prompt):
     result = runner.invoke(_repo, ["unarchive", "--project", "demo", "--repo", "test"])
     assert result.exit_code == 0
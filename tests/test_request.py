@@ -19,12 +19,55 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
-from bb.utils.request import delete, get, http_response_definitions, post, put
+from bb.utils.request import (
+    async_delete,
+    async_get,
+    async_post,
+    async_put,
+    decode,
+    delete,
+    get,
+    get_paged,
+    get_pages,
+    http_response_definitions,
+    post,
+    put,
+    run,
+)
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec", "json"])
+def test_load_decoder(name):
+    from bb.utils.request import _load_decoder
+
+    pytest.importorskip(name)
+    backend, loads, errors = _load_decoder((name,))
+    assert backend == name
+    assert loads(b'{"values": [1, "\\u00e9"]}') == {"values": [1, "\u00e9"]}
+    with pytest.raises(errors):
+        loads(b"not json")
+
+
+def test_load_decoder_falls_back_to_stdlib():
+    from bb.utils.request import _load_decoder
+
+    with patch.dict("sys.modules", {"orjson": None, "msgspec": None}):
+        assert _load_decoder()[0] == "json"
+        with pytest.raises(ValueError, match="No JSON decoder"):
+            _load_decoder(("orjson", "msgspec"))
+
+
+def test_decode():
+    assert decode(b'{"id": 1}') == {"id": 1}
+    with pytest.raises(ValueError, match="Invalid JSON response"):
+        decode(b"<html>")
 
 
 def test_http_response_definitions():
@@ -40,7 +83,7 @@ def test_get_success(mock_get_auth, mock_get_client):
     mock_get_client.return_value = mock_client
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {"success": True}
+    mock_response.content = json.dumps({"success": True}).encode()
     mock_client.get.return_value = mock_response
 
     status, data = get("https://example.com")
@@ -56,7 +99,6 @@ def test_get_success_content(mock_get_auth, mock_get_client):
     mock_get_client.return_value = mock_client
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.side_effect = json.JSONDecodeError("msg", "doc", 0)
     mock_response.content = b"some string content"
     mock_client.get.return_value = mock_response
 
@@ -73,7 +115,9 @@ def test_get_400_invalid(mock_get_auth, mock_get_client):
     mock_get_client.return_value = mock_client
     mock_response = MagicMock()
     mock_response.status_code = 400
-    mock_response.json.return_value = {"errors": [{"message": "invalid input"}]}
+    mock_response.content = json.dumps(
+        {"errors": [{"message": "invalid input"}]}
+    ).encode()
     mock_client.get.return_value = mock_response
 
     with pytest.raises(ValueError):
@@ -88,7 +132,9 @@ def test_get_400_other(mock_get_auth, mock_get_client):
     mock_get_client.return_value = mock_client
     mock_response = MagicMock()
     mock_response.status_code = 400
-    mock_response.json.return_value = {"errors": [{"message": "some other error"}]}
+    mock_response.content = json.dumps(
+        {"errors": [{"message": "some other error"}]}
+    ).encode()
     mock_client.get.return_value = mock_response
 
     with pytest.raises(ValueError):
@@ -117,7 +163,7 @@ def test_post_success(mock_get_auth, mock_get_client):
     mock_get_client.return_value = mock_client
     mock_response = MagicMock()
     mock_response.status_code = 201
-    mock_response.json.return_value = {"id": 1}
+    mock_response.content = json.dumps({"id": 1}).encode()
     mock_client.post.return_value = mock_response
 
     status, data = post("https://example.com", {"key": "value"})
@@ -162,7 +208,7 @@ def test_put_success(mock_get_auth, mock_get_client):
     mock_get_client.return_value = mock_client
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {"updated": True}
+    mock_response.content = json.dumps({"updated": True}).encode()
     mock_client.put.return_value = mock_response
 
     status, data = put("https://example.com", {"key": "value"})
@@ -221,7 +267,7 @@ def test_get_no_auth(mock_get_auth):
     request_module._client = mock_client
     mock_response = MagicMock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {"success": True}
+    mock_response.content = json.dumps({"success": True}).encode()
     mock_client.get.return_value = mock_response
 
     status, data = get("https://example.com")
@@ -268,3 +314,227 @@ def test_get_auth_with_config(mock_parse, mock_is_present):
     mock_parse.return_value = ["user", "token", "host"]
     auth = request_module._get_auth()
     assert auth == ("user", "token")
+
+
+@patch("bb.utils.request.get")
+def test_get_pages_follows_next_page_start(mock_get):
+    mock_get.side_effect = [
+        [200, {"values": [1, 2], "isLastPage": False, "nextPageStart": 2}],
+        [200, {"values": [3], "isLastPage": True}],
+    ]
+
+    pages = list(get_pages("https://example.com/items?state=OPEN", page_size=2))
+
+    assert [page["values"] for page in pages] == [[1, 2], [3]]
+    assert mock_get.call_args_list[0].args[0] == (
+        "https://example.com/items?state=OPEN&start=0&limit=2"
+    )
+    assert mock_get.call_args_list[1].args[0] == (
+        "https://example.com/items?state=OPEN&start=2&limit=2"
+    )
+
+
+@patch("bb.utils.request.get")
+def test_get_paged_is_lazy(mock_get):
+    mock_get.side_effect = [
+        [200, {"values": [1, 2], "isLastPage": False, "nextPageStart": 2}],
+        [200, {"values": [3], "isLastPage": True}],
+    ]
+
+    values = get_paged("https://example.com/items")
+    assert next(values) == 1
+    assert mock_get.call_count == 1
+    assert list(values) == [2, 3]
+    assert mock_get.call_count == 2
+
+
+@patch("bb.utils.request.get")
+def test_get_paged_unpaged_response(mock_get):
+    mock_get.return_value = [200, {"values": [1]}]
+
+    assert list(get_paged("https://example.com/items")) == [1]
+    mock_get.assert_called_once()
+
+
+@patch("bb.utils.request._get_async_client")
+@patch("bb.utils.request._get_auth")
+def test_async_verbs(mock_get_auth, mock_get_async_client):
+    mock_get_auth.return_value = ("user", "token")
+    mock_client = MagicMock()
+    mock_get_async_client.return_value = mock_client
+    ok = MagicMock(status_code=200)
+    ok.content = json.dumps({"success": True}).encode()
+    mock_client.get = AsyncMock(return_value=ok)
+    mock_client.post = AsyncMock(return_value=MagicMock(status_code=204))
+    mock_client.put = AsyncMock(return_value=ok)
+    mock_client.request = AsyncMock(return_value=MagicMock(status_code=202))
+
+    results = run(
+        async_get("https://example.com"),
+        async_post("https://example.com", {}),
+        async_put("https://example.com", {}),
+        async_delete("https://example.com", {}),
+    )
+
+    assert results == [
+        [200, {"success": True}],
+        [204, {}],
+        [200, {"success": True}],
+        202,
+    ]
+    mock_client.get.assert_awaited_once_with(
+        "https://example.com", auth=("user", "token"), headers={}
+    )
+
+
+@patch("bb.utils.request._get_async_client")
+@patch("bb.utils.request._get_auth")
+def test_async_get_error(mock_get_auth, mock_get_async_client):
+    mock_get_auth.return_value = None
+    mock_client = MagicMock()
+    mock_get_async_client.return_value = mock_client
+    mock_client.get = AsyncMock(return_value=MagicMock(status_code=500))
+
+    with pytest.raises(ValueError):
+        run(async_get("https://example.com"))
+
+
+def test_run_respects_limit():
+    in_flight, peak = 0, 0
+
+    async def task(value):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return value
+
+    assert run(*(task(i) for i in range(6)), limit=2) == list(range(6))
+    assert peak == 2
+
+
+def test_run_return_exceptions():
+    async def fail():
+        raise ValueError("boom")
+
+    async def ok():
+        return 1
+
+    results = run(ok(), fail(), return_exceptions=True)
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
+
+
+def test_as_completed_yields_in_completion_order():
+    from bb.utils.request import as_completed
+
+    async def task(value, delay):
+        await asyncio.sleep(delay)
+        return value
+
+    async def collect():
+        return [
+            value
+            async for value in as_completed(
+                task("slow", 0.05), task("fast", 0.0), limit=2
+            )
+        ]
+
+    assert run(collect())[0] == ["fast", "slow"]
+
+
+@patch("bb.utils.request.async_get")
+def test_async_get_pages(mock_async_get):
+    from bb.utils.request import async_get_pages
+
+    mock_async_get.side_effect = [
+        [200, {"values": [1], "isLastPage": False, "nextPageStart": 1}],
+        [200, {"values": [2], "isLastPage": True}],
+    ]
+
+    async def collect():
+        return [
+            page["values"]
+            async for page in async_get_pages("https://example.com/api", page_size=1)
+        ]
+
+    assert run(collect())[0] == [[1], [2]]
+    assert "start=1" in mock_async_get.call_args_list[1][0][0]
+
+
+def test_run_closes_async_client():
+    import bb.utils.request as request_module
+
+    async def touch_client():
+        return request_module._get_async_client()
+
+    client = run(touch_client())[0]
+    assert client.is_closed
+    assert request_module._async_local.client is None
+
+
+@patch("bb.utils.request._get_client")
+@patch("bb.utils.request._get_auth", return_value=("user", "token"))
+@patch("bb.utils.request.response_cache")
+def test_get_cache_revalidates_with_etag(
+    mock_response_cache, mock_get_auth, mock_get_client, tmp_path
+):
+    from bb.utils.cache import ResponseCache
+
+    mock_response_cache.return_value = ResponseCache(str(tmp_path), 0, 1024 * 1024)
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get.return_value = httpx.Response(
+        200, json={"values": [1]}, headers={"ETag": '"v1"'}
+    )
+
+    assert get("https://example.com/api") == [200, {"values": [1]}]
+    assert mock_client.get.call_args.kwargs["headers"] == {}
+
+    mock_client.get.return_value = httpx.Response(304)
+    assert get("https://example.com/api") == [200, {"values": [1]}]
+    assert mock_client.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+@patch("bb.utils.request._get_client")
+@patch("bb.utils.request._get_auth", return_value=("user", "token"))
+@patch("bb.utils.request.response_cache")
+def test_get_cache_serves_fresh_entries(
+    mock_response_cache, mock_get_auth, mock_get_client, tmp_path
+):
+    from bb.utils.cache import ResponseCache
+
+    mock_response_cache.return_value = ResponseCache(str(tmp_path), 60, 1024 * 1024)
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get.return_value = httpx.Response(200, json={"id": 1})
+
+    assert get("https://example.com/api") == [200, {"id": 1}]
+    assert get("https://example.com/api") == [200, {"id": 1}]
+    mock_client.get.assert_called_once()
+
+
+@patch("bb.utils.request._get_client")
+@patch("bb.utils.request._get_auth", return_value=("user", "token"))
+@patch("bb.utils.request.response_cache")
+def test_get_fresh_revalidates_within_ttl(
+    mock_response_cache, mock_get_auth, mock_get_client, tmp_path
+):
+    from bb.utils.cache import ResponseCache
+
+    mock_response_cache.return_value = ResponseCache(str(tmp_path), 60, 1024 * 1024)
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get.return_value = httpx.Response(
+        200, json={"id": 1}, headers={"ETag": '"v1"'}
+    )
+    assert get("https://example.com/api") == [200, {"id": 1}]
+
+    mock_client.get.return_value = httpx.Response(
+        200, json={"id": 2}, headers={"ETag": '"v2"'}
+    )
+    assert get("https://example.com/api") == [200, {"id": 1}]
+    assert get("https://example.com/api", fresh=True) == [200, {"id": 2}]
+    assert mock_client.get.call_count == 2
+    assert mock_client.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from bb.utils import retry
+from bb.utils.retry import RetryPolicy
+
+
+def test_next_delay_gives_up_for_non_idempotent_methods():
+    policy = RetryPolicy()
+    assert policy.next_delay("POST", 1, 0, httpx.Response(503)) is None
+    assert policy.next_delay("DELETE", 1, 0, None) is None
+
+
+def test_next_delay_only_for_transient_statuses():
+    policy = RetryPolicy()
+    assert policy.next_delay("GET", 1, 0, httpx.Response(500)) is None
+    assert policy.next_delay("GET", 1, 0, httpx.Response(200)) is None
+    assert policy.next_delay("GET", 1, 0, httpx.Response(503)) is not None
+    assert policy.next_delay("PUT", 1, 0, None) is not None
+
+
+def test_next_delay_full_jitter_is_capped():
+    policy = RetryPolicy(attempts=10, backoff=1, max_backoff=2)
+    for attempt in range(1, 10):
+        assert 0 <= policy.next_delay("GET", attempt, 0, None) <= 2
+
+
+def test_next_delay_bounded_attempts_and_deadline():
+    policy = RetryPolicy(attempts=3, deadline=5)
+    assert policy.next_delay("GET", 3, 0, None) is None
+    response = httpx.Response(429, headers={"Retry-After": "10"})
+    assert policy.next_delay("GET", 1, 0, response) is None
+
+
+def test_next_delay_honours_retry_after():
+    policy = RetryPolicy(backoff=0.001, deadline=60)
+    response = httpx.Response(429, headers={"Retry-After": "3"})
+    assert policy.next_delay("GET", 1, 0, response) == 3
+
+
+def test_retry_after():
+    assert retry.retry_after(None) == 0
+    assert retry.retry_after("2") == 2
+    assert retry.retry_after("-1") == 0
+    assert retry.retry_after("soon") == 0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), True)
+    assert 25 < retry.retry_after(later) <= 30
+
+
+def test_retry_policy_from_config():
+    settings = {("retry", "attempts"): 5, ("retry", "deadline"): 1.0}
+    with patch(
+        "bb.utils.ini.get_setting",
+        side_effect=lambda s, o, f: settings.get((s, o), f),
+    ):
+        policy = retry.retry_policy()
+    assert policy.attempts == 5
+    assert policy.deadline == 1.0
+    assert policy.backoff == RetryPolicy.backoff
+
+
+@patch("bb.utils.retry.time.sleep")
+@patch("bb.utils.retry.retry_policy", return_value=RetryPolicy(attempts=3))
+def test_send_retries_transient_statuses(mock_policy, mock_sleep):
+    request = MagicMock(
+        side_effect=[httpx.Response(503), httpx.Response(502), httpx.Response(200)]
+    )
+    assert retry.send("GET", request).status_code == 200
+    assert request.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@patch("bb.utils.retry.time.sleep")
+@patch("bb.utils.retry.retry_policy", return_value=RetryPolicy(attempts=2))
+def test_send_returns_last_response(mock_policy, mock_sleep):
+    request = MagicMock(return_value=httpx.Response(503))
+    assert retry.send("GET", request).status_code == 503
+    assert request.call_count == 2
+
+
+@patch("bb.utils.retry.time.sleep")
+@patch("bb.utils.retry.retry_policy", return_value=RetryPolicy(attempts=2))
+def test_send_reraises_transport_errors(mock_policy, mock_sleep):
+    request = MagicMock(side_effect=httpx.ConnectError("refused"))
+    with pytest.raises(httpx.ConnectError):
+        retry.send("GET", request)
+    assert request.call_count == 2
+
+
+@patch("bb.utils.retry.time.sleep")
+@patch("bb.utils.retry.retry_policy", return_value=RetryPolicy(attempts=3))
+def test_send_does_not_retry_post(mock_policy, mock_sleep):
+    request = MagicMock(return_value=httpx.Response(503))
+    assert retry.send("POST", request).status_code == 503
+    request.assert_called_once()
+    mock_sleep.assert_not_called()
+
+
+@patch("bb.utils.retry.asyncio.sleep")
+@patch("bb.utils.retry.retry_policy", return_value=RetryPolicy(attempts=3))
+def test_async_send_retries(mock_policy, mock_sleep):
+    responses = iter([httpx.Response(429), httpx.Response(200)])
+
+    async def request():
+        return next(responses)
+
+    assert asyncio.run(retry.async_send("GET", request)).status_code == 200
+    mock_sleep.assert_awaited_once()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from bb.cli import _bb
+from bb.shell import Capture, exit_code, parse_line, run_batch, run_lines
+
+
+@pytest.mark.parametrize(
+    "line, argv",
+    [
+        ("bb pr view --id 1", ["pr", "view", "--id", "1"]),
+        ("pr search 'login timeout'", ["pr", "search", "login timeout"]),
+        ("pr list  # mine", ["pr", "list"]),
+        ("# comment", None),
+        ("   ", None),
+        ("bb", None),
+    ],
+)
+def test_parse_line(line, argv):
+    assert parse_line(line) == argv
+
+
+@pytest.mark.parametrize("line", ["pr search 'open", "bb shell", "daemon start"])
+def test_parse_line_rejects(line):
+    with pytest.raises(ValueError):
+        parse_line(line)
+
+
+def test_exit_code():
+    assert exit_code(SystemExit()) == 0
+    assert exit_code(SystemExit(2)) == 2
+    assert exit_code(SystemExit("message")) == 1
+
+
+@patch("bb.shell.run_argv", side_effect=[0, 1, 0])
+def test_run_lines_stops_at_failure(mock_run):
+    assert run_lines(["--version", "# skipped", "pr nope", "--version"]) == [3]
+    assert mock_run.call_count == 2
+
+
+@patch("bb.shell.run_argv", side_effect=[0, 1, 0])
+def test_run_lines_keep_going(mock_run):
+    assert run_lines(["a", "b", "c"], keep_going=True) == [2]
+    assert mock_run.call_count == 3
+
+
+def test_run_lines_parallel_prints_in_line_order(capsys):
+    started = threading.Barrier(3)
+
+    def fake_run(argv):
+        started.wait(timeout=5)  # every line runs at once
+        time.sleep(0.01 * (3 - int(argv[0])))  # and finishes in reverse
+        print(f"line {argv[0]}")
+        return int(argv[0] == "2")
+
+    with patch("bb.shell.run_argv", side_effect=fake_run):
+        assert run_lines(["1", "2", "3"], parallel=3, keep_going=True) == [2]
+    assert capsys.readouterr().out == "line 1\nline 2\nline 3\n"
+
+
+def test_capture_gives_empty_stdin():
+    with Capture() as capture:
+        assert capture.run(lambda: sys.stdin.read()) == ("", "", "")
+        assert sys.stdin.readable()
+
+
+@patch("bb.shell.run_argv", return_value=1)
+def test_run_batch_reports_failures(mock_run, tmp_path):
+    script = tmp_path / "script.bb"
+    script.write_text("pr list\npr view --id 1\n")
+    with pytest.raises(ValueError, match="Failed line"):
+        run_batch(str(script), keep_going=True)
+    assert mock_run.call_count == 2
+
+
+def test_batch_command_from_stdin():
+    result = CliRunner().invoke(_bb, ["batch"], input="bb --version\n--version\n")
+    assert result.exit_code == 0
+    assert result.stdout.count("bb version") == 2
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import pstats
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+import bb
+from bb.cli import _bb
+from bb.utils import request, timing
+
+
+@pytest.fixture
+def recording():
+    timing.start()
+    yield
+    timing._enabled = False
+    timing._events.clear()
+
+
+def test_disabled_records_nothing():
+    with timing.span("git", "status"):
+        pass
+    timing.record("http", "GET /", 0.1)
+    assert not timing.enabled()
+    assert timing._events == []
+
+
+def test_start_records_startup_once(monkeypatch):
+    monkeypatch.setattr(bb, "_started", 0.0)
+    try:
+        timing.start()
+        assert [event.phase for event in timing._events] == ["startup"]
+        assert bb._started is None
+        timing.start()  # a second command of the same process, e.g. in bb batch
+        assert timing._events == []
+    finally:
+        timing._enabled = False
+        timing._events.clear()
+
+
+def test_summary_groups_identical_events():
+    events = [
+        timing.Event("render", "console output", 0.25),
+        timing.Event("http", "GET /a", 0.5, "200, 2 bytes"),
+        timing.Event("render", "console output", 0.25),
+    ]
+    assert timing.summary(events) == [
+        ("render", "console output", "", 2, 0.5),
+        ("http", "GET /a", "200, 2 bytes", 1, 0.5),
+    ]
+
+
+def test_send_records_http(recording):
+    response = httpx.Response(
+        200, content=b"{}", request=httpx.Request("GET", "https://host/api")
+    )
+    assert request._send("GET", "https://host/api", lambda: response) is response
+    assert request.decode(response.content) == {}
+    phases = {event.phase: event for event in timing._events}
+    assert phases["http"].label == "GET https://host/api"
+    assert phases["http"].detail == "200, 2 bytes"
+    assert phases["decode"].label == request.decoder
+
+
+def test_finish_reports_on_stderr(recording, capsys):
+    with timing.span("git", "git remote -v"):
+        pass
+    timing.finish()
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "git remote -v" in captured.err
+    assert "wall" in captured.err
+    assert not timing.enabled()
+
+
+def test_profile_writes_pstats(tmp_path):
+    path = str(tmp_path / "bb.prof")
+    stop = timing.profile(path)
+    sum(range(1000))
+    stop()
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_cli_options(tmp_path):
+    path = tmp_path / "bb.prof"
+    result = CliRunner().invoke(
+        _bb, ["--timings", "--profile", str(path), "auth", "status"]
+    )
+    assert result.exit_code == 0
+    assert "wall" in result.output
+    assert path.exists()
+    assert not timing.enabled()
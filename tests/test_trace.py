@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from bb.utils import request, trace
+from bb.utils.retry import RetryPolicy
+
+URL = "https://host/rest/api/latest/projects/PRJ/repos/repo/pull-requests/12"
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "trace.ndjson"
+    monkeypatch.setenv("BB_TRACE", str(path))
+    return path
+
+
+def entries(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize(
+    "url, template",
+    [
+        (
+            URL,
+            "/rest/api/latest/projects/{project}/repos/{repository}/pull-requests/{id}",
+        ),
+        (
+            "https://host/rest/api/latest/projects/PRJ/repos/repo/pull-requests"
+            "?state=ALL&order=NEWEST&start=25&limit=25",
+            "/rest/api/latest/projects/{project}/repos/{repository}/pull-requests"
+            "?limit&order&start&state",
+        ),
+        (
+            URL + "/participants/jdoe?avatarSize=32",
+            "/rest/api/latest/projects/{project}/repos/{repository}/pull-requests"
+            "/{id}/participants/{user}?avatarSize",
+        ),
+        (
+            "https://host/rest/branch-utils/latest/projects/P/repos/r/automerge/path/refs/heads/main",
+            "/rest/branch-utils/latest/projects/{project}/repos/{repository}"
+            "/automerge/path/{ref}",
+        ),
+    ],
+)
+def test_url_template(url, template):
+    assert trace.url_template(url) == template
+
+
+def test_record_without_trace(tmp_path, monkeypatch):
+    monkeypatch.delenv("BB_TRACE", raising=False)
+    monkeypatch.chdir(tmp_path)
+    trace.record("GET", URL, 200, 0.1, 10, 1)
+    assert list(tmp_path.iterdir()) == []
+
+
+@patch("bb.utils.retry.time.sleep")
+@patch("bb.utils.retry.retry_policy", return_value=RetryPolicy(attempts=3))
+@patch("bb.utils.request._get_auth", return_value=None)
+@patch("bb.utils.request._get_client")
+def test_get_is_traced(mock_client, mock_auth, mock_policy, mock_sleep, trace_file):
+    mock_client.return_value.get.side_effect = [
+        httpx.Response(503),
+        httpx.Response(200, content=b'{"id": 12}'),
+    ]
+    with patch("bb.utils.request.response_cache", return_value=None):
+        assert request.get(URL) == [200, {"id": 12}]
+
+    (entry,) = entries(trace_file)
+    assert entry["method"] == "GET"
+    assert entry["host"] == "host"
+    assert entry["endpoint"].endswith("/pull-requests/{id}")
+    assert entry["status"] == 200
+    assert entry["bytes"] == 10
+    assert (entry["attempts"], entry["retries"]) == (2, 1)
+    assert entry["cache"] is None
+    assert entry["error"] is None
+    assert entry["latency_ms"] >= 0
+
+
+@patch("bb.utils.request._get_auth", return_value=None)
+@patch("bb.utils.request._get_client")
+def test_failed_request_is_traced(mock_client, mock_auth, trace_file):
+    mock_client.return_value.post.side_effect = httpx.ConnectError("refused")
+    with pytest.raises(httpx.ConnectError):
+        request.post(URL, {})
+    (entry,) = entries(trace_file)
+    assert (entry["method"], entry["status"], entry["error"]) == (
+        "POST",
+        None,
+        "ConnectError",
+    )
+
+
+@patch("bb.utils.request._get_auth", return_value=None)
+@patch("bb.utils.request._get_async_client")
+def test_cache_states_are_traced(mock_client, mock_auth, trace_file):
+    cache, cached = MagicMock(), MagicMock(content=b"{}")
+    cached.conditional_headers.return_value = {"If-None-Match": '"v1"'}
+    mock_client.return_value.get = AsyncMock(return_value=httpx.Response(304))
+    with patch("bb.utils.request._cache_lookup") as mock_lookup:
+        mock_lookup.return_value = (cache, cached)
+        cache.is_fresh.return_value = True
+        asyncio.run(request.async_get(URL))
+        cache.is_fresh.return_value = False
+        asyncio.run(request.async_get(URL))
+        mock_lookup.return_value = (cache, None)
+        mock_client.return_value.get.return_value = httpx.Response(200, content=b"{}")
+        asyncio.run(request.async_get(URL))
+
+    assert [(e["cache"], e["attempts"]) for e in entries(trace_file)] == [
+        ("hit", 0),
+        ("revalidated", 1),
+        ("miss", 1),
+    ]